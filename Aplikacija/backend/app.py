@@ -1,233 +1,153 @@
 from flask import Flask, jsonify, request, render_template_string
 from flask_cors import CORS
-import sqlite3
-import requests
+import re
+import sys
 import threading
-import time
-import json
-import os
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
+
+from compression import reconstruct_series
+from downsampling import lttb_indices
+from ring_buffer import RecentReadings
+from migrations import migrate
+from database import ReadPool, DB_PATH
+from query_cache import QueryCache, ALL_DEVICES
+from sim_clock import get_current_sim_time, format_sim_time_iso, to_epoch, from_epoch
+from ipc import StateClient, INGEST_SOCKET
+import ingest
+from ingest import SENSOR_COMPRESSION_ENABLED, SENSOR_METRICS, save_notification
 
 app = Flask(__name__)
 CORS(app)
 
-# URL kontrolera (test aplikacije)
-KONTROLER_URL = 'http://localhost:3000'
-
-# Stanja uređaja - početno sve neaktivno
-device_status = {
-    'beton_senzor': {'active': False, 'last_update': None, 'data': None},
-    'povrsina_senzor': {'active': False, 'last_update': None, 'data': None},
-    'pumpa': {'active': False, 'last_update': None, 'data': None},
-    'grijac': {'active': False, 'last_update': None, 'data': None}
-}
-
-# Tracker za poslednje snimanje podataka (za 10-minutni interval)
-last_sensor_save = {
-    'beton_senzor': None,
-    'povrsina_senzor': None
-}
-
-# Simulovano vreme funkcije
-def get_sim_time_path():
-    """Vraća apsolutni put do time.json fajla"""
-    # Idemo iz backend direktorijuma do root-a projekta (Aplikacija/backend -> IoT projekat)
-    backend_dir = os.path.dirname(os.path.abspath(__file__))  # /home/bagi/Desktop/IoT projekat/Aplikacija/backend
-    aplikacija_dir = os.path.dirname(backend_dir)  # /home/bagi/Desktop/IoT projekat/Aplikacija
-    project_root = os.path.dirname(aplikacija_dir)  # /home/bagi/Desktop/IoT projekat
-    time_path = os.path.join(project_root, 'SimData', 'time.json')
-    print(f"🔍 [DEBUG] Looking for time.json at: {time_path}")
-    print(f"🔍 [DEBUG] File exists: {os.path.exists(time_path)}")
-    return time_path
-
-def read_sim_time():
-    """Čita simulovano vreme iz SimData/time.json"""
-    try:
-        time_path = get_sim_time_path()
-        
-        # Proverava da li fajl postoji
-        if not os.path.exists(time_path):
-            print(f"❌ [ERROR] Time file does not exist: {time_path}")
-            return datetime.now()
-        
-        print(f"📖 [DEBUG] Reading time from: {time_path}")
-        with open(time_path, 'r', encoding='utf-8') as f:
-            time_data = json.load(f)
-        
-        print(f"📅 [DEBUG] Loaded time data: {time_data}")
-        
-        # Kombina datum i vreme u datetime objekat
-        date_str = time_data['date']
-        time_str = time_data['time']
-        datetime_str = f"{date_str} {time_str}"
-        print(f"🕐 [DEBUG] Parsing datetime: {datetime_str}")
-        sim_datetime = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-        
-        print(f"✅ [SUCCESS] Sim time parsed: {sim_datetime}")
-        return sim_datetime
-    except Exception as e:
-        print(f"⚠️ [WARNING] Could not read sim time: {e}, using system time")
-        return datetime.now()
+# Jedan pisac po procesu (isti kao ingest kada radi u ovom procesu), čitanja kroz pool query_only konekcija
+db_writer = ingest.db_writer
+db_readers = ReadPool(DB_PATH, size=4)
 
-def get_current_sim_time():
-    """Vraća trenutno simulovano vreme"""
-    return read_sim_time()
+# Poslednji zapisi istorije po uređaju u memoriji (služe česte upite grafikona)
+RECENT_READINGS_CAPACITY = 500
+recent_readings = RecentReadings(RECENT_READINGS_CAPACITY)
 
-def format_sim_time_iso(sim_time=None):
-    """Formatira simulovano vreme u ISO format"""
-    if sim_time is None:
-        sim_time = get_current_sim_time()
-    return sim_time.isoformat() + 'Z'
+# Keš rezultata upita istorije - poništava se kada stigne novo merenje za uređaj
+history_cache = QueryCache(max_entries=256, ttl=30.0)
 
-def should_save_sensor_data(device_type):
-    """Proverava da li je vreme za novo snimanje podataka (svakih 10 minuta simulovano vreme)"""
-    current_sim_time = get_current_sim_time()
-    last_save = last_sensor_save.get(device_type)
-    
-    if last_save is None:
-        print(f"📝 [SAVE_CHECK] First save for {device_type}")
-        return True
-    
-    time_diff = current_sim_time - last_save
-    minutes_diff = time_diff.total_seconds() / 60
+# Živo stanje dobijeno od ingest-a (preko Unix socket-a ili direktno u istom procesu)
+device_status = {name: {'active': False, 'last_update': None, 'data': None} for name in ingest.device_status}
+device_breakers = {}
+device_events = deque(maxlen=200)
+device_events_lock = threading.Lock()
+pending_samples = {}  # device_type -> (sim_time, data) poslednjeg nesačuvanog merenja
+
+def set_pending_sample(device_type, pending):
+    if pending:
+        pending_samples[device_type] = (datetime.fromisoformat(pending['sim_time'].rstrip('Z')), pending['data'])
+    else:
+        pending_samples.pop(device_type, None)
+
+def apply_ingest_message(message):
+    """Primenjuje poruku ingest-a na lokalnu kopiju stanja"""
+    kind = message['type']
     
-    print(f"📝 [SAVE_CHECK] {device_type}: {minutes_diff:.1f} minutes since last save")
+    if kind in ('snapshot', 'status'):
+        device_status.update(message['devices'])
+        device_breakers.update(message['breakers'])
     
-    # Čuva svakih 10 minuta ili više
-    return minutes_diff >= 10
+    if kind == 'snapshot':
+        with device_events_lock:
+            device_events.clear()
+            device_events.extend(message['events'])
+        for device_type, pending in message['pending'].items():
+            set_pending_sample(device_type, pending)
+        # Zapisi upisani dok veza nije postojala su samo u bazi
+        warm_recent_readings()
+        for device_type in message['pending']:
+            history_cache.invalidate(device_type)
+    elif kind == 'event':
+        with device_events_lock:
+            # Događaj može stići i u snimku i kao poruka
+            if not device_events or message['event']['id'] > device_events[-1]['id']:
+                device_events.append(message['event'])
+    elif kind == 'row':
+        recent_readings.append(message['row'])
+        history_cache.invalidate(message['row']['device_type'])
+    elif kind == 'sample':
+        set_pending_sample(message['device_type'], message['pending'])
+        history_cache.invalidate(message['device_type'])
+
+def on_ingest_disconnect():
+    """Bez veze sa ingest daemon-om stanje uređaja nije poznato"""
+    for status in device_status.values():
+        status['active'] = False
+
+def history_row_to_dict(row):
+    """Pretvara red sensor_history (id, device_type, temperatura, vlaznost, baterija, timestamp, sim_time) u API format"""
+    return {
+        'id': row[0],
+        'device_type': row[1],
+        'temperatura': row[2],
+        'vlaznost': row[3],
+        'baterija': row[4],
+        'timestamp': from_epoch(row[5]).strftime('%Y-%m-%d %H:%M:%S'),
+        'sim_time': format_sim_time_iso(from_epoch(row[6]))
+    }
 
 def init_db():
-    """Inicijalizuje SQLite bazu podataka"""
-    conn = sqlite3.connect('iot_data.db')
-    cursor = conn.cursor()
+    """Inicijalizuje SQLite bazu podataka (pokreće samo neizvršene migracije šeme)"""
+    version = migrate(DB_PATH)
+    print(f"📊 Baza podataka inicijalizovana (verzija šeme {version})")
+
+def warm_recent_readings():
+    """Puni memorijski buffer poslednjim zapisima iz baze pri pokretanju"""
+    with db_readers.connection() as conn:
+        cursor = conn.execute('SELECT DISTINCT device_type FROM sensor_history')
+        device_types = [row[0] for row in cursor.fetchall()]
     
-    # Tabela za notifikacije/greške
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            uredjaj TEXT NOT NULL,
-            tip TEXT NOT NULL,
-            vreme TEXT NOT NULL,
-            poruka TEXT NOT NULL,
-            procitana BOOLEAN DEFAULT FALSE,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Tabela za istoriju podataka senzora
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sensor_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            device_type TEXT NOT NULL,
-            temperatura REAL,
-            vlaznost REAL,
-            baterija INTEGER,
-            timestamp TEXT NOT NULL,
-            sim_time TEXT NOT NULL
-        )
-    ''')
+    rows_by_device = {
+        device_type: query_sensor_history(device_type, RECENT_READINGS_CAPACITY)
+        for device_type in device_types
+    }
+    recent_readings.warm(rows_by_device)
+    print(f"📊 Buffer istorije popunjen za {len(rows_by_device)} uređaja")
+
+def parse_history_time(value):
+    """Parsira sim_time/timestamp iz baze u datetime objekat"""
+    return datetime.fromisoformat(value.rstrip('Z'))
+
+def reconstruct_history(history, limit=None, include_pending=True):
+    """
+    Rekonstruiše kompresovanu istoriju na kadencu od 10 simulovanih minuta.
+    Očekuje zapise sa ključevima device_type i sim_time (ili timestamp), vraća
+    ih sortirane od najnovijeg, uključujući poslednje još nesačuvano merenje
+    (osim sa include_pending=False).
+    """
+    by_device = {}
+    for record in history:
+        record['_sim_dt'] = parse_history_time(record.get('sim_time') or record['timestamp'])
+        by_device.setdefault(record['device_type'], []).append(record)
     
-    # Migracija - dodaj sim_time kolonu ako ne postoji
-    try:
-        cursor.execute('ALTER TABLE sensor_history ADD COLUMN sim_time TEXT')
-        print("📊 Added sim_time column to sensor_history table")
-    except sqlite3.OperationalError:
-        print("📊 sim_time column already exists in sensor_history table")
+    result = []
+    for device_type, records in by_device.items():
+        records.sort(key=lambda r: r['_sim_dt'])
+        
+        # Poslednje merenje koje kompresor još drži u memoriji
+        pending = pending_samples.get(device_type) if include_pending else None
+        if pending and pending[0] > records[-1]['_sim_dt']:
+            records.append(dict(pending[1], _sim_dt=pending[0], id=None, device_type=device_type))
+        
+        for point in reconstruct_series(records, SENSOR_METRICS):
+            point.setdefault('id', None)
+            point['device_type'] = device_type
+            point['timestamp'] = point['_sim_dt'].strftime('%Y-%m-%d %H:%M:%S')
+            if 'sim_time' in records[0]:
+                point['sim_time'] = format_sim_time_iso(point['_sim_dt'])
+            result.append(point)
     
-    # Ažuriraj postojeće zapise bez sim_time
-    cursor.execute('UPDATE sensor_history SET sim_time = timestamp WHERE sim_time IS NULL OR sim_time = ""')
-    updated_rows = cursor.rowcount
-    if updated_rows > 0:
-        print(f"📊 Updated {updated_rows} records with sim_time")
-    
-    conn.commit()
-    conn.close()
-    print("📊 Baza podataka inicijalizovana")
-
-def fetch_device_data():
-    """Dohvata podatke sa kontrolera svakih 10 sekundi"""
-    while True:
-        try:
-            # Dohvati podatke sa kontrolera
-            endpoints = [
-                ('beton_senzor', '/api/senzori/beton'),
-                ('povrsina_senzor', '/api/senzori/povrsina'),
-                ('pumpa', '/api/pumpa/stanje'),
-                ('grijac', '/api/grijac/stanje')
-            ]
-            
-            for device_name, endpoint in endpoints:
-                try:
-                    response = requests.get(f"{KONTROLER_URL}{endpoint}", timeout=5)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        device_status[device_name] = {
-                            'active': True,
-                            'last_update': get_current_sim_time(),
-                            'data': data
-                        }
-                        
-                        # Sačuvaj podatke senzora u istoriju svakih 10 minuta (simulovano vreme)
-                        if device_name in ['beton_senzor', 'povrsina_senzor']:
-                            if should_save_sensor_data(device_name):
-                                save_sensor_data(device_name, data)
-                                last_sensor_save[device_name] = get_current_sim_time()
-                        
-                        print(f"✅ {device_name}: {data}")
-                    else:
-                        print(f"❌ {device_name}: HTTP {response.status_code}")
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"🔴 {device_name}: Konekcija neuspešna - {e}")
-                    
-            # Proveri koje uređaje treba označiti kao neaktivne (preko 1 min bez odgovora)
-            check_device_timeouts()
-            
-        except Exception as e:
-            print(f"Greška u fetch_device_data: {e}")
-            
-        time.sleep(10)  # Svakih 10 sekundi
-
-def check_device_timeouts():
-    """Označava uređaje kao neaktivne ako nisu odgovorili preko 1 minuta"""
-    timeout_limit = timedelta(minutes=1)
-    current_time = get_current_sim_time()
-    
-    for device_name, status in device_status.items():
-        if status['last_update'] is not None:
-            time_since_update = current_time - status['last_update']
-            if time_since_update > timeout_limit and status['active']:
-                device_status[device_name]['active'] = False
-                print(f"⏰ {device_name}: Označen kao neaktivan (timeout)")
-
-def save_sensor_data(device_type, data):
-    """Čuva podatke senzora u bazu za istoriju sa simulovanim vremenom"""
-    try:
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        sim_time = get_current_sim_time()
-        sim_time_str = format_sim_time_iso(sim_time)
-        
-        print(f"💾 [SAVE] Saving {device_type} data at sim time: {sim_time_str}")
-        
-        cursor.execute('''
-            INSERT INTO sensor_history (device_type, temperatura, vlaznost, baterija, timestamp, sim_time)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            device_type,
-            data.get('temperatura'),
-            data.get('vlaznost'),
-            data.get('baterija'),
-            sim_time.strftime('%Y-%m-%d %H:%M:%S'),
-            sim_time_str
-        ))
-        
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"Greška pri čuvanju podataka: {e}")
+    result.sort(key=lambda r: r['_sim_dt'], reverse=True)
+    if limit is not None:
+        result = result[:limit]
+    for point in result:
+        del point['_sim_dt']
+    return result
 
 # API ENDPOINTS PREMA SPECIFIKACIJI
 
@@ -300,16 +220,7 @@ def report_error():
             return jsonify({'error': 'Nedostaju polja: uredjaj, tip'}), 400
         
         # Sačuvaj u bazu kao notifikaciju
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO notifications (uredjaj, tip, vreme, poruka, procitana)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (uredjaj, tip, vreme, poruka, False))
-        
-        conn.commit()
-        conn.close()
+        save_notification(uredjaj, tip, vreme, poruka)
         
         print(f"🚨 Nova greška: {poruka} ({tip}) - {uredjaj}")
         
@@ -334,29 +245,40 @@ def get_dashboard():
     for device_name, status in device_status.items():
         dashboard_data[device_name] = {
             'active': status['active'],
-            'last_update': status['last_update'].isoformat() if status['last_update'] else None,
-            'data': status['data'] if status['active'] else None
+            'last_update': status['last_update'],
+            'data': status['data'] if status['active'] else None,
+            'breaker': device_breakers.get(device_name)
         }
     
     print(f"🖥️  Dashboard request - returning: {dashboard_data}")
     return jsonify(dashboard_data)
 
+@app.route('/api/uredjaji/dogadjaji', methods=['GET'])
+def get_device_events():
+    """Vraća događaje promene stanja uređaja (online/offline) novije od zadatog ID-a"""
+    since = request.args.get('since', 0, type=int)
+    
+    with device_events_lock:
+        events = [event for event in device_events if event['id'] > since]
+    
+    return jsonify({
+        'success': True,
+        'dogadjaji': events,
+        'poslednji_id': events[-1]['id'] if events else since
+    })
+
 @app.route('/api/notifikacije', methods=['GET'])
 def get_notifications():
     """Dohvata sve notifikacije"""
     try:
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, uredjaj, tip, vreme, poruka, procitana, timestamp
-            FROM notifications
-            ORDER BY timestamp DESC
-            LIMIT 100
-        ''')
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with db_readers.connection() as conn:
+            cursor = conn.execute('''
+                SELECT id, uredjaj, tip, vreme, poruka, procitana, timestamp
+                FROM notifications
+                ORDER BY timestamp DESC
+                LIMIT 100
+            ''')
+            rows = cursor.fetchall()
         
         notifications = []
         for row in rows:
@@ -378,6 +300,80 @@ def get_notifications():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Broj najnovijih pogodaka koji se rangiraju po relevantnosti i prebrojavaju
+SEARCH_RANK_WINDOW = 2000
+
+def build_fts_query(text):
+    """Pretvara unos korisnika u FTS5 upit: svaka reč kao prefiks, sve reči obavezne"""
+    terms = re.findall(r'\w+', text)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+@app.route('/api/notifikacije/search', methods=['GET'])
+def search_notifications():
+    """Pretražuje notifikacije po tekstu (FTS5), rangirano po relevantnosti"""
+    try:
+        query = build_fts_query(request.args.get('q', ''))
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        # Sve stranice se seku iz istog prozora, pa se pogoci ne ponavljaju i ne preskaču
+        offset = min(max(request.args.get('offset', 0, type=int), 0), SEARCH_RANK_WINDOW)
+        
+        if not query:
+            return jsonify({'success': False, 'error': 'Nedostaje parametar q'}), 400
+        
+        # Rangiranje i brojanje se rade nad najnovijim pogocima, pa upit ostaje brz i kada ih
+        # ima stotine hiljada; 'ukupno' je tada SEARCH_RANK_WINDOW uz 'ukupno_vise': true
+        window = SEARCH_RANK_WINDOW
+        
+        with db_readers.connection() as conn:
+            total = conn.execute('''
+                SELECT COUNT(*) FROM (
+                    SELECT rowid FROM notifications_fts WHERE notifications_fts MATCH ? LIMIT ?
+                )
+            ''', (query, window + 1)).fetchone()[0]
+            
+            # bm25 težine kolona: poruka, tip, uredjaj
+            cursor = conn.execute('''
+                SELECT n.id, n.uredjaj, n.tip, n.vreme, n.poruka, n.procitana, n.timestamp, pogoci.isecak
+                FROM (
+                    SELECT rowid,
+                           bm25(notifications_fts, 10.0, 2.0, 1.0) AS score,
+                           snippet(notifications_fts, 0, '<b>', '</b>', '…', 12) AS isecak
+                    FROM notifications_fts
+                    WHERE notifications_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                ) AS pogoci
+                JOIN notifications n ON n.id = pogoci.rowid
+                ORDER BY pogoci.score, n.id DESC
+                LIMIT ? OFFSET ?
+            ''', (query, window, limit, offset))
+            rows = cursor.fetchall()
+        
+        notifications = []
+        for row in rows:
+            notifications.append({
+                'id': row[0],
+                'uredjaj': row[1],
+                'tip': row[2],
+                'vreme': row[3],
+                'poruka': row[4],
+                'procitana': bool(row[5]),
+                'timestamp': row[6],
+                'isecak': row[7]
+            })
+        
+        return jsonify({
+            'success': True,
+            'notifikacije': notifications,
+            'ukupno': min(total, window),
+            'ukupno_vise': total > window,
+            'limit': limit,
+            'offset': offset
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/notifikacije/procitaj', methods=['POST'])
 def mark_notification_read():
     """Označava notifikaciju kao pročitanu/nepročitanu"""
@@ -389,22 +385,15 @@ def mark_notification_read():
         if not notification_id:
             return jsonify({'success': False, 'error': 'Nedostaje ID notifikacije'}), 400
         
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        updated_count, _ = db_writer.execute('''
             UPDATE notifications
             SET procitana = ?
             WHERE id = ?
         ''', (procitana, notification_id))
         
-        if cursor.rowcount == 0:
-            conn.close()
+        if updated_count == 0:
             return jsonify({'success': False, 'error': 'Notifikacija nije pronađena'}), 404
         
-        conn.commit()
-        conn.close()
-        
         return jsonify({
             'success': True, 
             'message': f'Notifikacija označena kao {"pročitana" if procitana else "nepročitana"}'
@@ -418,19 +407,12 @@ def mark_all_notifications_read():
     """Označava sve notifikacije kao pročitane"""
     try:
         print(f"📝 [DEBUG] Mark all notifications as read request received")
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        updated_count, _ = db_writer.execute('''
             UPDATE notifications
             SET procitana = TRUE
             WHERE procitana = FALSE
         ''')
         
-        updated_count = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
         print(f"✅ [DEBUG] Marked {updated_count} notifications as read")
         return jsonify({
             'success': True, 
@@ -446,21 +428,14 @@ def mark_all_notifications_read():
 def delete_notification(notification_id):
     """Briše određenu notifikaciju"""
     try:
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        deleted_count, _ = db_writer.execute('''
             DELETE FROM notifications
             WHERE id = ?
         ''', (notification_id,))
         
-        if cursor.rowcount == 0:
-            conn.close()
+        if deleted_count == 0:
             return jsonify({'success': False, 'error': 'Notifikacija nije pronađena'}), 404
         
-        conn.commit()
-        conn.close()
-        
         return jsonify({'success': True, 'message': 'Notifikacija obrisana'})
         
     except Exception as e:
@@ -471,17 +446,10 @@ def clear_read_notifications():
     """Briše samo pročitane notifikacije"""
     try:
         print(f"🗑️ [DEBUG] Clear read notifications request received")
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        deleted_count, _ = db_writer.execute('''
             DELETE FROM notifications
             WHERE procitana = TRUE
         ''')
-        deleted_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
         
         print(f"✅ [DEBUG] Deleted {deleted_count} read notifications")
         return jsonify({
@@ -499,14 +467,7 @@ def clear_all_notifications():
     """Briše sve notifikacije"""
     try:
         print(f"🗑️ [DEBUG] Clear all notifications request received")
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM notifications')
-        deleted_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
+        deleted_count, _ = db_writer.execute('DELETE FROM notifications')
         
         print(f"✅ [DEBUG] Deleted {deleted_count} notifications")
         return jsonify({
@@ -541,28 +502,24 @@ def get_history():
     try:
         hours = request.args.get('hours', 24, type=int)
         
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT device_type, temperatura, vlaznost, baterija, timestamp
-            FROM sensor_history
-            WHERE timestamp > datetime('now', '-{} hours')
-            ORDER BY timestamp ASC
-        '''.format(hours))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with db_readers.connection() as conn:
+            cursor = conn.execute('''
+                SELECT id, device_type, temperatura, vlaznost, baterija, timestamp, sim_time
+                FROM sensor_history
+                WHERE timestamp > CAST(strftime('%s', 'now', ?) AS INTEGER)
+                ORDER BY timestamp ASC
+            ''', (f'-{hours} hours',))
+            rows = cursor.fetchall()
         
         history = []
         for row in rows:
-            history.append({
-                'device_type': row[0],
-                'temperatura': row[1],
-                'vlaznost': row[2],
-                'baterija': row[3],
-                'timestamp': row[4]
-            })
+            record = history_row_to_dict(row)
+            del record['id'], record['sim_time']
+            history.append(record)
+        
+        if SENSOR_COMPRESSION_ENABLED and history:
+            history = reconstruct_history(history)
+            history.reverse()
     
         return jsonify(history)
         
@@ -648,11 +605,19 @@ def frontend():
                         const lastUpdate = deviceData.last_update ? 
                             new Date(deviceData.last_update).toLocaleString() : 'Nikad';
                         
+                        let breakerHtml = '';
+                        if (deviceData.breaker && deviceData.breaker.stanje !== 'closed') {
+                            const retry = deviceData.breaker.ponovni_pokusaj_za;
+                            breakerHtml = `<div class="last-update">🔌 Veza: ${deviceData.breaker.stanje}` +
+                                (retry !== null ? ` (novi pokušaj za ${retry}s)` : '') + '</div>';
+                        }
+                        
                         card.innerHTML = `
                             <h3>${deviceNames[deviceId] || deviceId}</h3>
                             <div class="status">${deviceData.active ? '🟢 AKTIVAN' : '🔴 NEAKTIVAN'}</div>
                             <div class="data">${dataHtml}</div>
                             <div class="last-update">Poslednji put: ${lastUpdate}</div>
+                            ${breakerHtml}
                         `;
                         
                         container.appendChild(card);
@@ -673,6 +638,132 @@ def frontend():
     '''
     return render_template_string(html)
 
+def query_sensor_history(device_type, limit, sim_from=None, sim_to=None, after_id=None, oldest_first=False):
+    """
+    Čita poslednjih `limit` zapisa istorije iz baze (najnoviji prvi), opciono u opsegu simulovanog vremena.
+    Sa oldest_first čita prvih `limit` zapisa opsega (za inkrementalne upite, da se ne preskoči
+    deo istorije kada je novih zapisa više od limita), a vraća ih takođe od najnovijeg.
+    Redosled je po simulovanom vremenu, pa id (uvezeni stariji zapisi imaju veće id-eve).
+    """
+    # Bazni upit
+    query = '''
+        SELECT id, device_type, temperatura, vlaznost, baterija, timestamp, sim_time
+        FROM sensor_history
+    '''
+    conditions = []
+    params = []
+    
+    # Filter po device_type
+    if device_type:
+        conditions.append('device_type = ?')
+        params.append(device_type)
+    
+    # Opseg simulovanog vremena - celobrojno skeniranje indeksa (device_type, sim_time)
+    if sim_from is not None:
+        conditions.append('sim_time >= ?')
+        params.append(to_epoch(sim_from))
+    if sim_to is not None:
+        conditions.append('sim_time <= ?')
+        params.append(to_epoch(sim_to))
+    
+    # Samo zapisi posle poslednjeg koji klijent već ima, u redosledu (sim_time, id)
+    if after_id is not None:
+        conditions.append('(sim_time, id) > ((SELECT sim_time FROM sensor_history WHERE id = ?), ?)')
+        params.extend((after_id, after_id))
+    
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    
+    # Sortiraj po vremenu (najnoviji prvi, ili najstariji za inkrementalni upit)
+    query += ' ORDER BY sim_time ASC, id ASC' if oldest_first else ' ORDER BY sim_time DESC, id DESC'
+    
+    # Limit
+    query += ' LIMIT ?'
+    params.append(limit)
+    
+    with db_readers.connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+    if oldest_first:
+        rows.reverse()
+    
+    return [history_row_to_dict(row) for row in rows]
+
+def downsample_history(history, max_points):
+    """
+    Proređuje istoriju na najviše max_points tačaka po uređaju (LTTB po temperaturi i vlažnosti).
+    Očekuje i vraća zapise sortirane od najnovijeg.
+    """
+    by_device = {}
+    for record in history:
+        by_device.setdefault(record['device_type'], []).append(record)
+    
+    result = []
+    for records in by_device.values():
+        if len(records) <= max_points:
+            result.extend(records)
+            continue
+        records = records[::-1]
+        x = [to_epoch(parse_history_time(r.get('sim_time') or r['timestamp'])) for r in records]
+        ys = [[r.get(metric) if r.get(metric) is not None else float('nan') for r in records]
+              for metric in ('temperatura', 'vlaznost')]
+        result.extend(records[i] for i in lttb_indices(x, ys, max_points))
+    
+    result.sort(key=lambda r: parse_history_time(r.get('sim_time') or r['timestamp']), reverse=True)
+    return result
+
+def history_anchor_time(device_type, after_sim):
+    """
+    Vraća vreme poslednjeg sačuvanog zapisa do `after_sim` (uključivo).
+    Rekonstrukcija tačaka posle `after_sim` interpolira od tog zapisa.
+    """
+    device_types = [device_type] if device_type else list(ingest.last_sensor_save)
+    anchors = []
+    with db_readers.connection() as conn:
+        for device in device_types:
+            row = conn.execute(
+                'SELECT MAX(sim_time) FROM sensor_history WHERE device_type = ? AND sim_time <= ?',
+                (device, to_epoch(after_sim))
+            ).fetchone()
+            if row[0] is not None:
+                anchors.append(row[0])
+    return from_epoch(min(anchors)) if anchors else after_sim
+
+def load_sensor_history(device_type, limit, reconstruct=True, sim_from=None, sim_to=None,
+                        after_id=None, after_sim=None):
+    """Čita istoriju iz buffer-a ili baze i po potrebi je rekonstruiše"""
+    reconstruct = SENSOR_COMPRESSION_ENABLED and reconstruct
+    
+    # Inkrementalni upit - samo tačke novije od onih koje klijent već prikazuje
+    if after_sim is not None:
+        query_from = after_sim
+        if reconstruct:
+            query_from = history_anchor_time(device_type, after_sim)
+            if sim_from is not None:
+                query_from = max(query_from, sim_from)
+        # Najstarijih `limit` zapisa posle kursora; ostatak klijent dobija sledećim upitom
+        history = query_sensor_history(device_type, limit, query_from, sim_to, after_id, oldest_first=True)
+        if reconstruct and history:
+            # Nesačuvano merenje se dodaje samo kada je stigao ceo ostatak istorije,
+            # inače bi interpolacija do njega preskočila zapise posle limita
+            history = reconstruct_history(history, include_pending=len(history) < limit)
+        history = [r for r in history if parse_history_time(r['sim_time']) > after_sim]
+        return history[-limit:]
+    if after_id is not None:
+        # id postoji samo za sačuvane zapise, pa se rekonstrukcija ne primenjuje
+        return query_sensor_history(device_type, limit, sim_from, sim_to, after_id, oldest_first=True)
+    
+    # Upiti unutar prozora buffer-a se služe iz memorije, ostali idu u bazu
+    history = None
+    if sim_from is None and sim_to is None:
+        history = recent_readings.query(device_type or None, limit)
+    if history is None:
+        history = query_sensor_history(device_type, limit, sim_from, sim_to)
+    
+    if reconstruct and history:
+        history = reconstruct_history(history, limit)
+    
+    return history
+
 @app.route('/api/sensor-history', methods=['GET'])
 def get_sensor_history():
     """Vraća istoriju podataka senzora"""
@@ -680,45 +771,40 @@ def get_sensor_history():
         device_type = request.args.get('device_type')  # 'beton_senzor', 'povrsina_senzor' ili None za sve
         hours = request.args.get('hours', '24')  # Koliko sati unazad (default 24)
         limit = request.args.get('limit', '100')  # Maksimalan broj zapisa
+        reconstruct = request.args.get('reconstruct', '1') != '0'  # Rekonstrukcija kompresovane serije
+        sim_from = request.args.get('sim_time_from')  # Početak opsega simulovanog vremena (ISO)
+        sim_to = request.args.get('sim_time_to')  # Kraj opsega simulovanog vremena (ISO)
+        after_id = request.args.get('after_id')  # Samo sačuvani zapisi posle zapisa sa ovim id-om, po (sim_time, id) (bez rekonstrukcije)
+        after_sim = request.args.get('after_sim_time')  # Samo tačke novije od ovog simulovanog vremena (ISO)
+        max_points = request.args.get('max_points')  # LTTB proređivanje na najviše ovoliko tačaka po uređaju
+        
+        limit = int(limit)
+        max_points = int(max_points) if max_points else None
+        sim_from = parse_history_time(sim_from) if sim_from else None
+        sim_to = parse_history_time(sim_to) if sim_to else None
+        after_id = int(after_id) if after_id else None
+        after_sim = parse_history_time(after_sim) if after_sim else None
+        
+        # Ključ keša su normalizovani parametri (ISO zapis vremena ne utiče na ključ)
+        key = (
+            device_type or None,
+            limit,
+            SENSOR_COMPRESSION_ENABLED and reconstruct,
+            to_epoch(sim_from) if sim_from else None,
+            to_epoch(sim_to) if sim_to else None,
+            after_id,
+            to_epoch(after_sim) if after_sim else None,
+            max_points
+        )
+        devices = [device_type] if device_type else [ALL_DEVICES]
         
-        conn = sqlite3.connect('iot_data.db')
-        cursor = conn.cursor()
-        
-        # Bazni upit
-        query = '''
-            SELECT id, device_type, temperatura, vlaznost, baterija, timestamp, sim_time
-            FROM sensor_history
-        '''
-        params = []
-        
-        # Filter po device_type
-        if device_type:
-            query += ' WHERE device_type = ?'
-            params.append(device_type)
-        
-        # Sortiraj po vremenu (najnoviji prvi)
-        query += ' ORDER BY id DESC'
-        
-        # Limit
-        query += ' LIMIT ?'
-        params.append(int(limit))
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        history = []
-        for row in rows:
-            history.append({
-                'id': row[0],
-                'device_type': row[1],
-                'temperatura': row[2],
-                'vlaznost': row[3],
-                'baterija': row[4],
-                'timestamp': row[5],
-                'sim_time': row[6]
-            })
+        def compute():
+            history = load_sensor_history(device_type, limit, reconstruct, sim_from, sim_to, after_id, after_sim)
+            if max_points:
+                history = downsample_history(history, max_points)
+            return history
         
-        conn.close()
+        history = history_cache.get_or_compute(key, devices, compute)
         
         return jsonify({
             'success': True,
@@ -732,10 +818,17 @@ def get_sensor_history():
 
 if __name__ == '__main__':
     init_db()
+    db_writer.start()
+    warm_recent_readings()
     
-    # Pokreni thread za dohvatanje podataka
-    data_thread = threading.Thread(target=fetch_device_data, daemon=True)
-    data_thread.start()
+    if '--external-ingest' in sys.argv:
+        # Ingest radi kao zaseban proces (python ingest.py), stanje stiže preko socket-a
+        StateClient(INGEST_SOCKET, apply_ingest_message, on_ingest_disconnect).start()
+    else:
+        # Pokreni dohvatanje podataka u ovom procesu
+        ingest.add_listener(apply_ingest_message)
+        ingest.start()
+        apply_ingest_message(ingest.snapshot())
     
     print("")
     print("🚀 IoT Backend Application pokrenut!")
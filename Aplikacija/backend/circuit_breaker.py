@@ -0,0 +1,125 @@
+"""
+Circuit breaker za pozive prema kontroleru
+Nedostupni endpoint-i se preskaču (fast-fail) uz eksponencijalni backoff sa jitter-om,
+tako da mrtvi uređaji ne troše vreme ciklusa dohvatanja
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker za jedan endpoint
+
+    closed    - zahtevi prolaze, greške se broje
+    open      - zahtevi se odbijaju bez poziva dok ne istekne backoff
+    half_open - propušta se jedan probni zahtev; uspeh zatvara, greška ponovo otvara
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, base_backoff: float = 10.0,
+                 max_backoff: float = 300.0, jitter: float = 0.2, clock=time.monotonic):
+        """
+        Args:
+            name (str): Naziv endpoint-a (za logove i dashboard)
+            failure_threshold (int): Broj uzastopnih grešaka posle kojih se breaker otvara
+            base_backoff (float): Početno trajanje otvorenog stanja (sekunde)
+            max_backoff (float): Maksimalno trajanje otvorenog stanja (sekunde)
+            jitter (float): Relativni slučajni pomak backoff-a (0.2 = ±20%)
+            clock (Callable): Izvor vremena (zamenljiv radi testiranja)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._clock = clock
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0          # Broj uzastopnih otvaranja (eksponent backoff-a)
+        self.retry_at = None
+        self.last_error = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Proverava da li zahtev sme da se pošalje
+
+        Returns:
+            bool: False ako je breaker otvoren (fast-fail)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if self._clock() < self.retry_at:
+                    return False
+                self._transition(HALF_OPEN)
+
+            # Half-open: propušta se samo jedan probni zahtev
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """Beleži uspešan poziv"""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.open_count = 0
+            self.last_error = None
+            self._probe_in_flight = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self, error: Optional[str] = None):
+        """
+        Beleži neuspešan poziv
+
+        Args:
+            error (Optional[str]): Opis greške
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            self._probe_in_flight = False
+
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Vraća stanje breaker-a za prikaz na dashboard-u"""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, round(self.retry_at - self._clock(), 1))
+            return {
+                'stanje': self.state,
+                'uzastopne_greske': self.consecutive_failures,
+                'ponovni_pokusaj_za': retry_in,
+                'poslednja_greska': self.last_error
+            }
+
+    def _open(self):
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** self.open_count))
+        backoff *= 1 + random.uniform(-self.jitter, self.jitter)
+        self.open_count += 1
+        self.retry_at = self._clock() + backoff
+        self._transition(OPEN)
+        print(f"🔌 [BREAKER] {self.name}: otvoren, sledeći pokušaj za {backoff:.1f}s")
+
+    def _transition(self, new_state: str):
+        if new_state != self.state:
+            if new_state == CLOSED:
+                print(f"🔌 [BREAKER] {self.name}: zatvoren, endpoint ponovo dostupan")
+            self.state = new_state
@@ -0,0 +1,217 @@
+"""
+Kompresija podataka senzora pre upisa u sensor_history
+Swinging-door trending: čuvaju se samo tačke potrebne da se serija
+rekonstruiše linearnom interpolacijom unutar zadate tolerancije
+"""
+
+import threading
+from datetime import timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Podrazumevana podešavanja po metrici
+# tolerance - maksimalno odstupanje rekonstruisane serije od izmerenih vrednosti
+#             (sitne promene, manje od tolerancije, vrata upijaju bez novih zapisa)
+DEFAULT_METRIC_CONFIG = {
+    'temperatura': {'tolerance': 0.2},
+    'vlaznost': {'tolerance': 0.5},
+    'baterija': {'tolerance': 1.0}
+}
+
+# Heartbeat - najduži dozvoljeni razmak između dva sačuvana zapisa (simulovani minuti)
+DEFAULT_MAX_GAP_MINUTES = 60
+
+# Korak rekonstrukcije serije pri čitanju (odgovara kadenci snimanja)
+RECONSTRUCT_STEP_MINUTES = 10
+
+
+def _minutes_between(start, end) -> float:
+    """Razlika dva datetime objekta u minutima"""
+    return (end - start).total_seconds() / 60
+
+
+class _DeviceDoor:
+    """Stanje kompresije za jedan uređaj (poslednja arhivirana i zadržana tačka)"""
+
+    def __init__(self):
+        self.archived = None   # (sim_time, data) poslednje sačuvane tačke
+        self.held = None       # (sim_time, data) tačka koja još nije sačuvana
+        self.slopes = {}       # metrika -> (donji, gornji) dozvoljeni nagib od arhivirane tačke
+
+    def reset_window(self):
+        self.slopes = {}
+
+
+class SensorCompressor:
+    """
+    Kompresor serija senzora (swinging door)
+
+    Za svaki uređaj pamti poslednju sačuvanu tačku i "vrata" - opseg nagiba
+    linije od te tačke koji prolazi kroz toleranciju svih preskočenih tačaka.
+    Svako merenje postaje zadržana tačka i pri zameni sužava vrata, pa nijedno
+    preskočeno merenje ne ostaje van tolerancije. Kada nova tačka zatvori
+    vrata, čuva se prethodna (zadržana) tačka.
+    """
+
+    def __init__(self, metric_config: Optional[Dict[str, Dict[str, float]]] = None,
+                 max_gap_minutes: float = DEFAULT_MAX_GAP_MINUTES):
+        """
+        Args:
+            metric_config (Dict[str, Dict[str, float]]): tolerance po metrici
+            max_gap_minutes (float): Heartbeat - maksimalni razmak između zapisa
+        """
+        self.metric_config = metric_config or DEFAULT_METRIC_CONFIG
+        self.max_gap_minutes = max_gap_minutes
+        self._devices = {}
+        self._lock = threading.Lock()
+
+    def offer(self, device_type: str, sim_time, data: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Prosleđuje novo merenje kompresoru
+
+        Args:
+            device_type (str): Naziv uređaja
+            sim_time (datetime): Simulovano vreme merenja
+            data (Dict[str, Any]): Podaci senzora
+
+        Returns:
+            List[Tuple[datetime, Dict]]: Tačke koje treba upisati u bazu (hronološki)
+        """
+        point = (sim_time, dict(data))
+
+        with self._lock:
+            door = self._devices.setdefault(device_type, _DeviceDoor())
+
+            # Prva tačka se uvek čuva
+            if door.archived is None:
+                door.archived = point
+                return [point]
+
+            to_store = []
+
+            if door.held is None:
+                door.held = point
+                door.reset_window()
+            elif self._fits_door(door, point):
+                door.held = point
+            else:
+                # Vrata su se zatvorila - zadržana tačka postaje nova arhivirana
+                to_store.append(door.held)
+                door.archived = door.held
+                door.held = point
+                door.reset_window()
+
+            # Heartbeat - ne dozvoli predugačke praznine u istoriji
+            if _minutes_between(door.archived[0], sim_time) >= self.max_gap_minutes:
+                to_store.append(door.held)
+                door.archived = door.held
+                door.held = None
+                door.reset_window()
+
+            return to_store
+
+    def pending(self, device_type: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Vraća poslednju zadržanu (još nesačuvanu) tačku uređaja"""
+        with self._lock:
+            door = self._devices.get(device_type)
+            return door.held if door else None
+
+    def export_state(self, device_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Vraća stanje kompresije uređaja (za čuvanje između pokretanja)
+
+        Returns:
+            Optional[Dict]: archived/held kao (sim_time, data) ili None, slopes po metrici
+        """
+        with self._lock:
+            door = self._devices.get(device_type)
+            if door is None:
+                return None
+            return {
+                'archived': door.archived,
+                'held': door.held,
+                'slopes': dict(door.slopes)
+            }
+
+    def restore_state(self, device_type: str, state: Dict[str, Any]):
+        """Vraća stanje kompresije uređaja sačuvano sa export_state"""
+        door = _DeviceDoor()
+        door.archived = state.get('archived')
+        door.held = state.get('held')
+        door.slopes = {metric: tuple(bounds) for metric, bounds in state.get('slopes', {}).items()}
+        with self._lock:
+            self._devices[device_type] = door
+
+    def _fits_door(self, door: _DeviceDoor, point) -> bool:
+        """
+        Proverava da li linija od arhivirane do nove tačke prolazi kroz toleranciju
+        svih preskočenih tačaka (uključujući trenutno zadržanu). Ako prolazi,
+        vrata se sužavaju za zadržanu tačku.
+        """
+        archived_time, archived_data = door.archived
+        held_time, held_data = door.held
+        held_dt = _minutes_between(archived_time, held_time)
+        new_dt = _minutes_between(archived_time, point[0])
+        if held_dt <= 0 or new_dt <= 0:
+            return False
+
+        narrowed = {}
+        for metric, config in self.metric_config.items():
+            base = archived_data.get(metric)
+            held_value = held_data.get(metric)
+            new_value = point[1].get(metric)
+            if base is None or held_value is None or new_value is None:
+                if base is None and held_value is None and new_value is None:
+                    continue
+                return False
+
+            tolerance = config['tolerance']
+            lower, upper = door.slopes.get(metric, (float('-inf'), float('inf')))
+            lower = max(lower, (held_value - tolerance - base) / held_dt)
+            upper = min(upper, (held_value + tolerance - base) / held_dt)
+
+            slope = (new_value - base) / new_dt
+            if not lower <= slope <= upper:
+                return False
+            narrowed[metric] = (lower, upper)
+
+        door.slopes.update(narrowed)
+        return True
+
+
+def reconstruct_series(points: List[Dict[str, Any]], metrics,
+                       step_minutes: float = RECONSTRUCT_STEP_MINUTES) -> List[Dict[str, Any]]:
+    """
+    Rekonstruiše seriju linearnom interpolacijom između sačuvanih tačaka
+
+    Args:
+        points (List[Dict]): Zapisi jednog uređaja sortirani hronološki; svaki ima
+            ključ '_sim_dt' (datetime) i vrednosti metrika
+        metrics: Nazivi metrika koje se interpoliraju
+        step_minutes (float): Korak rekonstrukcije
+
+    Returns:
+        List[Dict]: Hronološki sortirana rekonstruisana serija
+    """
+    result = []
+    step = timedelta(minutes=step_minutes)
+
+    for previous, current in zip(points, points[1:]):
+        result.append(previous)
+        span = _minutes_between(previous['_sim_dt'], current['_sim_dt'])
+        moment = previous['_sim_dt'] + step
+        while moment < current['_sim_dt']:
+            ratio = _minutes_between(previous['_sim_dt'], moment) / span
+            interpolated = {'_sim_dt': moment, 'reconstructed': True}
+            for metric in metrics:
+                start, end = previous.get(metric), current.get(metric)
+                if start is None or end is None:
+                    interpolated[metric] = start
+                else:
+                    interpolated[metric] = round(start + (end - start) * ratio, 2)
+            result.append(interpolated)
+            moment += step
+
+    if points:
+        result.append(points[-1])
+    return result
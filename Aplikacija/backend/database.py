@@ -0,0 +1,134 @@
+"""
+Pristup SQLite bazi: jedan pisac i pool konekcija samo za čitanje
+Sve izmene se izvršavaju redom u posebnom thread-u pisca, pa nema
+"database is locked" grešaka i redosled upisa je deterministički
+"""
+
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable
+
+
+DB_PATH = 'iot_data.db'
+
+
+class DatabaseWriter:
+    """
+    Thread koji serijski izvršava sve upise u bazu
+
+    Zahtev je funkcija koja dobija konekciju; izvršava se u transakciji,
+    a rezultat (ili izuzetak) se vraća kroz Future.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        """
+        Args:
+            db_path (str): Putanja do SQLite baze
+        """
+        self.db_path = db_path
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Pokreće thread pisca (ako već nije pokrenut)"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, work: Callable[[sqlite3.Connection], Any]) -> Future:
+        """
+        Stavlja upis u red
+
+        Args:
+            work (Callable): Funkcija work(conn) koja izvršava izmene
+
+        Returns:
+            Future: Rezultat funkcije posle commit-a
+        """
+        self.start()
+        future = Future()
+        self._queue.put((work, future))
+        return future
+
+    def run(self, work: Callable[[sqlite3.Connection], Any], timeout: float = 30.0) -> Any:
+        """Stavlja upis u red i čeka njegov rezultat"""
+        return self.submit(work).result(timeout=timeout)
+
+    def execute(self, sql: str, params=(), timeout: float = 30.0):
+        """
+        Izvršava jednu SQL izmenu i čeka rezultat
+
+        Returns:
+            Tuple[int, int]: (rowcount, lastrowid)
+        """
+        def work(conn):
+            cursor = conn.execute(sql, params)
+            return cursor.rowcount, cursor.lastrowid
+        return self.run(work, timeout)
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+
+        while True:
+            work, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                result = work(conn)
+                conn.execute('COMMIT')
+                future.set_result(result)
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                future.set_exception(e)
+
+
+class ReadPool:
+    """Pool konekcija otvorenih u query_only režimu"""
+
+    def __init__(self, db_path: str = DB_PATH, size: int = 4):
+        """
+        Args:
+            db_path (str): Putanja do SQLite baze
+            size (int): Maksimalan broj otvorenih konekcija
+        """
+        self.db_path = db_path
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._size = size
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Pozajmljuje konekciju iz pool-a (blokira ako su sve zauzete)"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            # Završi eventualnu implicitnu transakciju čitanja pre vraćanja u pool
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self._size:
+                self._created += 1
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute('PRAGMA query_only = ON')
+                return conn
+
+        return self._pool.get()
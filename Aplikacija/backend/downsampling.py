@@ -0,0 +1,61 @@
+"""
+Largest-Triangle-Three-Buckets (LTTB) proređivanje serija za grafikone
+Iz svakog bucket-a bira se tačka koja sa prethodno izabranom tačkom i
+prosekom sledećeg bucket-a zatvara najveći trougao, pa vrhovi (ciklusi
+grijača i pumpe) ostaju vidljivi i kada se šalje samo nekoliko stotina tačaka.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, ys, max_points: int) -> np.ndarray:
+    """
+    Vraća indekse tačaka koje se zadržavaju
+
+    Args:
+        x (array): Vremena tačaka, rastuće (npr. epoch sekunde)
+        ys (array): Vrednosti oblika (broj_metrika, n); NaN su dozvoljeni
+        max_points (int): Maksimalan broj tačaka u rezultatu
+
+    Returns:
+        np.ndarray: Rastući indeksi izabranih tačaka (prva i poslednja su uvek uključene)
+    """
+    x = np.asarray(x, dtype=float)
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # Metrike se normalizuju na [0, 1] da bi doprinele površini podjednako
+    ys = ys[~np.isnan(ys).all(axis=1)]
+    if len(ys):
+        low = np.nanmin(ys, axis=1, keepdims=True)
+        span = np.nanmax(ys, axis=1, keepdims=True) - low
+        ys = (ys - low) / np.where(span > 0, span, 1.0)
+        ys = np.where(np.isnan(ys), np.nanmean(ys, axis=1, keepdims=True), ys)
+    else:
+        ys = np.zeros((1, n))
+
+    # max_points - 2 bucket-a između prve i poslednje tačke
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = ys[:, end:next_end].mean(axis=1, keepdims=True)
+
+        # Dvostruka površina trougla (a, kandidat, prosek sledećeg bucket-a), zbir po metrikama
+        area = np.abs(
+            (x[a] - avg_x) * (ys[:, start:end] - ys[:, a:a + 1])
+            - (x[a] - x[start:end]) * (avg_y - ys[:, a:a + 1])
+        ).sum(axis=0)
+
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
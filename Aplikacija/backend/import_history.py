@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Bulk uvoz istorijskih merenja u sensor_history
+Ulaz se čita u blokovima i upisuje sa executemany u velikim transakcijama,
+bez indeksa tokom unosa. Uvezeni zapisi dobijaju najveće id-eve, ali se
+istorija svuda čita po sim_time, pa se stariji podaci uklapaju na svoje mesto.
+
+Pokreće se dok backend ne radi: backend pri pokretanju puni memorijski buffer
+istorije iz baze i kešira upite, pa posle uvoza mora da se (ponovo) pokrene.
+Uvoz odbija da radi dok ingest daemon sluša na svom socket-u; backend koji
+ingest pokreće u istom procesu se ne može otkriti, pa ga treba zaustaviti ručno.
+
+Primeri:
+    python import_history.py merenja.csv
+    python import_history.py merenja.ndjson --format ndjson
+    python import_history.py arhiva_simulacije/ --format simdata
+"""
+
+import argparse
+import calendar
+import csv
+import json
+import os
+import socket
+import sqlite3
+import time
+from datetime import datetime
+from itertools import islice
+
+from database import DB_PATH
+from ipc import INGEST_SOCKET
+from migrations import migrate, create_history_indexes, drop_history_indexes
+
+
+# Broj zapisa po executemany pozivu i po transakciji
+CHUNK_SIZE = 50000
+TRANSACTION_SIZE = 500000
+
+INSERT_SQL = '''
+    INSERT INTO sensor_history (device_type, temperatura, vlaznost, baterija, timestamp, sim_time)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Fajlovi SimData snimka i uređaj kome pripadaju
+SIMDATA_SENSORS = {
+    'BETON.JSON': 'beton_senzor',
+    'VAZDUH.JSON': 'povrsina_senzor',
+}
+
+
+def parse_epoch(value):
+    """Konvertuje ISO vreme (UTC, opciono sa 'Z') ili epoch sekunde u epoch sekunde"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = str(value).strip()
+    if value.lstrip('-').isdigit():
+        return int(value)
+    return calendar.timegm(datetime.fromisoformat(value.rstrip('Z')).timetuple())
+
+
+def parse_number(value):
+    """Prazna vrednost iz CSV-a postaje NULL"""
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def record_to_row(record):
+    """
+    Pretvara zapis (ključevi kao u /api/sensor-history) u red za INSERT
+    Ako nema timestamp-a koristi se sim_time, kao kod živog upisa.
+    """
+    sim_time = parse_epoch(record.get('sim_time') or record['timestamp'])
+    timestamp = parse_epoch(record['timestamp']) if record.get('timestamp') else sim_time
+    baterija = parse_number(record.get('baterija'))
+    return (
+        record['device_type'],
+        parse_number(record.get('temperatura')),
+        parse_number(record.get('vlaznost')),
+        int(baterija) if baterija is not None else None,
+        timestamp,
+        sim_time
+    )
+
+
+def read_csv(path):
+    """CSV sa zaglavljem: device_type, temperatura, vlaznost, baterija, sim_time[, timestamp]"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for record in csv.DictReader(f):
+            yield record_to_row(record)
+
+
+def read_ndjson(path):
+    """Jedan JSON zapis po liniji, sa istim ključevima kao CSV"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield record_to_row(json.loads(line))
+
+
+def read_simdata_snapshot(directory):
+    """Vraća redove jednog SimData snimka (time.json + fajlovi senzora)"""
+    with open(os.path.join(directory, 'time.json'), encoding='utf-8') as f:
+        sim_time = json.load(f)
+    epoch = parse_epoch(f"{sim_time['date']}T{sim_time['time']}")
+
+    rows = []
+    for filename, device_type in SIMDATA_SENSORS.items():
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        battery = data.get('battery_level')
+        rows.append((
+            device_type,
+            data.get('temperature'),
+            data.get('humidity'),
+            int(battery) if battery is not None else None,
+            epoch,
+            epoch
+        ))
+    return rows
+
+
+def read_simdata(path):
+    """
+    Replay SimData snimaka: jedan direktorijum sa time.json ili direktorijum
+    čiji su poddirektorijumi (sortirani po imenu) pojedinačni snimci
+    """
+    if os.path.exists(os.path.join(path, 'time.json')):
+        yield from read_simdata_snapshot(path)
+        return
+
+    for name in sorted(os.listdir(path)):
+        snapshot = os.path.join(path, name)
+        if os.path.isdir(snapshot) and os.path.exists(os.path.join(snapshot, 'time.json')):
+            yield from read_simdata_snapshot(snapshot)
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+    'simdata': read_simdata,
+}
+
+
+def detect_format(path):
+    """Određuje format po ekstenziji (direktorijum je SimData replay)"""
+    if os.path.isdir(path):
+        return 'simdata'
+    if path.lower().endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return 'csv'
+
+
+def ingest_running(path=INGEST_SOCKET):
+    """Da li ingest daemon prihvata veze na svom Unix socket-u"""
+    if not os.path.exists(path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False  # Socket je ostao posle prekinutog procesa
+    return True
+
+
+def bulk_import(db_path, rows, chunk_size=CHUNK_SIZE, transaction_size=TRANSACTION_SIZE, keep_indexes=False):
+    """
+    Upisuje redove u sensor_history
+
+    Args:
+        db_path (str): Putanja do SQLite baze
+        rows (Iterable[tuple]): Redovi u redosledu kolona INSERT_SQL
+        chunk_size (int): Broj redova po executemany pozivu
+        transaction_size (int): Broj redova po transakciji
+        keep_indexes (bool): Ne uklanjati indekse tokom unosa
+
+    Returns:
+        int: Broj upisanih redova
+    """
+    migrate(db_path)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-262144')  # 256 MB
+
+    started = time.perf_counter()
+    total = 0
+    in_transaction = 0
+    rows = iter(rows)
+
+    try:
+        if not keep_indexes:
+            drop_history_indexes(conn)
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            if not conn.in_transaction:
+                conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(INSERT_SQL, chunk)
+            total += len(chunk)
+            in_transaction += len(chunk)
+
+            if in_transaction >= transaction_size:
+                conn.execute('COMMIT')
+                in_transaction = 0
+
+            elapsed = time.perf_counter() - started
+            print(f"📥 {total} zapisa ({total / elapsed:.0f} zapisa/s)")
+
+        if conn.in_transaction:
+            conn.execute('COMMIT')
+    except BaseException:
+        # I Ctrl+C - nedovršena transakcija se poništava pre obnove indeksa
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        # Indeksi se prave jednom nad svim podacima (van transakcije), pa statistika za planer upita
+        index_started = time.perf_counter()
+        conn.execute('PRAGMA synchronous=NORMAL')
+        create_history_indexes(conn)
+        conn.execute('ANALYZE sensor_history')
+        conn.close()
+        print(f"📊 Indeksi i statistika obnovljeni za {time.perf_counter() - index_started:.1f} s")
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"✅ Uvezeno {total} zapisa za {elapsed:.1f} s ({rate:.0f} zapisa/s)")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk uvoz istorije senzora u sensor_history')
+    parser.add_argument('input', help='CSV/NDJSON fajl ili SimData direktorijum')
+    parser.add_argument('--format', choices=sorted(READERS), help='Format ulaza (podrazumevano po ekstenziji)')
+    parser.add_argument('--db', default=DB_PATH, help='Putanja do baze')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Redova po executemany pozivu')
+    parser.add_argument('--transaction-size', type=int, default=TRANSACTION_SIZE, help='Redova po transakciji')
+    parser.add_argument('--keep-indexes', action='store_true', help='Ne uklanjati indekse tokom unosa')
+    args = parser.parse_args()
+
+    if ingest_running():
+        parser.error(f'ingest daemon radi ({INGEST_SOCKET}) - zaustavite backend pre uvoza')
+
+    input_format = args.format or detect_format(args.input)
+    print(f"📥 Uvoz {args.input} ({input_format}) u {args.db}")
+    bulk_import(
+        args.db,
+        READERS[input_format](args.input),
+        chunk_size=args.chunk_size,
+        transaction_size=args.transaction_size,
+        keep_indexes=args.keep_indexes
+    )
+    print("🔄 Pokrenite backend ponovo da bi buffer i keš istorije videli uvezene zapise")
+
+
+if __name__ == '__main__':
+    main()
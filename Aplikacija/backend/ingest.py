@@ -0,0 +1,388 @@
+"""
+Ingest daemon: dohvatanje podataka sa kontrolera, pravila očvršćavanja i upis u bazu
+Radi kao zaseban proces (python ingest.py) i živo stanje uređaja objavljuje
+API procesima preko Unix socket-a; bazu sa njima deli u WAL režimu.
+Može da radi i unutar API procesa (python app.py bez --external-ingest).
+"""
+
+import json
+import requests
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from compression import SensorCompressor, DEFAULT_METRIC_CONFIG
+from liveness import LivenessTracker
+from circuit_breaker import CircuitBreaker
+from rules import RuleEngine, CURING_RULES
+from migrations import migrate
+from database import DatabaseWriter, DB_PATH
+from sim_clock import get_current_sim_time, read_pour_time, format_sim_time_iso, to_epoch, from_epoch
+from ipc import StateServer, INGEST_SOCKET
+
+# Svi upisi ingest-a idu kroz jedan thread pisca
+db_writer = DatabaseWriter(DB_PATH)
+
+# URL kontrolera (test aplikacije)
+KONTROLER_URL = 'http://localhost:3000'
+
+# Endpoint-i kontrolera koji se periodično dohvataju
+KONTROLER_ENDPOINTS = [
+    ('beton_senzor', '/api/senzori/beton'),
+    ('povrsina_senzor', '/api/senzori/povrsina'),
+    ('pumpa', '/api/pumpa/stanje'),
+    ('grijac', '/api/grijac/stanje')
+]
+
+# Interval dohvatanja podataka (sekunde)
+POLL_INTERVAL = 10
+
+# Stanja uređaja - početno sve neaktivno
+device_status = {
+    'beton_senzor': {'active': False, 'last_update': None, 'data': None},
+    'povrsina_senzor': {'active': False, 'last_update': None, 'data': None},
+    'pumpa': {'active': False, 'last_update': None, 'data': None},
+    'grijac': {'active': False, 'last_update': None, 'data': None}
+}
+
+# Tracker za poslednje snimanje podataka (za 10-minutni interval)
+last_sensor_save = {
+    'beton_senzor': None,
+    'povrsina_senzor': None
+}
+
+# Kompresija istorije senzora (swinging door, heartbeat svakih 60 min)
+SENSOR_COMPRESSION_ENABLED = True
+SENSOR_METRICS = list(DEFAULT_METRIC_CONFIG.keys())
+sensor_compressor = SensorCompressor(DEFAULT_METRIC_CONFIG, max_gap_minutes=60)
+
+# Praćenje aktivnosti uređaja (timeout 1 minut simulovanog vremena)
+device_liveness = LivenessTracker(timeout=timedelta(minutes=1))
+
+# Poslednji događaji promene stanja uređaja (za dashboard/notifikacije)
+device_events = deque(maxlen=200)
+device_event_counter = 0
+device_events_lock = threading.Lock()
+
+def on_device_transition(device_name, active, when):
+    """Ažurira status uređaja i beleži događaj promene stanja"""
+    global device_event_counter
+    
+    if not active:
+        device_status[device_name]['active'] = False
+        print(f"⏰ {device_name}: Označen kao neaktivan (timeout)")
+    
+    with device_events_lock:
+        device_event_counter += 1
+        event = {
+            'id': device_event_counter,
+            'uredjaj': device_name,
+            'aktivan': active,
+            'vreme': format_sim_time_iso(when)
+        }
+        device_events.append(event)
+    
+    publish({'type': 'event', 'event': event})
+
+device_liveness.add_listener(on_device_transition)
+
+# Circuit breaker po endpoint-u - nedostupni uređaji se preskaču uz eksponencijalni backoff
+endpoint_breakers = {
+    device_name: CircuitBreaker(device_name, failure_threshold=3, base_backoff=10.0, max_backoff=300.0)
+    for device_name, _ in KONTROLER_ENDPOINTS
+}
+
+# Pravila očvršćavanja iz specifikacije - alarmi se upisuju kao notifikacije
+def raise_rule_alarm(uredjaj, tip, sim_time, poruka):
+    """Upisuje alarm engine-a pravila u tabelu notifikacija"""
+    save_notification(uredjaj, tip, format_sim_time_iso(sim_time), poruka)
+    print(f"🚨 [RULE] {poruka} ({tip}) - {uredjaj}")
+
+# Vreme izljevanja se čita iz time.json simulacije (menja se restartom simulacije)
+rule_engine = RuleEngine(CURING_RULES, read_pour_time, raise_rule_alarm)
+
+# Pretplatnici na promene stanja (IPC server ili API u istom procesu)
+listeners = []
+
+def add_listener(listener):
+    """Registruje funkciju listener(message) koja prima promene stanja"""
+    listeners.append(listener)
+
+def publish(message):
+    """Prosleđuje promenu stanja svim pretplatnicima"""
+    for listener in listeners:
+        try:
+            listener(message)
+        except Exception as e:
+            print(f"Greška pri objavljivanju stanja: {e}")
+
+def status_to_dict(status):
+    """Status uređaja u JSON obliku (vreme kao ISO string)"""
+    return {
+        'active': status['active'],
+        'last_update': status['last_update'].isoformat() if status['last_update'] else None,
+        'data': status['data']
+    }
+
+def pending_to_dict(device_type):
+    """Poslednje nesačuvano merenje kompresora u JSON obliku"""
+    pending = sensor_compressor.pending(device_type)
+    if not pending:
+        return None
+    return {'sim_time': format_sim_time_iso(pending[0]), 'data': pending[1]}
+
+def publish_status():
+    """Objavljuje status i breaker svih uređaja"""
+    publish({
+        'type': 'status',
+        'devices': {name: status_to_dict(status) for name, status in device_status.items()},
+        'breakers': {name: breaker.snapshot() for name, breaker in endpoint_breakers.items()}
+    })
+
+def snapshot():
+    """Celo trenutno stanje - šalje se API procesu pri povezivanju"""
+    with device_events_lock:
+        events = list(device_events)
+    return {
+        'type': 'snapshot',
+        'devices': {name: status_to_dict(status) for name, status in device_status.items()},
+        'breakers': {name: breaker.snapshot() for name, breaker in endpoint_breakers.items()},
+        'events': events,
+        'pending': {device_type: pending_to_dict(device_type) for device_type in last_sensor_save}
+    }
+
+# Poslednje upisano stanje po uređaju - upisuju se samo promene
+persisted_state = {}
+
+def point_to_json(point):
+    return [to_epoch(point[0]), point[1]] if point else None
+
+def point_from_json(value):
+    return (from_epoch(value[0]), value[1]) if value else None
+
+def device_state_row(device_name):
+    """Red tabele device_state za uređaj (status, poslednje snimanje, kompresor)"""
+    status = device_status[device_name]
+    last_save = last_sensor_save.get(device_name)
+    compressor = sensor_compressor.export_state(device_name)
+    if compressor:
+        compressor = dict(compressor, archived=point_to_json(compressor['archived']),
+                          held=point_to_json(compressor['held']))
+    return (
+        device_name,
+        json.dumps({
+            'active': status['active'],
+            'last_update': to_epoch(status['last_update']) if status['last_update'] else None,
+            'data': status['data']
+        }),
+        to_epoch(last_save) if last_save else None,
+        json.dumps(compressor) if compressor else None
+    )
+
+def save_device_state():
+    """Upisuje promenjeno stanje uređaja da bi se posle restarta nastavilo odatle"""
+    rows = [device_state_row(device_name) for device_name in device_status]
+    changed = [row for row in rows if persisted_state.get(row[0]) != row]
+    if not changed:
+        return
+    
+    db_writer.run(lambda conn: conn.executemany('''
+        INSERT OR REPLACE INTO device_state (device_type, status, last_save, compressor)
+        VALUES (?, ?, ?, ?)
+    ''', changed))
+    for row in changed:
+        persisted_state[row[0]] = row
+
+def load_device_state():
+    """Učitava stanje uređaja sačuvano pre restarta"""
+    rows = db_writer.run(lambda conn: conn.execute(
+        'SELECT device_type, status, last_save, compressor FROM device_state'
+    ).fetchall())
+    
+    for row in rows:
+        device_name, status, last_save, compressor = row
+        if device_name not in device_status:
+            continue
+        status = json.loads(status)
+        last_update = from_epoch(status['last_update']) if status['last_update'] is not None else None
+        device_status[device_name] = {
+            'active': status['active'],
+            'last_update': last_update,
+            'data': status['data']
+        }
+        # Rok aktivnosti teče od poslednjeg odgovora - zastareo uređaj ističe u prvom ciklusu
+        if status['active'] and last_update:
+            device_liveness.restore(device_name, last_update)
+        if last_save is not None:
+            last_sensor_save[device_name] = from_epoch(last_save)
+        if compressor:
+            compressor = json.loads(compressor)
+            sensor_compressor.restore_state(device_name, dict(
+                compressor,
+                archived=point_from_json(compressor['archived']),
+                held=point_from_json(compressor['held'])
+            ))
+        persisted_state[device_name] = tuple(row)
+    
+    print(f"📊 Stanje učitano za {len(rows)} uređaja")
+
+def should_save_sensor_data(device_type, current_sim_time=None):
+    """Proverava da li je vreme za novo snimanje podataka (svakih 10 minuta simulovano vreme)"""
+    if current_sim_time is None:
+        current_sim_time = get_current_sim_time()
+    last_save = last_sensor_save.get(device_type)
+    
+    if last_save is None:
+        print(f"📝 [SAVE_CHECK] First save for {device_type}")
+        return True
+    
+    time_diff = current_sim_time - last_save
+    minutes_diff = time_diff.total_seconds() / 60
+    
+    print(f"📝 [SAVE_CHECK] {device_type}: {minutes_diff:.1f} minutes since last save")
+    
+    # Čuva svakih 10 minuta ili više
+    return minutes_diff >= 10
+
+def fetch_device_data():
+    """Dohvata podatke sa kontrolera svakih 10 sekundi"""
+    while True:
+        cycle_start = time.monotonic()
+        try:
+            # Simulovano vreme se čita jednom po ciklusu
+            now = get_current_sim_time()
+            
+            # Dohvati podatke sa kontrolera
+            for device_name, endpoint in KONTROLER_ENDPOINTS:
+                breaker = endpoint_breakers[device_name]
+                
+                # Otvoren breaker - endpoint se preskače bez čekanja na timeout
+                if not breaker.allow_request():
+                    continue
+                
+                try:
+                    response = requests.get(f"{KONTROLER_URL}{endpoint}", timeout=5)
+                    
+                    if response.status_code == 200:
+                        data = response.json()
+                        breaker.record_success()
+                        device_status[device_name] = {
+                            'active': True,
+                            'last_update': now,
+                            'data': data
+                        }
+                        device_liveness.touch(device_name, now)
+                        
+                        # Proveri pravila očvršćavanja za novo merenje
+                        rule_engine.evaluate(device_name, now, data)
+                        
+                        # Sačuvaj podatke senzora u istoriju svakih 10 minuta (simulovano vreme)
+                        if device_name in ['beton_senzor', 'povrsina_senzor']:
+                            if should_save_sensor_data(device_name, now):
+                                store_sensor_sample(device_name, data, now)
+                                last_sensor_save[device_name] = now
+                        
+                        print(f"✅ {device_name}: {data}")
+                    else:
+                        breaker.record_failure(f"HTTP {response.status_code}")
+                        print(f"❌ {device_name}: HTTP {response.status_code}")
+                        
+                except requests.exceptions.RequestException as e:
+                    breaker.record_failure(str(e))
+                    print(f"🔴 {device_name}: Konekcija neuspešna - {e}")
+                    
+            # Proveri koje uređaje treba označiti kao neaktivne (preko 1 min bez odgovora)
+            check_device_timeouts(now)
+            
+            # API procesi dobijaju status i breaker-e jednom po ciklusu
+            publish_status()
+            save_device_state()
+            
+        except Exception as e:
+            print(f"Greška u fetch_device_data: {e}")
+            
+        # Svakih 10 sekundi - vreme potrošeno u ciklusu se oduzima da kadenca ostane stabilna
+        time.sleep(max(0.0, POLL_INTERVAL - (time.monotonic() - cycle_start)))
+
+def check_device_timeouts(current_time=None):
+    """Označava uređaje kao neaktivne ako nisu odgovorili preko 1 minuta"""
+    if current_time is None:
+        current_time = get_current_sim_time()
+    
+    # Obrađuju se samo uređaji kojima je rok istekao
+    return device_liveness.expire(current_time)
+
+def store_sensor_sample(device_type, data, sim_time=None):
+    """Prosleđuje uzorak kroz kompresiju i čuva samo tačke potrebne za rekonstrukciju"""
+    if sim_time is None:
+        sim_time = get_current_sim_time()
+    
+    if not SENSOR_COMPRESSION_ENABLED:
+        save_sensor_data(device_type, data, sim_time)
+    else:
+        points = sensor_compressor.offer(device_type, sim_time, data)
+        if not points:
+            print(f"🗜️ [COMPRESS] {device_type}: uzorak unutar tolerancije, ne čuva se")
+        for point_time, point_data in points:
+            save_sensor_data(device_type, point_data, point_time)
+    
+    # I nesačuvan uzorak menja rekonstruisanu seriju (poslednja tačka kompresora)
+    publish({'type': 'sample', 'device_type': device_type, 'pending': pending_to_dict(device_type)})
+
+def save_sensor_data(device_type, data, sim_time=None):
+    """Čuva podatke senzora u bazu za istoriju sa simulovanim vremenom"""
+    try:
+        if sim_time is None:
+            sim_time = get_current_sim_time()
+        sim_time_str = format_sim_time_iso(sim_time)
+        
+        print(f"💾 [SAVE] Saving {device_type} data at sim time: {sim_time_str}")
+        
+        row = {
+            'device_type': device_type,
+            'temperatura': data.get('temperatura'),
+            'vlaznost': data.get('vlaznost'),
+            'baterija': data.get('baterija'),
+            'timestamp': sim_time.strftime('%Y-%m-%d %H:%M:%S'),
+            'sim_time': sim_time_str
+        }
+        
+        # Vremena se čuvaju kao epoch sekunde, ISO stringovi se generišu samo za izlaz
+        _, row['id'] = db_writer.execute('''
+            INSERT INTO sensor_history (device_type, temperatura, vlaznost, baterija, timestamp, sim_time)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            row['device_type'],
+            row['temperatura'],
+            row['vlaznost'],
+            row['baterija'],
+            to_epoch(sim_time),
+            to_epoch(sim_time)
+        ))
+        
+        publish({'type': 'row', 'row': row})
+    except Exception as e:
+        print(f"Greška pri čuvanju podataka: {e}")
+
+def save_notification(uredjaj, tip, vreme, poruka):
+    """Čuva novu notifikaciju u bazu"""
+    db_writer.execute('''
+        INSERT INTO notifications (uredjaj, tip, vreme, poruka, procitana)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (uredjaj, tip, vreme, poruka, False))
+
+def start():
+    """Pokreće upis i dohvatanje podataka u pozadinskim thread-ovima"""
+    migrate(DB_PATH)
+    db_writer.start()
+    load_device_state()
+    data_thread = threading.Thread(target=fetch_device_data, name='ingest', daemon=True)
+    data_thread.start()
+    return data_thread
+
+if __name__ == '__main__':
+    server = StateServer(INGEST_SOCKET, snapshot)
+    add_listener(server.publish)
+    server.start()
+    start().join()
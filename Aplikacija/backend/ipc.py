@@ -0,0 +1,134 @@
+"""
+Razmena živog stanja između ingest daemon-a i API procesa preko Unix socket-a
+Poruke su JSON objekti, jedan po liniji. Server po povezivanju šalje snimak
+celog stanja, a zatim inkrementalne poruke; spor klijent se odbacuje i po
+ponovnom povezivanju dobija novi snimak, pa nikad ne usporava ingest.
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+INGEST_SOCKET = os.environ.get('INGEST_SOCKET', 'ingest.sock')
+
+# Broj poruka koje čekaju slanje jednom klijentu pre nego što se on odbaci
+CLIENT_QUEUE_SIZE = 1000
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, default=str) + '\n').encode('utf-8')
+
+
+class StateServer:
+    """Unix socket server koji prosleđuje poruke ingest-a svim povezanim API procesima"""
+
+    def __init__(self, path: str, snapshot: Callable[[], Dict[str, Any]]):
+        """
+        Args:
+            path (str): Putanja Unix socket-a
+            snapshot (Callable): Vraća poruku sa celim trenutnim stanjem
+        """
+        self.path = path
+        self._snapshot = snapshot
+        self._clients = set()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Otvara socket i prihvata klijente u pozadinskom thread-u"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.path)
+        self._sock.listen()
+        threading.Thread(target=self._accept_loop, name='ipc-accept', daemon=True).start()
+        print(f"🔌 [IPC] Stanje dostupno na {self.path}")
+
+    def publish(self, message: Dict[str, Any]):
+        """Stavlja poruku u red svakog klijenta (ne blokira)"""
+        data = encode(message)
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.put_nowait(data)
+            except queue.Full:
+                self._drop(client)
+
+    def _accept_loop(self):
+        while True:
+            conn, _ = self._sock.accept()
+            client = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+            # Snimak se uzima pod istim lock-om kao i registracija, pa nijedna poruka ne nedostaje
+            with self._lock:
+                client.put_nowait(encode(self._snapshot()))
+                self._clients.add(client)
+            threading.Thread(target=self._send_loop, args=(conn, client), name='ipc-send', daemon=True).start()
+
+    def _send_loop(self, conn, client):
+        try:
+            while True:
+                data = client.get()
+                if data is None:
+                    break
+                conn.sendall(data)
+        except OSError:
+            pass
+        finally:
+            self._drop(client)
+            conn.close()
+
+    def _drop(self, client):
+        with self._lock:
+            if client not in self._clients:
+                return
+            self._clients.discard(client)
+        # Oslobađa mesto u redu da bi se send thread sigurno probudio
+        while True:
+            try:
+                client.get_nowait()
+            except queue.Empty:
+                break
+        client.put_nowait(None)
+
+
+class StateClient:
+    """Prima poruke ingest daemon-a; posle prekida se ponovo povezuje"""
+
+    def __init__(self, path: str, on_message: Callable[[Dict[str, Any]], None],
+                 on_disconnect: Callable[[], None] = None, retry_interval: float = 2.0):
+        """
+        Args:
+            path (str): Putanja Unix socket-a
+            on_message (Callable): Poziva se za svaku primljenu poruku
+            on_disconnect (Callable): Poziva se kada veza sa daemon-om pukne
+            retry_interval (float): Pauza između pokušaja povezivanja (sekunde)
+        """
+        self.path = path
+        self._on_message = on_message
+        self._on_disconnect = on_disconnect
+        self.retry_interval = retry_interval
+
+    def start(self):
+        threading.Thread(target=self._run, name='ipc-client', daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(self.path)
+                    print(f"🔌 [IPC] Povezan sa ingest daemon-om ({self.path})")
+                    for line in sock.makefile('r', encoding='utf-8'):
+                        self._on_message(json.loads(line))
+            except OSError as e:
+                print(f"🔴 [IPC] Ingest daemon nedostupan: {e}")
+            except Exception as e:
+                print(f"Greška u obradi IPC poruke: {e}")
+
+            if self._on_disconnect:
+                self._on_disconnect()
+            time.sleep(self.retry_interval)
@@ -0,0 +1,115 @@
+"""
+Praćenje aktivnosti uređaja pomoću min-heap-a rokova (deadline-a)
+Provera isteka obrađuje samo uređaje kojima je rok istekao - O(istekli) umesto O(uređaji)
+"""
+
+import heapq
+import itertools
+import threading
+from datetime import timedelta
+from typing import Callable, List
+
+
+class LivenessTracker:
+    """
+    Tracker aktivnosti uređaja
+
+    Svaki uređaj ima rok (poslednji odgovor + timeout). Rokovi se drže u min-heap-u;
+    zastareli unosi (uređaj se u međuvremenu javio) se lenjo odbacuju pri isteku.
+    Promene stanja (online/offline) se prosleđuju registrovanim slušaocima.
+    """
+
+    def __init__(self, timeout: timedelta = timedelta(minutes=1)):
+        """
+        Args:
+            timeout (timedelta): Vreme bez odgovora posle kog je uređaj neaktivan
+        """
+        self.timeout = timeout
+        self._heap = []
+        self._deadlines = {}   # uređaj -> važeći rok
+        self._active = {}      # uređaj -> trenutno stanje
+        self._counter = itertools.count()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[str, bool, object], None]):
+        """
+        Registruje slušaoca promena stanja
+
+        Args:
+            listener (Callable): Poziva se kao listener(uredjaj, aktivan, vreme)
+        """
+        self._listeners.append(listener)
+
+    def touch(self, device_name: str, now):
+        """
+        Beleži odgovor uređaja i pomera njegov rok
+
+        Args:
+            device_name (str): Naziv uređaja
+            now (datetime): Trenutno simulovano vreme
+        """
+        with self._lock:
+            deadline = now + self.timeout
+            self._deadlines[device_name] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._counter), device_name))
+            came_online = not self._active.get(device_name, False)
+            self._active[device_name] = True
+
+        if came_online:
+            self._emit(device_name, True, now)
+
+    def restore(self, device_name: str, last_seen):
+        """
+        Postavlja uređaj kao aktivan od poslednjeg poznatog odgovora, bez događaja
+        (koristi se pri pokretanju, kada se stanje učitava iz baze)
+        """
+        with self._lock:
+            deadline = last_seen + self.timeout
+            self._deadlines[device_name] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._counter), device_name))
+            self._active[device_name] = True
+
+    def expire(self, now) -> List[str]:
+        """
+        Označava kao neaktivne uređaje čiji je rok istekao
+
+        Args:
+            now (datetime): Trenutno simulovano vreme
+
+        Returns:
+            List[str]: Uređaji koji su upravo postali neaktivni
+        """
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] < now:
+                deadline, _, device_name = heapq.heappop(self._heap)
+                # Zastareo unos - uređaj se javio posle ovog roka
+                if self._deadlines.get(device_name) != deadline:
+                    continue
+                del self._deadlines[device_name]
+                if self._active.get(device_name):
+                    self._active[device_name] = False
+                    expired.append(device_name)
+
+            # Spreči neograničen rast heap-a kada se uređaji često javljaju
+            if len(self._heap) > 4 * len(self._deadlines) + 64:
+                self._heap = [entry for entry in self._heap
+                              if self._deadlines.get(entry[2]) == entry[0]]
+                heapq.heapify(self._heap)
+
+        for device_name in expired:
+            self._emit(device_name, False, now)
+        return expired
+
+    def is_active(self, device_name: str) -> bool:
+        """Vraća da li je uređaj trenutno aktivan"""
+        with self._lock:
+            return self._active.get(device_name, False)
+
+    def _emit(self, device_name: str, active: bool, when):
+        for listener in self._listeners:
+            try:
+                listener(device_name, active, when)
+            except Exception as e:
+                print(f"Greška u slušaocu aktivnosti uređaja: {e}")
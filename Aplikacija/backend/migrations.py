@@ -0,0 +1,255 @@
+"""
+Verzionisane migracije SQLite šeme
+Trenutna verzija se čuva u PRAGMA user_version; svaka migracija se izvršava
+tačno jednom, u transakciji. Pokretanje nad ažurnom bazom je jedan PRAGMA upit
+i provera indeksa istorije (CREATE INDEX IF NOT EXISTS).
+"""
+
+import sqlite3
+import time
+
+
+# Broj zapisa po transakciji kod popunjavanja postojećih podataka
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def _create_base_tables(cursor):
+    # Tabela za notifikacije/greške
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            uredjaj TEXT NOT NULL,
+            tip TEXT NOT NULL,
+            vreme TEXT NOT NULL,
+            poruka TEXT NOT NULL,
+            procitana BOOLEAN DEFAULT FALSE,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Tabela za istoriju podataka senzora
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sensor_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            device_type TEXT NOT NULL,
+            temperatura REAL,
+            vlaznost REAL,
+            baterija INTEGER,
+            timestamp TEXT NOT NULL,
+            sim_time TEXT NOT NULL
+        )
+    ''')
+
+
+def _add_sim_time_column(cursor):
+    # Starije baze nemaju sim_time kolonu
+    columns = [row[1] for row in cursor.execute('PRAGMA table_info(sensor_history)')]
+    if 'sim_time' not in columns:
+        cursor.execute('ALTER TABLE sensor_history ADD COLUMN sim_time TEXT')
+
+
+def _backfill_sim_time(cursor):
+    # Jedan blok zapisa po id-u; vraća broj pregledanih zapisa (0 kada je tabela obrađena).
+    # Poslednji obrađen id se čuva u privremenoj tabeli konekcije, pa blok ne skenira ispočetka
+    cursor.execute('CREATE TEMP TABLE IF NOT EXISTS backfill_cursor (last_id INTEGER NOT NULL)')
+    row = cursor.execute('SELECT last_id FROM backfill_cursor').fetchone()
+    last_id = row[0] if row else 0
+    chunk_end, scanned = cursor.execute('''
+        SELECT MAX(id), COUNT(*) FROM (
+            SELECT id FROM sensor_history WHERE id > ? ORDER BY id LIMIT ?
+        )
+    ''', (last_id, BACKFILL_CHUNK_SIZE)).fetchone()
+    if not scanned:
+        cursor.execute('DROP TABLE temp.backfill_cursor')
+        return 0
+    cursor.execute('''
+        UPDATE sensor_history SET sim_time = timestamp
+        WHERE id > ? AND id <= ? AND (sim_time IS NULL OR sim_time = '')
+    ''', (last_id, chunk_end))
+    cursor.execute('DELETE FROM backfill_cursor')
+    cursor.execute('INSERT INTO backfill_cursor (last_id) VALUES (?)', (chunk_end,))
+    return scanned
+
+
+# Indeksi tabele istorije - bulk import ih uklanja pre unosa i pravi ponovo na kraju
+HISTORY_INDEXES = {
+    'idx_sensor_history_device_id': '(device_type, id)',
+    'idx_sensor_history_device_sim_time': '(device_type, sim_time)',
+    'idx_sensor_history_sim_time': '(sim_time)',
+}
+
+
+def create_history_indexes(cursor):
+    for name, columns in HISTORY_INDEXES.items():
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON sensor_history{columns}')
+
+
+def drop_history_indexes(cursor):
+    for name in HISTORY_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def _copy_history_as_epoch(cursor):
+    # Nova tabela sa vremenima kao celobrojnim epoch sekundama (UTC simulovanog vremena)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sensor_history_epoch (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            device_type TEXT NOT NULL,
+            temperatura REAL,
+            vlaznost REAL,
+            baterija INTEGER,
+            timestamp INTEGER NOT NULL,
+            sim_time INTEGER NOT NULL
+        )
+    ''')
+    # Jedan blok zapisa, nastavlja od poslednjeg prekopiranog id-a
+    cursor.execute('''
+        INSERT INTO sensor_history_epoch (id, device_type, temperatura, vlaznost, baterija, timestamp, sim_time)
+        SELECT id, device_type, temperatura, vlaznost, baterija,
+               COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), 0),
+               COALESCE(CAST(strftime('%s', sim_time) AS INTEGER),
+                        CAST(strftime('%s', timestamp) AS INTEGER), 0)
+        FROM sensor_history
+        WHERE id > (SELECT IFNULL(MAX(id), 0) FROM sensor_history_epoch)
+        ORDER BY id
+        LIMIT ?
+    ''', (BACKFILL_CHUNK_SIZE,))
+    return cursor.rowcount
+
+
+def _swap_epoch_history(cursor):
+    cursor.execute('DROP TABLE sensor_history')
+    cursor.execute('ALTER TABLE sensor_history_epoch RENAME TO sensor_history')
+    create_history_indexes(cursor)
+
+
+def _create_notifications_fts(cursor):
+    # Full-text indeks nad notifikacijama (external content - tekst se ne duplira)
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS notifications_fts USING fts5(
+            poruka, tip, uredjaj,
+            content='notifications',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    ''')
+
+    # Triggeri drže indeks usklađenim sa tabelom notifikacija
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS notifications_fts_insert AFTER INSERT ON notifications BEGIN
+            INSERT INTO notifications_fts(rowid, poruka, tip, uredjaj)
+            VALUES (new.id, new.poruka, new.tip, new.uredjaj);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS notifications_fts_delete AFTER DELETE ON notifications BEGIN
+            INSERT INTO notifications_fts(notifications_fts, rowid, poruka, tip, uredjaj)
+            VALUES ('delete', old.id, old.poruka, old.tip, old.uredjaj);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS notifications_fts_update AFTER UPDATE OF poruka, tip, uredjaj ON notifications BEGIN
+            INSERT INTO notifications_fts(notifications_fts, rowid, poruka, tip, uredjaj)
+            VALUES ('delete', old.id, old.poruka, old.tip, old.uredjaj);
+            INSERT INTO notifications_fts(rowid, poruka, tip, uredjaj)
+            VALUES (new.id, new.poruka, new.tip, new.uredjaj);
+        END
+    ''')
+
+    # Postojeće notifikacije
+    cursor.execute("INSERT INTO notifications_fts(notifications_fts) VALUES ('rebuild')")
+
+
+def _create_device_state(cursor):
+    # Poslednje stanje uređaja, ritam snimanja i stanje kompresije - učitava se pri pokretanju
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS device_state (
+            device_type TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            last_save INTEGER,
+            compressor TEXT
+        )
+    ''')
+
+
+# (verzija, opis, funkcija, blokovska) - blokovska migracija se poziva dok ne vrati 0,
+# svaki blok u zasebnoj transakciji; verzija se upisuje tek u poslednjem bloku
+MIGRATIONS = [
+    (1, 'osnovne tabele', _create_base_tables, False),
+    (2, 'sim_time kolona', _add_sim_time_column, False),
+    (3, 'popuna sim_time', _backfill_sim_time, True),
+    (4, 'indeksi istorije', create_history_indexes, False),
+    (5, 'kopija istorije sa epoch vremenima', _copy_history_as_epoch, True),
+    (6, 'zamena tabele istorije', _swap_epoch_history, False),
+    (7, 'pretraga notifikacija (FTS5)', _create_notifications_fts, False),
+    (8, 'stanje uređaja za brzo pokretanje', _create_device_state, False),
+    (9, 'indeks istorije po sim_time', create_history_indexes, False),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn) -> int:
+    """Vraća trenutnu verziju šeme baze"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db_path: str) -> int:
+    """
+    Dovodi bazu na najnoviju verziju šeme
+
+    Args:
+        db_path (str): Putanja do SQLite baze
+
+    Returns:
+        int: Verzija šeme posle migracije
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        version = get_schema_version(conn)
+        if version >= LATEST_VERSION:
+            # Prekinut bulk import može ostaviti tabelu istorije bez indeksa
+            create_history_indexes(conn)
+            return version
+
+        for target, description, migration, chunked in MIGRATIONS:
+            if target <= version:
+                continue
+
+            started = time.perf_counter()
+            total_rows = 0
+            cursor = conn.cursor()
+            applied = True
+
+            while True:
+                cursor.execute('BEGIN IMMEDIATE')
+                # Drugi proces (API ili ingest) je možda već izvršio migraciju
+                if get_schema_version(conn) >= target:
+                    cursor.execute('COMMIT')
+                    applied = False
+                    break
+                try:
+                    processed = migration(cursor)
+                    if chunked:
+                        total_rows += processed
+                    done = not chunked or not processed
+                    if done:
+                        cursor.execute(f'PRAGMA user_version = {int(target)}')
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+                if done:
+                    break
+
+            version = target
+            if not applied:
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            details = f", {total_rows} zapisa" if chunked else ""
+            print(f"📊 Migracija {target} ({description}) izvršena za {elapsed:.0f} ms{details}")
+
+        return version
+    finally:
+        conn.close()
@@ -0,0 +1,135 @@
+"""
+LRU keš rezultata upita istorije
+Ključ su normalizovani parametri upita; unosi se poništavaju kada stignu novi
+podaci za uređaj na koji se odnose, a istovremeni identični upiti čekaju
+na jedno izvršavanje (single-flight)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+
+ALL_DEVICES = '*'
+
+
+class _InFlight:
+    """Upit koji se trenutno izvršava - ostali zahtevi za isti ključ čekaju na njega"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QueryCache:
+    """
+    LRU keš sa TTL-om i poništavanjem po uređaju
+
+    Svaki unos je označen uređajima čije podatke sadrži (ili ALL_DEVICES).
+    invalidate(uredjaj) briše samo unose koji zavise od tog uređaja.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0, clock=time.monotonic):
+        """
+        Args:
+            max_entries (int): Maksimalan broj unosa
+            ttl (float): Vreme važenja unosa (sekunde)
+            clock (Callable): Izvor vremena
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()   # ključ -> (istek, uređaji, rezultat)
+        self._by_device = {}            # uređaj -> skup ključeva
+        self._in_flight = {}            # ključ -> _InFlight
+        self._generation = {}           # uređaj -> broj poništavanja
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, devices: Iterable[str], compute: Callable[[], Any]) -> Any:
+        """
+        Vraća keširani rezultat ili ga izračunava (jednom za sve istovremene zahteve)
+
+        Args:
+            key (Hashable): Normalizovani parametri upita
+            devices (Iterable[str]): Uređaji čiji podaci ulaze u rezultat
+            compute (Callable): Funkcija koja izvršava upit
+        """
+        devices = tuple(devices)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                self._remove(key)
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _InFlight()
+                generation = self._snapshot_generation(devices)
+            self.misses += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                # Rezultat se ne kešira ako su u međuvremenu stigli novi podaci
+                if flight.error is None and generation == self._snapshot_generation(devices):
+                    self._store(key, devices, flight.result)
+            flight.done.set()
+
+        return flight.result
+
+    def invalidate(self, device_type: str):
+        """Poništava sve unose koji zavise od podataka uređaja"""
+        with self._lock:
+            self._generation[device_type] = self._generation.get(device_type, 0) + 1
+            keys = self._by_device.pop(device_type, set()) | self._by_device.get(ALL_DEVICES, set())
+            for key in keys:
+                self._remove(key)
+
+    def stats(self) -> dict:
+        """Vraća statistiku keša"""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _snapshot_generation(self, devices):
+        if ALL_DEVICES in devices:
+            return tuple(sorted(self._generation.items()))
+        return tuple(self._generation.get(device, 0) for device in devices)
+
+    def _store(self, key, devices, result):
+        self._remove(key)
+        self._entries[key] = (self._clock() + self.ttl, devices, result)
+        for device in devices:
+            self._by_device.setdefault(device, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for device in entry[1]:
+            keys = self._by_device.get(device)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_device[device]
@@ -0,0 +1,139 @@
+"""
+Ring buffer poslednjih zapisa istorije po uređaju
+Česti upiti za poslednjih N tačaka se služe iz memorije umesto iz SQLite baze
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+class RingBuffer:
+    """
+    Ring buffer fiksne veličine nad unapred alociranom listom
+    Dodavanje je O(1); najstariji element se prepisuje kada je buffer pun
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity (int): Maksimalan broj elemenata
+        """
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0   # Indeks sledećeg upisa
+        self._count = 0
+
+    def append(self, item):
+        """Dodaje element, prepisuje najstariji ako je buffer pun"""
+        self._items[self._head] = item
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def latest(self, n: int) -> List[Any]:
+        """
+        Vraća najnovijih n elemenata (najnoviji prvi)
+
+        Args:
+            n (int): Broj elemenata
+        """
+        n = min(n, self._count)
+        return [self._items[(self._head - 1 - i) % self.capacity] for i in range(n)]
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def order_key(row: Dict[str, Any]):
+    """Redosled zapisa istorije: simulovano vreme, pa id (kao ORDER BY sim_time, id)"""
+    return datetime.fromisoformat(row['sim_time'].rstrip('Z')), row['id']
+
+
+class RecentReadings:
+    """
+    Poslednji zapisi sensor_history po uređaju
+
+    Buffer uređaja je "kompletan" kada sadrži sve zapise tog uređaja do kapaciteta,
+    pa upit sa limitom do kapaciteta daje isti rezultat kao i baza. Zapis koji stigne
+    sa simulovanim vremenom starijim od poslednjeg (npr. posle restarta simulacije)
+    ne može se samo dodati na kraj, pa se upiti za taj uređaj do sledećeg
+    popunjavanja služe iz baze.
+    """
+
+    def __init__(self, capacity: int = 500):
+        """
+        Args:
+            capacity (int): Broj zapisa koji se čuvaju po uređaju
+        """
+        self.capacity = capacity
+        self._buffers = {}
+        self._max_ids = {}   # Najveći id po uređaju (zapisi već učitani iz baze se preskaču)
+        self._stale = set()  # Uređaji čiji buffer više ne prati redosled baze
+        self._warm = False
+        self._lock = threading.Lock()
+
+    def warm(self, rows_by_device: Dict[str, List[Dict[str, Any]]]):
+        """
+        Puni buffer-e zapisima iz baze pri pokretanju
+
+        Args:
+            rows_by_device (Dict[str, List[Dict]]): Zapisi po uređaju, najnoviji prvi
+        """
+        with self._lock:
+            for device_type, rows in rows_by_device.items():
+                buffer = RingBuffer(self.capacity)
+                for row in reversed(rows[:self.capacity]):
+                    buffer.append(row)
+                self._buffers[device_type] = buffer
+                self._max_ids[device_type] = max((row['id'] for row in rows), default=0)
+            self._stale.clear()
+            self._warm = True
+
+    def append(self, row: Dict[str, Any]):
+        """Dodaje novi sačuvan zapis (mora imati id i device_type)"""
+        with self._lock:
+            buffer = self._buffers.get(row['device_type'])
+            if buffer is None:
+                buffer = self._buffers[row['device_type']] = RingBuffer(self.capacity)
+            # Zapis je možda već učitan iz baze pri popunjavanju buffer-a
+            if row['id'] <= self._max_ids.get(row['device_type'], 0):
+                return
+            self._max_ids[row['device_type']] = row['id']
+            latest = buffer.latest(1)
+            if latest and order_key(row) < order_key(latest[0]):
+                self._stale.add(row['device_type'])
+                return
+            buffer.append(row)
+
+    def query(self, device_type: Optional[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Vraća poslednjih `limit` zapisa (najnoviji prvi), kao ORDER BY sim_time DESC, id DESC LIMIT
+
+        Args:
+            device_type (Optional[str]): Uređaj ili None za sve uređaje
+            limit (int): Broj zapisa
+
+        Returns:
+            Optional[List[Dict]]: Kopije zapisa ili None ako upit izlazi iz prozora buffer-a
+        """
+        if limit > self.capacity:
+            return None
+
+        with self._lock:
+            if not self._warm:
+                return None
+            if self._stale and (device_type is None or device_type in self._stale):
+                return None
+
+            if device_type is not None:
+                buffer = self._buffers.get(device_type)
+                rows = buffer.latest(limit) if buffer else []
+            else:
+                # Globalnih poslednjih N je podskup unije poslednjih N po uređaju
+                rows = []
+                for buffer in self._buffers.values():
+                    rows.extend(buffer.latest(limit))
+                rows.sort(key=order_key, reverse=True)
+                rows = rows[:limit]
+
+            return [dict(row) for row in rows]
@@ -0,0 +1,222 @@
+"""
+Streaming engine za alarme očvršćavanja betona prema Specifikacija.md
+Pravila su deklarativna; svako merenje se procenjuje u konstantnom vremenu
+uz O(1) stanje po paru (pravilo, uređaj)
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional
+
+
+# Pravila iz specifikacije. Svako pravilo:
+#   uredjaj   - uređaj čija merenja se procenjuju
+#   metrika   - polje iz podataka uređaja
+#   referenca - (uredjaj, metrika) čija se poslednja vrednost oduzima (razlika temperatura)
+#   raspored  - granice po satima od izljevanja; prvi red sa do_sati >= proteklo se primenjuje
+#   trajanje_minuta - koliko dugo uslov mora biti narušen pre alarma (0 = odmah)
+#   potiskuje - ID-jevi pravila istog uređaja bez alarma dok je ovo pravilo narušeno
+#   tip/poruka - tip i tekst notifikacije ({vrednost}, {min}, {max} se popunjavaju); tip je
+#                jedan od tipova iz specifikacije ili {'ispod': ..., 'iznad': ...} po smeru narušavanja
+# Beton hladniji od granice (ili od vazduha) je niska, topliji visoka temperatura
+TEMPERATURE_TYPES = {'ispod': 'niska_temperatura', 'iznad': 'visoka_temperatura'}
+
+CURING_RULES = [
+    {
+        'id': 'kriticna_temperatura_betona',
+        'uredjaj': 'beton_senzor',
+        'metrika': 'temperatura',
+        'raspored': [{'do_sati': None, 'min': 0.0, 'max': 40.0}],
+        'trajanje_minuta': 0,
+        'potiskuje': ['temperatura_betona'],
+        'tip': TEMPERATURE_TYPES,
+        'poruka': 'Kritično: temperatura betona {vrednost:.1f}°C van opsega {min:.0f}-{max:.0f}°C'
+    },
+    {
+        'id': 'temperatura_betona',
+        'uredjaj': 'beton_senzor',
+        'metrika': 'temperatura',
+        'raspored': [{'do_sati': None, 'min': 5.0, 'max': 35.0}],
+        'trajanje_minuta': 0,
+        'tip': TEMPERATURE_TYPES,
+        'poruka': 'Temperatura betona {vrednost:.1f}°C van dozvoljenog opsega {min:.0f}-{max:.0f}°C'
+    },
+    {
+        'id': 'razlika_temperature',
+        'uredjaj': 'beton_senzor',
+        'metrika': 'temperatura',
+        'referenca': ('povrsina_senzor', 'temperatura'),
+        'raspored': [
+            {'do_sati': 12, 'min': -3.0, 'max': 3.0},
+            {'do_sati': 24, 'min': -5.0, 'max': 5.0},
+            {'do_sati': 7 * 24, 'min': -7.0, 'max': 7.0}
+        ],
+        'trajanje_minuta': 0,
+        'tip': TEMPERATURE_TYPES,
+        'poruka': 'Razlika temperature betona i vazduha {vrednost:+.1f}°C prelazi dozvoljenih ±{max:.0f}°C'
+    },
+    {
+        'id': 'vlaznost_betona',
+        'uredjaj': 'beton_senzor',
+        'metrika': 'vlaznost',
+        'raspored': [
+            {'do_sati': 12, 'min': 80.0, 'max': None},
+            {'do_sati': 24, 'min': 60.0, 'max': None},
+            {'do_sati': 48, 'min': 50.0, 'max': None},
+            {'do_sati': 72, 'min': 40.0, 'max': None},
+            {'do_sati': 7 * 24, 'min': 15.0, 'max': None}
+        ],
+        'trajanje_minuta': 120,
+        'tip': 'niska_vlaznost',
+        'poruka': 'Vlažnost betona {vrednost:.1f}% ispod ciljnih {min:.0f}% duže od 2 sata'
+    }
+] + [
+    {
+        'id': f'niska_baterija_{uredjaj}',
+        'uredjaj': uredjaj,
+        'metrika': 'baterija',
+        'raspored': [{'do_sati': None, 'min': 20.0, 'max': None}],
+        'trajanje_minuta': 0,
+        'tip': 'niska_baterija',
+        'poruka': 'Niska baterija uređaja {uredjaj}: {vrednost:.0f}%'
+    }
+    for uredjaj in ('beton_senzor', 'povrsina_senzor', 'pumpa', 'grijac')
+]
+
+
+class _RuleState:
+    """Stanje jednog pravila za jedan uređaj"""
+    __slots__ = ('violated_since', 'alarmed')
+
+    def __init__(self):
+        self.violated_since = None  # Početak trenutnog narušavanja
+        self.alarmed = False        # Alarm je već podignut za ovo narušavanje
+
+
+class RuleEngine:
+    """
+    Engine za procenu pravila nad tokom merenja
+
+    Pravila su indeksirana po uređaju, tako da merenje procenjuje samo pravila
+    tog uređaja. Alarm se podiže jednom po narušavanju, a ponovo se naoružava
+    kada se vrednost vrati u dozvoljeni opseg.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]], pour_time: Callable[[], Optional[datetime]],
+                 notify: Callable[[str, str, Any, str], None]):
+        """
+        Args:
+            rules (List[Dict]): Deklarativna pravila (videti CURING_RULES)
+            pour_time (Callable): Vraća vreme izljevanja betona (početak rasporeda) ili None
+                ako nije poznato - tada se procenjuju samo pravila bez rasporeda po satima
+            notify (Callable): notify(uredjaj, tip, vreme, poruka) za podizanje alarma
+        """
+        self.pour_time = pour_time
+        self.notify = notify
+        self._rules_by_device = {}
+        for rule in rules:
+            self._rules_by_device.setdefault(rule['uredjaj'], []).append(rule)
+        self._states = {}
+        self._latest = {}  # (uredjaj, metrika) -> poslednja vrednost, za pravila sa referencom
+        self._lock = threading.Lock()
+
+    def evaluate(self, device_name: str, sim_time, data: Dict[str, Any]) -> List[str]:
+        """
+        Procenjuje pravila uređaja za novo merenje
+
+        Args:
+            device_name (str): Naziv uređaja
+            sim_time (datetime): Simulovano vreme merenja
+            data (Dict[str, Any]): Podaci uređaja
+
+        Returns:
+            List[str]: ID-jevi pravila za koja je upravo podignut alarm
+        """
+        pour_time = self.pour_time()
+        hours_since_pour = (sim_time - pour_time).total_seconds() / 3600 if pour_time else None
+        alarms = []
+
+        with self._lock:
+            for metric, value in data.items():
+                if isinstance(value, (int, float)):
+                    self._latest[(device_name, metric)] = value
+
+            evaluated = []
+            for rule in self._rules_by_device.get(device_name, ()):
+                value = self._rule_value(rule, data)
+                limits = self._active_limits(rule, hours_since_pour)
+                if value is not None and limits is not None:
+                    evaluated.append((rule, value, limits, self._violates(value, limits)))
+
+            # Pravila koja potiskuje neko trenutno narušeno pravilo (kritično nad upozorenjem)
+            suppressed = {suppressed_id
+                          for rule, _, _, violated in evaluated if violated
+                          for suppressed_id in rule.get('potiskuje', ())}
+
+            for rule, value, limits, violated in evaluated:
+                state = self._states.get((rule['id'], device_name))
+                if state is None:
+                    state = self._states[(rule['id'], device_name)] = _RuleState()
+
+                if not violated:
+                    state.violated_since = None
+                    state.alarmed = False
+                    continue
+
+                if state.violated_since is None:
+                    state.violated_since = sim_time
+                violated_minutes = (sim_time - state.violated_since).total_seconds() / 60
+
+                # Potisnuto narušavanje se računa kao već prijavljeno, pa se ne prijavljuje
+                # ni kada se vrednost vrati iz kritičnog opsega u opseg upozorenja
+                if rule['id'] in suppressed:
+                    state.alarmed = True
+                    continue
+
+                if not state.alarmed and violated_minutes >= rule.get('trajanje_minuta', 0):
+                    state.alarmed = True
+                    alarms.append((rule, value, limits))
+
+        for rule, value, limits in alarms:
+            poruka = rule['poruka'].format(vrednost=value, min=limits['min'] or 0,
+                                           max=limits['max'] or 0, uredjaj=device_name)
+            self.notify(device_name, self._alarm_type(rule, value, limits), sim_time, poruka)
+
+        return [rule['id'] for rule, _, _ in alarms]
+
+    def _rule_value(self, rule: Dict[str, Any], data: Dict[str, Any]) -> Optional[float]:
+        value = data.get(rule['metrika'])
+        if not isinstance(value, (int, float)):
+            return None
+        reference = rule.get('referenca')
+        if reference:
+            reference_value = self._latest.get(tuple(reference))
+            if reference_value is None:
+                return None
+            value -= reference_value
+        return value
+
+    @staticmethod
+    def _active_limits(rule: Dict[str, Any], hours_since_pour: Optional[float]) -> Optional[Dict[str, Any]]:
+        for limits in rule['raspored']:
+            if limits['do_sati'] is None:
+                return limits
+            if hours_since_pour is not None and hours_since_pour <= limits['do_sati']:
+                return limits
+        return None
+
+    @staticmethod
+    def _alarm_type(rule: Dict[str, Any], value: float, limits: Dict[str, Any]) -> str:
+        alarm_type = rule['tip']
+        if isinstance(alarm_type, dict):
+            below = limits['min'] is not None and value < limits['min']
+            return alarm_type['ispod' if below else 'iznad']
+        return alarm_type
+
+    @staticmethod
+    def _violates(value: float, limits: Dict[str, Any]) -> bool:
+        if limits['min'] is not None and value < limits['min']:
+            return True
+        if limits['max'] is not None and value > limits['max']:
+            return True
+        return False
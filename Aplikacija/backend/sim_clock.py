@@ -0,0 +1,81 @@
+"""
+Simulovano vreme iz SimData/time.json
+Deli se između API procesa i ingest daemon-a
+"""
+
+import calendar
+import json
+import os
+from datetime import datetime, timedelta
+
+
+def get_sim_time_path():
+    """Vraća apsolutni put do time.json fajla"""
+    # Idemo iz backend direktorijuma do root-a projekta (Aplikacija/backend -> IoT projekat)
+    backend_dir = os.path.dirname(os.path.abspath(__file__))  # /home/bagi/Desktop/IoT projekat/Aplikacija/backend
+    aplikacija_dir = os.path.dirname(backend_dir)  # /home/bagi/Desktop/IoT projekat/Aplikacija
+    project_root = os.path.dirname(aplikacija_dir)  # /home/bagi/Desktop/IoT projekat
+    time_path = os.path.join(project_root, 'SimData', 'time.json')
+    print(f"🔍 [DEBUG] Looking for time.json at: {time_path}")
+    print(f"🔍 [DEBUG] File exists: {os.path.exists(time_path)}")
+    return time_path
+
+def read_sim_time():
+    """Čita simulovano vreme iz SimData/time.json"""
+    try:
+        time_path = get_sim_time_path()
+        
+        # Proverava da li fajl postoji
+        if not os.path.exists(time_path):
+            print(f"❌ [ERROR] Time file does not exist: {time_path}")
+            return datetime.now()
+        
+        print(f"📖 [DEBUG] Reading time from: {time_path}")
+        with open(time_path, 'r', encoding='utf-8') as f:
+            time_data = json.load(f)
+        
+        print(f"📅 [DEBUG] Loaded time data: {time_data}")
+        
+        # Kombina datum i vreme u datetime objekat
+        date_str = time_data['date']
+        time_str = time_data['time']
+        datetime_str = f"{date_str} {time_str}"
+        print(f"🕐 [DEBUG] Parsing datetime: {datetime_str}")
+        sim_datetime = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
+        
+        print(f"✅ [SUCCESS] Sim time parsed: {sim_datetime}")
+        return sim_datetime
+    except Exception as e:
+        print(f"⚠️ [WARNING] Could not read sim time: {e}, using system time")
+        return datetime.now()
+
+def get_current_sim_time():
+    """Vraća trenutno simulovano vreme"""
+    return read_sim_time()
+
+def read_pour_time():
+    """
+    Čita vreme izljevanja betona (start_date/start_time iz SimData/time.json)
+    Vraća None ako time.json ne postoji ili ga je upisala starija simulacija bez tih polja.
+    """
+    try:
+        with open(get_sim_time_path(), 'r', encoding='utf-8') as f:
+            time_data = json.load(f)
+        return datetime.strptime(f"{time_data['start_date']} {time_data['start_time']}", '%Y-%m-%d %H:%M:%S')
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ [WARNING] Could not read pour time: {e}")
+        return None
+
+def format_sim_time_iso(sim_time=None):
+    """Formatira simulovano vreme u ISO format"""
+    if sim_time is None:
+        sim_time = get_current_sim_time()
+    return sim_time.isoformat() + 'Z'
+
+def to_epoch(sim_time):
+    """Konvertuje simulovano vreme u celobrojne epoch sekunde (format čuvanja u bazi)"""
+    return calendar.timegm(sim_time.timetuple())
+
+def from_epoch(seconds):
+    """Konvertuje epoch sekunde iz baze nazad u datetime objekat"""
+    return datetime(1970, 1, 1) + timedelta(seconds=seconds)
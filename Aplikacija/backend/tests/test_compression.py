@@ -0,0 +1,96 @@
+"""
+Testovi kompresije istorije senzora (compression.py)
+Pokretanje iz Aplikacija/backend: python -m unittest discover tests
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compression import SensorCompressor, DEFAULT_METRIC_CONFIG, reconstruct_series
+
+
+START = datetime(2025, 5, 5, 12, 0, 0)
+
+
+def compress(compressor, samples):
+    """Sačuvane tačke serije, uključujući poslednju zadržanu (kao pri čitanju istorije)"""
+    stored = []
+    for sim_time, data in samples:
+        stored.extend(compressor.offer('beton_senzor', sim_time, data))
+    pending = compressor.pending('beton_senzor')
+    if pending and pending[0] > stored[-1][0]:
+        stored.append(pending)
+    return stored
+
+
+def interpolate(stored, sim_time, metric):
+    """Vrednost linearne rekonstrukcije u trenutku sim_time"""
+    for (start_time, start), (end_time, end) in zip(stored, stored[1:]):
+        if start_time <= sim_time <= end_time:
+            ratio = (sim_time - start_time) / (end_time - start_time)
+            return start[metric] + (end[metric] - start[metric]) * ratio
+    raise AssertionError(f"{sim_time} je van sačuvane serije")
+
+
+def random_walk(rnd, count):
+    """Slučajan hod svih metrika sa nejednakim razmacima merenja"""
+    values = {'temperatura': 20.0, 'vlaznost': 80.0, 'baterija': 100.0}
+    steps = {'temperatura': 0.15, 'vlaznost': 0.4, 'baterija': 0.3}
+    sim_time = START
+    samples = []
+    for _ in range(count):
+        for metric, step in steps.items():
+            values[metric] += rnd.gauss(0, step * rnd.random())
+        sim_time += timedelta(minutes=rnd.choice([1, 5, 10]))
+        samples.append((sim_time, dict(values)))
+    return samples
+
+
+class SensorCompressorTest(unittest.TestCase):
+
+    def assert_within_tolerance(self, samples, stored):
+        for sim_time, data in samples:
+            for metric, config in DEFAULT_METRIC_CONFIG.items():
+                error = abs(interpolate(stored, sim_time, metric) - data[metric])
+                self.assertLessEqual(error, config['tolerance'] + 1e-9,
+                                     f"{metric} u {sim_time}: odstupanje {error:.3f}")
+
+    def test_random_walks_reconstruct_within_tolerance(self):
+        rnd = random.Random(2025)
+        for _ in range(100):
+            samples = random_walk(rnd, 300)
+            stored = compress(SensorCompressor(), samples)
+            self.assert_within_tolerance(samples, stored)
+            self.assertLess(len(stored), len(samples))
+
+    def test_small_changes_still_narrow_the_door(self):
+        # Sitne promene (0.24 posle 0.2) ne smeju ostati van tolerancije kada vrata zatvori skok
+        samples = [(START + timedelta(minutes=10 * i), {'temperatura': value})
+                   for i, value in enumerate([0.0, 0.2, 0.24, 0.9, 5.0])]
+        compressor = SensorCompressor({'temperatura': DEFAULT_METRIC_CONFIG['temperatura']})
+        stored = compress(compressor, samples)
+        for sim_time, data in samples:
+            self.assertLessEqual(abs(interpolate(stored, sim_time, 'temperatura') - data['temperatura']), 0.2)
+
+    def test_heartbeat_limits_gap(self):
+        samples = [(START + timedelta(minutes=10 * i), {'temperatura': 20.0, 'vlaznost': 80.0, 'baterija': 90})
+                   for i in range(50)]
+        stored = compress(SensorCompressor(max_gap_minutes=60), samples)
+        for (start_time, _), (end_time, _) in zip(stored, stored[1:]):
+            self.assertLessEqual(end_time - start_time, timedelta(minutes=60))
+
+    def test_reconstruct_series_fills_cadence(self):
+        points = [{'_sim_dt': START, 'temperatura': 20.0},
+                  {'_sim_dt': START + timedelta(minutes=40), 'temperatura': 24.0}]
+        series = reconstruct_series(points, ['temperatura'])
+        self.assertEqual([point['temperatura'] for point in series], [20.0, 21.0, 22.0, 23.0, 24.0])
+        self.assertTrue(all(point.get('reconstructed') for point in series[1:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -147,7 +147,7 @@ function initializeEventListeners() {
     const timeRange = document.getElementById('time-range');
     
     if (refreshBtn) refreshBtn.addEventListener('click', loadHistoryData);
-    if (timeRange) timeRange.addEventListener('change', loadHistoryData);
+    if (timeRange) timeRange.addEventListener('change', reloadHistoryData);
     
     // Notification controls
     const markAllReadBtn = document.getElementById('mark-all-read');
@@ -220,6 +220,9 @@ function startDataRefresh() {
     // Check for new notifications every 2 seconds for real-time updates
     setInterval(loadNotifications, 2000);
     
+    // Append new history points every 10 seconds while the history tab is open
+    setInterval(refreshHistoryIfVisible, 10000);
+    
     // Initial load with delay to ensure DOM is ready
     setTimeout(() => {
         console.log('🎯 Performing initial data load...');
@@ -707,27 +710,50 @@ function initializeCharts() {
     });
 }
 
+// Incremental history state
+const HISTORY_WINDOW = 50; // Broj tačaka vidljivih na grafikonu
+const HISTORY_SOURCES = { beton_senzor: 'beton', povrsina_senzor: 'vazduh' };
+let historyCursors = {}; // device_type -> sim_time poslednje prikazane tačke
+let chartTimeKeys = []; // timestamp ključevi paralelni sa labelama grafikona
+
 async function loadHistoryData() {
     const timeRange = document.getElementById('time-range').value;
     
     try {
         console.log('📊 Loading sensor history data...');
         
-        // Učitaj podatke za oba senzora
-        const betonResponse = await fetch(`${API_BASE_URL}/sensor-history?device_type=beton_senzor&limit=100`);
-        const vazduhResponse = await fetch(`${API_BASE_URL}/sensor-history?device_type=povrsina_senzor&limit=100`);
+        // Posle prvog učitavanja traže se samo tačke novije od poslednje prikazane
+        const deviceTypes = Object.keys(HISTORY_SOURCES);
+        const responses = await Promise.all(deviceTypes.map(deviceType => {
+            let url = `${API_BASE_URL}/sensor-history?device_type=${deviceType}&limit=100`;
+            if (historyCursors[deviceType]) {
+                url += `&after_sim_time=${encodeURIComponent(historyCursors[deviceType])}`;
+            }
+            return fetch(url);
+        }));
         
-        if (!betonResponse.ok || !vazduhResponse.ok) {
+        if (responses.some(response => !response.ok)) {
             throw new Error('Failed to fetch sensor history');
         }
         
-        const betonData = await betonResponse.json();
-        const vazduhData = await vazduhResponse.json();
+        const results = await Promise.all(responses.map(response => response.json()));
         
-        console.log('📊 Beton history:', betonData);
-        console.log('📊 Vazduh history:', vazduhData);
+        let added = 0;
+        deviceTypes.forEach((deviceType, i) => {
+            const records = results[i].data || [];
+            if (records.length > 0) {
+                // Backend vraća najnovije prve
+                historyCursors[deviceType] = records[0].sim_time;
+                added += appendHistoryPoints(records.slice().reverse(), HISTORY_SOURCES[deviceType]);
+            }
+        });
         
-        updateChartsWithSensorHistory(betonData.data || [], vazduhData.data || []);
+        if (added > 0) {
+            trimHistoryWindow();
+            temperatureChart.update();
+            humidityChart.update();
+        }
+        console.log(`📊 History updated: ${added} new points`);
         
     } catch (error) {
         console.error('❌ Error loading history data:', error);
@@ -735,6 +761,24 @@ async function loadHistoryData() {
     }
 }
 
+// Briše prikazanu istoriju i učitava je ponovo
+function reloadHistoryData() {
+    historyCursors = {};
+    chartTimeKeys = [];
+    [temperatureChart, humidityChart].forEach(chart => {
+        chart.data.labels = [];
+        chart.data.datasets.forEach(dataset => dataset.data = []);
+    });
+    loadHistoryData();
+}
+
+function refreshHistoryIfVisible() {
+    const historyTab = document.getElementById('history');
+    if (historyTab && historyTab.classList.contains('active')) {
+        loadHistoryData();
+    }
+}
+
 function updateChartsWithSensorHistory(betonData, vazduhData) {
     console.log('📊 Updating charts with sensor history...');
     
@@ -821,55 +865,23 @@ function updateChartsWithSensorHistory(betonData, vazduhData) {
     console.log('📊 Charts updated successfully');
 }
 
-function updateChartsWithSensorHistory(betonHistory, vazduhHistory) {
-    console.log('📊 Updating charts with sensor history...');
-    
-    // Pripremi podatke za chartove
-    const labels = [];
-    const betonTemp = [];
-    const vazduhTemp = [];
-    const betonHumidity = [];
-    const vazduhHumidity = [];
+// Dodaje tačke (najstarije prve) u postojeće dataset-e; vraća broj novih vremena
+function appendHistoryPoints(records, source) {
+    const offset = source === 'beton' ? 0 : 1;
+    let added = 0;
     
-    // Kombinuj i sortiraj sve podatke po vremenu (najstariji prvi za chart)
-    const allData = [
-        ...betonHistory.map(item => ({...item, source: 'beton'})),
-        ...vazduhHistory.map(item => ({...item, source: 'vazduh'}))
-    ].sort((a, b) => new Date(a.sim_time) - new Date(b.sim_time));
-    
-    // Grupiši po vremenu (round na 10 minuta)
-    const dataByTime = {};
-    
-    allData.forEach(item => {
-        const timeKey = item.timestamp; // Koristi timestamp kao ključ
+    records.forEach(record => {
+        const timeKey = record.timestamp;
         
-        if (!dataByTime[timeKey]) {
-            dataByTime[timeKey] = {
-                time: timeKey,
-                sim_time: item.sim_time,
-                beton_temp: null,
-                beton_humidity: null,
-                vazduh_temp: null,
-                vazduh_humidity: null
-            };
+        // Nove tačke su skoro uvek na kraju, pa se pretraga vrši od kraja
+        let index = chartTimeKeys.length - 1;
+        while (index >= 0 && chartTimeKeys[index] > timeKey) {
+            index--;
         }
         
-        if (item.source === 'beton') {
-            dataByTime[timeKey].beton_temp = item.temperatura;
-            dataByTime[timeKey].beton_humidity = item.vlaznost;
-        } else {
-            dataByTime[timeKey].vazduh_temp = item.temperatura;
-            dataByTime[timeKey].vazduh_humidity = item.vlaznost;
-        }
-    });
-    
-    // Konvertuj u nižove za chartove
-    Object.values(dataByTime)
-        .sort((a, b) => new Date(a.sim_time) - new Date(b.sim_time))
-        .slice(-50) // Uzmi poslednih 50 tačaka
-        .forEach(item => {
-            // Format vreme za prikaz
-            const time = new Date(item.sim_time);
+        if (index < 0 || chartTimeKeys[index] !== timeKey) {
+            index++;
+            const time = new Date(record.sim_time);
             const timeLabel = time.toLocaleTimeString('sr-RS', { 
                 hour: '2-digit', 
                 minute: '2-digit',
@@ -877,28 +889,33 @@ function updateChartsWithSensorHistory(betonHistory, vazduhHistory) {
                 month: '2-digit'
             });
             
-            labels.push(timeLabel);
-            betonTemp.push(item.beton_temp);
-            vazduhTemp.push(item.vazduh_temp);
-            betonHumidity.push(item.beton_humidity);
-            vazduhHumidity.push(item.vazduh_humidity);
-        });
-    
-    console.log('📊 Chart data prepared:', { labels, betonTemp, vazduhTemp });
-    
-    // Ažuriraj temperature chart
-    temperatureChart.data.labels = labels;
-    temperatureChart.data.datasets[0].data = betonTemp;
-    temperatureChart.data.datasets[1].data = vazduhTemp;
-    temperatureChart.update();
+            chartTimeKeys.splice(index, 0, timeKey);
+            [temperatureChart, humidityChart].forEach(chart => {
+                chart.data.labels.splice(index, 0, timeLabel);
+                chart.data.datasets.forEach(dataset => dataset.data.splice(index, 0, null));
+            });
+            added++;
+        }
+        
+        temperatureChart.data.datasets[offset].data[index] = record.temperatura;
+        humidityChart.data.datasets[offset].data[index] = record.vlaznost;
+    });
     
-    // Ažuriraj humidity chart  
-    humidityChart.data.labels = labels;
-    humidityChart.data.datasets[0].data = betonHumidity;
-    humidityChart.data.datasets[1].data = vazduhHumidity;
-    humidityChart.update();
+    return added;
+}
+
+// Zadržava samo poslednjih HISTORY_WINDOW tačaka na grafikonima
+function trimHistoryWindow() {
+    const excess = chartTimeKeys.length - HISTORY_WINDOW;
+    if (excess <= 0) {
+        return;
+    }
     
-    console.log('✅ Charts updated successfully');
+    chartTimeKeys.splice(0, excess);
+    [temperatureChart, humidityChart].forEach(chart => {
+        chart.data.labels.splice(0, excess);
+        chart.data.datasets.forEach(dataset => dataset.data.splice(0, excess));
+    });
 }
 
 function updateCharts(data) {
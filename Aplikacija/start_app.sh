@@ -63,6 +63,10 @@ cleanup() {
         kill $BACKEND_PID 2>/dev/null
         print_status "Backend zaustavljen"
     fi
+    if [ ! -z "$INGEST_PID" ]; then
+        kill $INGEST_PID 2>/dev/null
+        print_status "Ingest daemon zaustavljen"
+    fi
     if [ ! -z "$FRONTEND_PID" ]; then
         kill $FRONTEND_PID 2>/dev/null
         print_status "Frontend zaustavljen"
@@ -134,10 +138,15 @@ if ! check_port 8080; then
     sleep 2
 fi
 
-# 6. Pokretanje backend servera
-print_step "Pokretanje Flask backend servera..."
+# 6. Pokretanje ingest daemon-a i backend servera
+print_step "Pokretanje ingest daemon-a..."
 cd "$PROJECT_DIR/backend"
-python app.py &
+python ingest.py &
+INGEST_PID=$!
+sleep 1
+
+print_step "Pokretanje Flask backend servera..."
+python app.py --external-ingest &
 BACKEND_PID=$!
 
 # Čekanje da se backend pokrene
@@ -207,6 +216,10 @@ while true; do
         print_error "Backend proces je neočekivano zaustavljen!"
         cleanup
     fi
+    if ! kill -0 $INGEST_PID 2>/dev/null; then
+        print_error "Ingest daemon je neočekivano zaustavljen!"
+        cleanup
+    fi
     if ! kill -0 $FRONTEND_PID 2>/dev/null; then
         print_error "Frontend proces je neočekivano zaustavljen!"
         cleanup
@@ -40,6 +40,7 @@ fi
 # Zaustavljanje Python procesa povezanih sa Flask aplikacijom
 print_step "Zaustavljanje Flask procesa..."
 pkill -f "python.*app.py" 2>/dev/null && print_status "Flask procesi zaustavljeni"
+pkill -f "python.*ingest.py" 2>/dev/null && print_status "Ingest daemon zaustavljen"
 
 # Zaustavljanje HTTP servera
 print_step "Zaustavljanje HTTP servera..."
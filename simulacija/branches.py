@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+What-if grane iz jednog checkpoint-a
+Checkpoint (engine.py --checkpoint) se učita jednom, a svaka grana nastavlja
+od istog trenutka sa svojim izmenama (spoljni uslovi, loše baterije, komande
+aktuatora, parametri modela) u zasebnom procesu i zasebnom SimData folderu.
+
+Grane se zadaju JSON fajlom - listom objekata:
+    [
+        {"name": "bez_pumpe", "actuators": {"pump": {"status": 0, "runtime_minutes": 0},
+                                            "heater": {"status": 0, "temperature": 25.0}}},
+        {"name": "toplotni_talas", "base_temp": 36, "base_humidity": 30},
+        {"name": "losa_baterija_pumpe", "bad_batteries": [2]},
+        {"name": "tanja_deka", "params": {"concrete.thermal_mass": 0.85}}
+    ]
+
+Primeri:
+    python branches.py stanje.ckpt grane.json --duration 2880
+    python branches.py stanje.ckpt grane.json --duration 1440 --output grane --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from engine import SimulationEngine, write_trace
+from sweep import MIN_CONCRETE_TEMP, MAX_CONCRETE_TEMP, temperature_difference_limit, minimum_humidity
+from utils.checkpoint import read_checkpoint
+
+
+DEFAULT_OUTPUT = 'branches'
+
+# Prefiks parametra u 'params' -> atribut SimulationEngine-a
+PARAMETER_TARGETS = {
+    'concrete': 'concrete_model',
+    'air': 'air_model',
+    'actuators': 'actuator_model',
+    'batteries': 'battery_manager',
+}
+
+BRANCH_KEYS = {'name', 'base_temp', 'base_humidity', 'bad_batteries', 'actuators', 'params', 'step_minutes'}
+
+
+def validate_branches(branches: list):
+    """Proverava opise grana pre pokretanja procesa (ValueError za neispravan opis)"""
+    names = set()
+    for branch in branches:
+        name = branch.get('name')
+        if not name or os.sep in name or name in names:
+            raise ValueError(f"Grana mora imati jedinstveno ime bez '{os.sep}': {branch}")
+        names.add(name)
+        unknown = set(branch) - BRANCH_KEYS
+        if unknown:
+            raise ValueError(f"Grana {name}: nepoznata polja {sorted(unknown)}")
+        for parameter in branch.get('params', {}):
+            if parameter.split('.', 1)[0] not in PARAMETER_TARGETS or '.' not in parameter:
+                raise ValueError(f"Grana {name}: parametar {parameter} nije oblika "
+                                 f"'{'|'.join(PARAMETER_TARGETS)}.atribut'")
+
+
+def apply_branch(engine: SimulationEngine, branch: dict):
+    """Primenjuje izmene grane na engine vraćen iz checkpoint-a"""
+    if 'step_minutes' in branch:
+        engine.step_minutes = branch['step_minutes']
+    if 'base_temp' in branch:
+        engine.base_temp = branch['base_temp']
+    if 'base_humidity' in branch:
+        engine.base_humidity = branch['base_humidity']
+    if 'bad_batteries' in branch:
+        engine.bad_batteries = set(branch['bad_batteries'])
+    for parameter, value in branch.get('params', {}).items():
+        prefix, attribute = parameter.split('.', 1)
+        component = getattr(engine, PARAMETER_TARGETS[prefix])
+        if not hasattr(component, attribute):
+            raise ValueError(f"Grana {branch['name']}: {parameter} ne postoji")
+        setattr(component, attribute, value)
+    if 'actuators' in branch:
+        engine.json_manager.save_actuators(branch['actuators'])
+        engine.actuator_watcher.poll()
+
+
+def run_branch(state: dict, branch: dict, duration_minutes: float, output: str) -> dict:
+    """
+    Simulira jednu granu od stanja iz checkpoint-a (izvršava se u procesu radniku)
+
+    Returns:
+        dict: Ime grane, metrike i stanje na kraju
+    """
+    branch_path = os.path.join(output, branch['name'])
+    engine = SimulationEngine(branch_path, verbose=False)
+    engine.json_manager.clear_all_data()
+    engine.set_full_state(state, restore_commands=True)
+    apply_branch(engine, branch)
+
+    previous_time = engine.sim_time.get_current_datetime()
+    rows = engine.fast_forward(duration_minutes, trace=True)
+    write_trace(os.path.join(branch_path, 'trace.csv'), rows)
+
+    # Metrike kao u sweep.py, po koracima iz traga
+    start_time = engine.sim_time.start_time
+    out_of_spec_minutes = pump_minutes = heater_minutes = 0.0
+    peak_temperature = state['components']['concrete_model']['temperature']
+    for row in rows:
+        current_time = datetime.fromisoformat(row[0])
+        minutes = (current_time - previous_time).total_seconds() / 60.0
+        previous_time = current_time
+        hours = (current_time - start_time).total_seconds() / 3600.0
+        concrete_temp, concrete_humidity, external_temp = row[1], row[2], row[5]
+        if (concrete_temp < MIN_CONCRETE_TEMP or concrete_temp > MAX_CONCRETE_TEMP
+                or abs(concrete_temp - external_temp) > temperature_difference_limit(hours)
+                or concrete_humidity < minimum_humidity(hours)):
+            out_of_spec_minutes += minutes
+        pump_minutes += minutes if row[7] else 0.0
+        heater_minutes += minutes if row[8] else 0.0
+        peak_temperature = max(peak_temperature, concrete_temp)
+
+    return {
+        'name': branch['name'],
+        'metrics': {
+            'out_of_spec_minutes': round(out_of_spec_minutes, 3),
+            'peak_temperature': round(peak_temperature, 3),
+            'pump_minutes': round(pump_minutes, 3),
+            'heater_minutes': round(heater_minutes, 3),
+        },
+        'final_state': engine.get_state(),
+    }
+
+
+def run_branches(checkpoint: str, branches: list, duration_minutes: float,
+                 output: str = DEFAULT_OUTPUT, workers: int = None) -> list:
+    """
+    Pokreće sve grane paralelno od istog checkpoint-a
+
+    Returns:
+        list: Rezultati grana (run_branch) u redosledu zadavanja
+    """
+    validate_branches(branches)
+    state = read_checkpoint(checkpoint)
+    os.makedirs(output, exist_ok=True)
+
+    workers = min(workers or os.cpu_count() or 1, len(branches)) or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_branch, state, branch, duration_minutes, output)
+                   for branch in branches]
+        results = [future.result() for future in futures]
+
+    with open(os.path.join(output, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump({'checkpoint': checkpoint, 'duration_minutes': duration_minutes,
+                   'branches': results}, f, indent=2, ensure_ascii=False)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='What-if grane simulacije iz jednog checkpoint-a')
+    parser.add_argument('checkpoint', help='Binarni checkpoint (engine.py --checkpoint)')
+    parser.add_argument('branches', help='JSON fajl sa listom grana')
+    parser.add_argument('--duration', type=float, required=True, help='Simulirano trajanje grana (minuti)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help='Folder rezultata (SimData i trace.csv po grani, summary.json)')
+    parser.add_argument('--workers', type=int, help='Broj procesa (podrazumevano broj jezgara)')
+    args = parser.parse_args()
+
+    with open(args.branches, 'r', encoding='utf-8') as f:
+        branches = json.load(f)
+
+    started = time.perf_counter()
+    try:
+        results = run_branches(args.checkpoint, branches, args.duration, args.output, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for result in results:
+        metrics = result['metrics']
+        concrete = result['final_state']['concrete']
+        print(f"🌿 {result['name']}: van specifikacije {metrics['out_of_spec_minutes']:.0f} min, "
+              f"max {metrics['peak_temperature']:.1f}°C, beton na kraju "
+              f"{concrete['temperature']}°C / {concrete['humidity']}%")
+    print(f"✅ {len(results)} grana za {time.perf_counter() - started:.1f} s -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,864 @@
+#!/usr/bin/env python3
+"""
+Simulaciono jezgro betonske deke bez GUI-ja
+Drži sve modele i stanje simulacije; Tk aplikacija (simulation.py) je samo
+tanak klijent nad njim, a simulacija može da radi i na serveru bez ekrana.
+
+Primeri:
+    python engine.py                                # korak 10 min, 1 s pauze, do Ctrl+C
+    python engine.py --step 5 --duration 1440 --pacing 0
+    python engine.py --restart --temp 30 --bad-battery 2
+    python engine.py --restart --step 1 --duration 10080 --fast-forward --trace trag.csv
+    python engine.py --checkpoint stanje.ckpt --checkpoint-every 144 --pacing 0
+    python engine.py --resume stanje.ckpt --duration 1440 --fast-forward
+    python engine.py --journal ulazi.journal                # beleženje ulaza svakog koraka
+    python engine.py --replay ulazi.journal --trace trag.csv
+    python engine.py --restart --step 60 --duration 10080 --fast-forward   # veliki koraci, adaptivni podkoraci
+"""
+
+import argparse
+import copy
+import csv
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from models.concrete_model import ConcreteModel
+from models.air_model import AirModel
+from models.battery_model import BatteryManager
+from models.actuator_model import ActuatorModel
+from utils.json_manager import JSONManager
+from utils.simulation_time import SimulationTime
+from utils.actuator_watcher import ActuatorCommandWatcher
+from utils.checkpoint import read_checkpoint, write_checkpoint
+from utils.input_journal import InputJournalWriter, read_journal, KIND_SNAPSHOT
+
+
+# Početak simulacije (vreme izljevanja betona)
+START_TIME = datetime(2025, 5, 5, 12, 0, 0)
+
+BATTERY_NAMES = ["Senzor Beton", "Senzor Vazduh", "Pumpa", "Grijač"]
+
+DEFAULT_SIM_DATA_PATH = "../SimData"
+
+# Folder u SimData sa dnevnicima ulaza GUI sesija (python simulation.py --journal)
+JOURNAL_DIR_NAME = "journals"
+
+# Kolone reda u tragu fast_forward(trace=True)
+TRACE_FIELDS = (
+    'time', 'concrete_temperature', 'concrete_humidity', 'air_temperature', 'air_humidity',
+    'external_temperature', 'external_humidity', 'pump_on', 'heater_on',
+    'battery_concrete', 'battery_air', 'battery_pump', 'battery_heater'
+)
+
+# Dozvoljena procenjena lokalna greška podkoraka (°C, %) i najkraći podkorak (minuti)
+DEFAULT_SUBSTEP_TOLERANCE = 0.05
+MIN_SUBSTEP_MINUTES = 1.0
+
+# Komponente čiji se kompletni atributi čuvaju u checkpoint-u
+CHECKPOINT_COMPONENTS = ('sim_time', 'battery_manager', 'concrete_model', 'air_model', 'actuator_model')
+
+
+def external_conditions(current_time: datetime, base_temp: float, base_humidity: float):
+    """
+    Spoljni uslovi za doba dana iz baznih vrednosti za podne
+
+    Returns:
+        tuple: (temperatura, vlažnost)
+    """
+    time_hours = current_time.hour + current_time.minute / 60.0
+
+    # Temperatura: maksimum u podne, minimum u ponoć (±8°C)
+    temp_angle = 2 * math.pi * (time_hours - 12) / 24
+    temperature = base_temp + 8.0 * math.cos(temp_angle)
+
+    # Vlažnost: obrnuto od temperature (±25%)
+    humidity_variation = -25.0 * math.cos(temp_angle)
+    humidity = max(15, min(95, base_humidity + humidity_variation))
+    return temperature, humidity
+
+
+class SimulationEngine:
+    """
+    Simulacija betonske deke bez zavisnosti od GUI-ja
+    Svi ulazi (korak, bazni spoljni uslovi, loše baterije) su obični atributi
+    """
+
+    def __init__(self, sim_data_path: str = DEFAULT_SIM_DATA_PATH, step_minutes: int = 10,
+                 base_temp: float = 25.0, base_humidity: float = 60.0, verbose: bool = True,
+                 state_channel: bool = False):
+        """
+        Args:
+            sim_data_path (str): Putanja do SimData foldera
+            step_minutes (int): Korak simulacije u minutima
+            base_temp (float): Bazna spoljna temperatura u podne (°C)
+            base_humidity (float): Bazna spoljna vlažnost u podne (%)
+            verbose (bool): Ispis poruka o svakom koraku
+            state_channel (bool): Objavljivanje stanja i u SimData/state.bin (utils/state_channel.py)
+        """
+        self.sim_data_path = sim_data_path
+        os.makedirs(self.sim_data_path, exist_ok=True)
+
+        # Komponente simulacije
+        self.json_manager = JSONManager(self.sim_data_path, state_channel=state_channel)
+        self.sim_time = SimulationTime()
+        self.battery_manager = BatteryManager()
+        self.concrete_model = ConcreteModel()
+        self.air_model = AirModel()
+        self.actuator_model = ActuatorModel()
+        self.actuator_watcher = ActuatorCommandWatcher(self.json_manager.files['actuators'])
+
+        # Ulazi simulacije
+        self.step_minutes = step_minutes
+        self.base_temp = base_temp
+        self.base_humidity = base_humidity
+        self.bad_batteries = set()
+        self.verbose = verbose
+
+        # Trenutni spoljni uslovi (računaju se iz baznih vrednosti i doba dana)
+        self.external_temp = base_temp
+        self.external_humidity = base_humidity
+
+        # Adaptivni podkoraci (advance): tolerancija 0 = jedan podkorak po koraku
+        self.substep_tolerance = DEFAULT_SUBSTEP_TOLERANCE
+        self.min_substep_minutes = MIN_SUBSTEP_MINUTES
+        self._substep_minutes = None
+
+        # Periodični checkpoint-i (save_checkpoint svakih checkpoint_every koraka)
+        self.checkpoint_path = None
+        self.checkpoint_every = 0
+        self._steps_since_checkpoint = 0
+
+        # Dnevnik ulaza (start_journal) i baterije ubijene od poslednjeg koraka
+        self.journal = None
+        self._killed_batteries = set()
+
+    def load_initial_state(self):
+        """Učitavanje početnog stanja simulacije iz JSON fajlova"""
+        try:
+            time_data = self.json_manager.load_time()
+            if time_data and 'date' in time_data and 'time' in time_data:
+                # Novo format sa odvojenim poljima
+                self.sim_time.set_current_time_from_json(time_data['date'], time_data['time'])
+                if 'start_date' in time_data and 'start_time' in time_data:
+                    self.sim_time.start_time = datetime.fromisoformat(
+                        f"{time_data['start_date']}T{time_data['start_time']}")
+                print(f"Učitano vreme iz JSON: {time_data['date']} {time_data['time']}")
+            elif time_data and 'current_time' in time_data:
+                # Kompatibilnost sa starim formatom
+                self.sim_time.set_current_time(time_data['current_time'])
+                print(f"Učitano vreme (stari format): {time_data['current_time']}")
+            else:
+                print("JSON fajl ne postoji, kreiram početno vreme")
+                self.sim_time.set_current_time(START_TIME.isoformat())
+                self._save_initial_time()
+        except Exception as e:
+            print(f"Greška pri učitavanju vremena: {e}")
+            self.sim_time.set_current_time(START_TIME.isoformat())
+            self._save_initial_time()
+
+        self._load_or_create_initial_models()
+        self._journal_snapshot()
+
+    def _save_initial_time(self):
+        """Snimanje početnog vremena u JSON fajl"""
+        try:
+            self.json_manager.save_time(self._time_data())
+            print(f"Snimljeno početno vreme: {self.sim_time.get_current_time()}")
+        except Exception as e:
+            print(f"Greška pri snimanju početnog vremena: {e}")
+
+    def _load_or_create_initial_models(self):
+        """Učitavanje postojećih modela ili kreiranje početnih stanja"""
+        concrete_data = self.json_manager.load_concrete()
+        air_data = self.json_manager.load_air()
+        battery_data = self.json_manager.load_batteries()
+
+        self.concrete_model.reset()
+        self.air_model.reset()
+        self.battery_manager.reset()
+        self.actuator_model.reset()
+
+        if concrete_data:
+            self.concrete_model.temperature = concrete_data.get('temperature', 25.0)
+            self.concrete_model.humidity = concrete_data.get('humidity', 100.0)
+            print(f"Učitano stanje betona: {concrete_data['temperature']}°C, {concrete_data['humidity']}%")
+
+        if air_data:
+            self.air_model.temperature = air_data.get('temperature', 25.0)
+            self.air_model.humidity = air_data.get('humidity', 60.0)
+            print(f"Učitano stanje vazduha: {air_data['temperature']}°C, {air_data['humidity']}%")
+
+        if battery_data:
+            # Indeksi 2 i 3 su baterije aktuatora
+            pump_battery = battery_data.get('pump_battery', 100.0)
+            heater_battery = battery_data.get('heater_battery', 100.0)
+            self.battery_manager.battery_levels[2] = pump_battery
+            self.battery_manager.battery_levels[3] = heater_battery
+            print(f"Učitani nivoi baterija aktuatora: pumpa {pump_battery}%, grijač {heater_battery}%")
+
+        if not concrete_data or not air_data or not battery_data:
+            self.json_manager.create_initial_files()
+            print("Kreirani početni JSON fajlovi")
+
+    def restart(self):
+        """Vraća simulaciju na početno stanje i briše postojeće JSON fajlove"""
+        self.json_manager.clear_all_data()
+
+        self.sim_time.reset(START_TIME.isoformat())
+        self.concrete_model.reset()
+        self.air_model.reset()
+        self.battery_manager.reset()
+        self.actuator_model.reset()
+
+        self.base_temp = 25.0
+        self.base_humidity = 60.0
+        self.external_temp = 25.0
+        self.external_humidity = 60.0
+        self.bad_batteries.clear()
+        self._killed_batteries.clear()
+        self._substep_minutes = None
+
+        self.json_manager.create_initial_files()
+        self._journal_snapshot()
+
+    def get_days_since_start(self, at: Optional[datetime] = None) -> float:
+        """
+        Dobijanje broja dana od izljevanja betona (sim_time.start_time, podrazumevano 5.5.2025 12:00)
+
+        Args:
+            at (datetime): Trenutak (podrazumevano trenutno vreme simulacije)
+        """
+        time_diff = (at or self.sim_time.get_current_datetime()) - self.sim_time.start_time
+        return max(0, time_diff.total_seconds() / (24 * 3600))
+
+    def step(self, step_minutes: Optional[float] = None,
+             actuator_commands: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Izvršavanje jednog koraka simulacije
+
+        Args:
+            step_minutes (float): Korak u minutima (podrazumevano self.step_minutes)
+            actuator_commands (Dict[str, Any]): Komande aktuatora (podrazumevano poslednje iz AKTUATORI.JSON)
+
+        Returns:
+            Dict[str, Any]: Stanje posle koraka (kao get_state)
+        """
+        if step_minutes is None:
+            step_minutes = int(self.step_minutes)
+        if step_minutes <= 0:
+            raise ValueError("Korak simulacije mora biti pozitivan broj minuta")
+        if actuator_commands is None:
+            actuator_commands = self.read_actuator_commands()
+
+        if self.verbose:
+            print(f"Izvršavam korak simulacije: {step_minutes:g} minuta")
+
+        old_time = self.sim_time.get_current_time()
+        self.sim_time.advance_time(step_minutes)
+        if self.verbose:
+            print(f"Vreme ažurirano: {old_time} -> {self.sim_time.get_current_time()}")
+
+        self.advance(step_minutes, actuator_commands)
+        self.save_state()
+        return self.get_state()
+
+    def read_actuator_commands(self) -> Dict[str, Any]:
+        """Poslednje komande aktuatora (fajl se parsira samo kada se promeni)"""
+        self.actuator_watcher.poll()
+        return self.actuator_watcher.commands
+
+    def advance(self, step_minutes: float, actuator_commands: Optional[Dict[str, Any]]):
+        """
+        Pomeranje modela za jedan korak bez čitanja i pisanja fajlova
+        (vreme mora već biti pomereno na kraj koraka)
+
+        Korak se deli na podkorake čija procenjena lokalna greška ne prelazi
+        substep_tolerance, pa i koraci od sat vremena ostaju tačni kao koraci od
+        jednog minuta; mirni delovi simulacije prolaze u malo podkoraka.
+
+        Args:
+            step_minutes (float): Korak u minutima
+            actuator_commands (Dict[str, Any]): Komande aktuatora (sadržaj AKTUATORI.JSON)
+        """
+        if self.journal is not None:
+            self.journal.write_step(step_minutes, self.base_temp, self.base_humidity,
+                                    self.bad_batteries, self._killed_batteries, actuator_commands)
+        self._killed_batteries.clear()
+
+        step_start = self.sim_time.get_current_datetime() - timedelta(minutes=step_minutes)
+        done = 0.0
+        while step_minutes - done > 1e-9:
+            substep = min(self._substep_minutes or step_minutes, step_minutes - done)
+            # Podkorak se završava kada istekne rad pumpe, pa ponovno uključivanje ne kasni
+            pump_change = self.actuator_model.minutes_to_pump_change(actuator_commands)
+            if pump_change is not None:
+                substep = min(substep, pump_change)
+            done += self._advance_substep(step_start + timedelta(minutes=done), substep, actuator_commands)
+        self.update_external_conditions()
+
+        if self.checkpoint_every and self.checkpoint_path:
+            self._steps_since_checkpoint += 1
+            if self._steps_since_checkpoint >= self.checkpoint_every:
+                self.save_checkpoint()
+
+    def _advance_substep(self, start_time: datetime, substep: float,
+                         actuator_commands: Optional[Dict[str, Any]]) -> float:
+        """
+        Jedan prihvaćen podkorak od start_time
+
+        Greška se procenjuje poređenjem jednog podkoraka sa dva polovična (prihvata
+        se tačniji rezultat); ako je veća od tolerancije, podkorak se ponavlja kraći.
+
+        Returns:
+            float: Dužina prihvaćenog podkoraka u minutima
+        """
+        while True:
+            models = self._model_state()
+            components = self._component_snapshot()
+
+            self.battery_manager.update(substep, sorted(self.bad_batteries))
+            self.actuator_model.update(actuator_commands, substep)
+            pump_effect = self.actuator_model.get_pump_effect()
+            heater_effect = self.actuator_model.get_heater_effect()
+            self._update_physics(start_time, substep, pump_effect, heater_effect)
+
+            if not self.substep_tolerance or substep <= self.min_substep_minutes:
+                self._substep_minutes = substep * 2
+                return substep
+
+            whole = self._model_state()
+            self._set_model_state(models)
+            half = substep / 2
+            self._update_physics(start_time, half, pump_effect, heater_effect)
+            self._update_physics(start_time + timedelta(minutes=half), half, pump_effect, heater_effect)
+            error = max(abs(a - b) for a, b in zip(whole, self._model_state()))
+
+            # Greška podkoraka opada sa kvadratom dužine
+            scale = 0.9 * math.sqrt(self.substep_tolerance / error) if error else 4.0
+            if error <= self.substep_tolerance:
+                self._substep_minutes = substep * min(4.0, scale)
+                return substep
+
+            self._set_model_state(models)
+            self._restore_components(components)
+            substep = max(self.min_substep_minutes, substep * max(0.2, scale))
+
+    def _update_physics(self, start_time: datetime, minutes: float,
+                        pump_effect: Dict[str, Any], heater_effect: Dict[str, Any]):
+        """Beton, pa vazduh (vazduh zavisi od novog stanja betona) za interval od start_time"""
+        # Spoljni uslovi iz sredine intervala
+        self.external_temp, self.external_humidity = external_conditions(
+            start_time + timedelta(minutes=minutes / 2), self.base_temp, self.base_humidity)
+        days = self.get_days_since_start(start_time + timedelta(minutes=minutes))
+        self.concrete_model.update(minutes, self.external_temp, self.external_humidity,
+                                   pump_effect, heater_effect, days)
+
+        concrete_state = self.concrete_model.get_state()
+        self.air_model.update(minutes, self.external_temp, self.external_humidity,
+                              concrete_state, pump_effect)
+
+    def _model_state(self) -> tuple:
+        return (self.concrete_model.temperature, self.concrete_model.humidity,
+                self.air_model.temperature, self.air_model.humidity)
+
+    def _set_model_state(self, state: tuple):
+        (self.concrete_model.temperature, self.concrete_model.humidity,
+         self.air_model.temperature, self.air_model.humidity) = state
+
+    def _component_snapshot(self) -> tuple:
+        """Stanje aktuatora i baterija za ponavljanje odbijenog podkoraka"""
+        return (dict(vars(self.actuator_model)), list(self.battery_manager.battery_levels),
+                list(self.battery_manager.battery_alive))
+
+    def _restore_components(self, snapshot: tuple):
+        actuators, levels, alive = snapshot
+        vars(self.actuator_model).update(actuators)
+        self.battery_manager.battery_levels[:] = levels
+        self.battery_manager.battery_alive[:] = alive
+
+    def fast_forward(self, duration_minutes: float, save_every: int = 0,
+                     trace: bool = False) -> List[tuple]:
+        """
+        Simulacija zadatog trajanja što brže, bez pauza i bez upisa po koraku
+
+        SimData se upisuje svakih save_every koraka (i tada se ponovo čitaju
+        komande aktuatora) i uvek na kraju.
+
+        Args:
+            duration_minutes (float): Simulirano trajanje u minutima (npr. 7 * 24 * 60)
+            save_every (int): Upis SimData fajlova svakih K koraka (0 = samo na kraju)
+            trace (bool): Beleženje stanja posle svakog koraka u memoriji
+
+        Returns:
+            List[tuple]: Trag stanja, redovi u redosledu TRACE_FIELDS (prazan ako trace=False)
+        """
+        rows = []
+        simulated = 0
+        steps = 0
+        actuator_commands = self.read_actuator_commands()
+
+        while simulated < duration_minutes:
+            step_minutes = max(1, min(int(self.step_minutes), math.ceil(duration_minutes - simulated)))
+            self.sim_time.advance_time(step_minutes)
+            self.advance(step_minutes, actuator_commands)
+            simulated += step_minutes
+            steps += 1
+
+            if trace:
+                rows.append(self._trace_row())
+
+            if save_every and steps % save_every == 0:
+                self.save_state()
+                actuator_commands = self.read_actuator_commands()
+
+        if not save_every or steps % save_every:
+            self.save_state()
+        return rows
+
+    def _trace_row(self) -> tuple:
+        """Trenutno stanje kao red traga (TRACE_FIELDS)"""
+        return (
+            self.sim_time.get_current_time(),
+            self.concrete_model.temperature, self.concrete_model.humidity,
+            self.air_model.temperature, self.air_model.humidity,
+            self.external_temp, self.external_humidity,
+            self.actuator_model.pump_on, self.actuator_model.heater_on,
+            *self.battery_manager.battery_levels
+        )
+
+    def run(self, duration_minutes: Optional[float] = None, pacing: float = 1.0,
+            should_continue: Callable[[], bool] = None,
+            on_step: Callable[[Dict[str, Any]], None] = None) -> int:
+        """
+        Kontinuirana simulacija
+
+        Args:
+            duration_minutes (float): Simulirano trajanje u minutima (None = bez kraja)
+            pacing (float): Realno trajanje koraka u sekundama (0 = što brže); komanda
+                aktuatora pristigla u toku koraka ga deli na trenutku dolaska
+            should_continue (Callable): Proverava se pre svakog koraka; False prekida rad
+            on_step (Callable): Poziva se sa stanjem posle svakog koraka
+
+        Returns:
+            int: Broj izvršenih koraka
+        """
+        steps = 0
+        simulated = 0
+        next_deadline = time.monotonic()
+
+        while duration_minutes is None or simulated < duration_minutes:
+            if should_continue is not None and not should_continue():
+                break
+
+            step_minutes = self.step_minutes
+            if duration_minutes is not None:
+                # Poslednji korak se skraćuje da se ne prekorači trajanje
+                step_minutes = max(1, min(step_minutes, math.ceil(duration_minutes - simulated)))
+
+            if pacing > 0:
+                # Rok se računa od početka, pa trajanje koraka ne pomera ritam
+                started = next_deadline
+                next_deadline += pacing
+                state = self._paced_step(step_minutes, started, next_deadline)
+                if next_deadline < time.monotonic():
+                    next_deadline = time.monotonic()
+            else:
+                state = self.step(step_minutes)
+
+            steps += 1
+            simulated += step_minutes
+            if on_step is not None:
+                on_step(state)
+
+        return steps
+
+    def _paced_step(self, step_minutes: int, started: float, deadline: float) -> Dict[str, Any]:
+        """
+        Korak koji u realnom vremenu traje od started do deadline
+
+        Kada komanda aktuatora stigne u toku koraka, deo koraka do tog trenutka
+        se simulira sa prethodnim komandama, nove komande se odmah primenjuju i
+        stanje upisuje, a ostatak koraka se simulira sa novim komandama.
+        """
+        commands = self.read_actuator_commands()
+        consumed = 0.0
+        while self.actuator_watcher.wait(deadline - time.monotonic()):
+            fraction = min(1.0, (time.monotonic() - started) / (deadline - started))
+            # Podela na cele sekunde simuliranog vremena
+            elapsed = round(step_minutes * fraction * 60) / 60 - consumed
+            if elapsed > 0:
+                self.step(elapsed, commands)
+                consumed += elapsed
+            commands = self.actuator_watcher.commands
+            # Nove komande važe odmah - stanje aktuatora se objavljuje bez čekanja kraja koraka
+            self.apply_actuator_commands(commands)
+            self.save_state()
+            if self.verbose:
+                print(f"Nove komande aktuatora posle {consumed:g} od {step_minutes} minuta koraka")
+
+        remaining = step_minutes - consumed
+        if remaining > 1e-9:
+            return self.step(remaining, commands)
+        return self.get_state()
+
+    def apply_actuator_commands(self, actuator_commands: Dict[str, Any]):
+        """Primena novih komandi aktuatora usred koraka, bez proticanja vremena"""
+        if self.journal is not None:
+            self.journal.write_step(0, self.base_temp, self.base_humidity,
+                                    self.bad_batteries, self._killed_batteries, actuator_commands)
+        self._killed_batteries.clear()
+        self.actuator_model.update(actuator_commands, 0)
+
+    def start_journal(self, path: str):
+        """
+        Početak beleženja ulaza svakog koraka u dnevnik (utils/input_journal.py)
+        Prvi zapis je trenutno stanje, pa replay() ponavlja simulaciju od ove tačke.
+        """
+        self.stop_journal()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.journal = InputJournalWriter(path)
+        self._journal_snapshot()
+        self.journal.flush()
+
+    def session_journal_path(self) -> str:
+        """Novi dnevnik za svaku sesiju (i restart): SimData/journals/inputs-<vreme>.journal"""
+        return os.path.join(self.sim_data_path, JOURNAL_DIR_NAME,
+                            f"inputs-{datetime.now():%Y%m%d-%H%M%S}.journal")
+
+    def stop_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def _journal_snapshot(self):
+        """Upis celog stanja u dnevnik posle promene mimo koraka (restart, učitavanje)"""
+        if self.journal is not None:
+            self.journal.write_snapshot(self.get_full_state())
+
+    def replay(self, path: str, trace: bool = False) -> List[tuple]:
+        """
+        Ponavljanje dnevnika ulaza što brže, bez čitanja komandi i upisa SimData
+
+        Args:
+            path (str): Dnevnik ulaza (start_journal)
+            trace (bool): Beleženje stanja posle svakog koraka u memoriji
+
+        Returns:
+            List[tuple]: Trag stanja, redovi u redosledu TRACE_FIELDS (prazan ako trace=False)
+        """
+        if self.journal is not None:
+            raise RuntimeError("Replay se ne može pokrenuti dok se beleži dnevnik ulaza")
+
+        rows = []
+        for kind, entry in read_journal(path):
+            if kind == KIND_SNAPSHOT:
+                self.set_full_state(entry, save=False)
+                continue
+
+            self.base_temp = entry['base_temp']
+            self.base_humidity = entry['base_humidity']
+            self.bad_batteries = set(entry['bad_batteries'])
+            for index in entry['killed_batteries']:
+                self.kill_battery(index)
+
+            step_minutes = entry['step_minutes']
+            if step_minutes == 0:
+                self.apply_actuator_commands(entry['commands'])
+                continue
+            self.sim_time.advance_time(step_minutes)
+            self.advance(step_minutes, entry['commands'])
+            if trace:
+                rows.append(self._trace_row())
+        return rows
+
+    def get_full_state(self) -> Dict[str, Any]:
+        """
+        Kompletno stanje simulacije za checkpoint (za razliku od get_state bez zaokruživanja)
+
+        Returns:
+            Dict[str, Any]: Svi atributi modela, vremena (i vremena izljevanja),
+            baterija i aktuatora, ulazi simulacije i poslednje komande aktuatora
+        """
+        return {
+            'components': {name: copy.deepcopy(vars(getattr(self, name))) for name in CHECKPOINT_COMPONENTS},
+            'inputs': {
+                'step_minutes': self.step_minutes,
+                'base_temp': self.base_temp,
+                'base_humidity': self.base_humidity,
+                'bad_batteries': sorted(self.bad_batteries),
+                'external_temp': self.external_temp,
+                'external_humidity': self.external_humidity,
+                'substep_minutes': self._substep_minutes,
+                'substep_tolerance': self.substep_tolerance,
+                'min_substep_minutes': self.min_substep_minutes,
+            },
+            'actuator_commands': copy.deepcopy(self.actuator_watcher.commands),
+            'seq': self.json_manager.seq,
+        }
+
+    def set_full_state(self, state: Dict[str, Any], restore_commands: bool = False, save: bool = True):
+        """
+        Vraća stanje iz get_full_state() i upisuje ga u SimData
+
+        Args:
+            state (Dict[str, Any]): Stanje iz get_full_state() ili read_checkpoint()
+            restore_commands (bool): Upis sačuvanih komandi u AKTUATORI.JSON (za novi
+                SimData folder; inače važe komande koje su trenutno u fajlu)
+            save (bool): Upis vraćenog stanja u SimData
+        """
+        for name, attributes in state['components'].items():
+            vars(getattr(self, name)).update(copy.deepcopy(attributes))
+
+        inputs = state['inputs']
+        self.step_minutes = inputs['step_minutes']
+        self.base_temp = inputs['base_temp']
+        self.base_humidity = inputs['base_humidity']
+        self.bad_batteries = set(inputs['bad_batteries'])
+        self.external_temp = inputs['external_temp']
+        self.external_humidity = inputs['external_humidity']
+        self._substep_minutes = inputs.get('substep_minutes')
+        self.substep_tolerance = inputs.get('substep_tolerance', DEFAULT_SUBSTEP_TOLERANCE)
+        self.min_substep_minutes = inputs.get('min_substep_minutes', MIN_SUBSTEP_MINUTES)
+
+        if restore_commands:
+            self.json_manager.save_actuators(state['actuator_commands'])
+            self.actuator_watcher.poll()
+
+        # Brojač koraka ne sme da se vrati unazad ni u odnosu na checkpoint ni na fajlove u SimData
+        self.json_manager.load_time()
+        self.json_manager.seq = max(self.json_manager.seq, state['seq'])
+        self._steps_since_checkpoint = 0
+        self._killed_batteries.clear()
+        self._journal_snapshot()
+        if save:
+            self.save_state()
+
+    def save_checkpoint(self, path: Optional[str] = None):
+        """Upisuje binarni checkpoint (podrazumevano u self.checkpoint_path)"""
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("Putanja checkpoint-a nije zadata")
+        write_checkpoint(path, self.get_full_state())
+        self._steps_since_checkpoint = 0
+        if self.verbose:
+            print(f"💾 Checkpoint {path} ({self.sim_time.get_current_time()})")
+
+    def load_checkpoint(self, path: str, restore_commands: bool = False):
+        """Nastavlja simulaciju iz binarnog checkpoint-a (umesto load_initial_state)"""
+        self.set_full_state(read_checkpoint(path), restore_commands=restore_commands)
+        if self.verbose:
+            print(f"↩️  Učitan checkpoint {path} ({self.sim_time.get_current_time()})")
+
+    def update_external_conditions(self):
+        """Spoljni uslovi iz baznih vrednosti za podne i 24h ciklusa"""
+        self.external_temp, self.external_humidity = external_conditions(
+            self.sim_time.get_current_datetime(), self.base_temp, self.base_humidity)
+
+    def set_battery_bad(self, battery_index: int, bad: bool = True):
+        """Označava bateriju kao lošu (brže pražnjenje) ili je vraća u normalan režim"""
+        if bad:
+            self.bad_batteries.add(battery_index)
+        else:
+            self.bad_batteries.discard(battery_index)
+
+    def kill_battery(self, battery_index: int):
+        """Ubijanje određene baterije (postavljanje na 0%)"""
+        self.battery_manager.kill_battery(battery_index)
+        self._killed_batteries.add(battery_index)
+
+    def _time_data(self) -> Dict[str, Any]:
+        time_json = self.sim_time.get_current_time_json()
+        # Vreme izljevanja - backend po njemu računa rasporede pravila očvršćavanja
+        start_time = self.sim_time.start_time
+        return {
+            'date': time_json['date'],
+            'time': time_json['time'],
+            'start_date': start_time.strftime("%Y-%m-%d"),
+            'start_time': start_time.strftime("%H:%M:%S"),
+            'step_minutes': int(self.step_minutes)
+        }
+
+    def save_state(self):
+        """Snimanje trenutnog stanja simulacije u JSON fajlove (nepromenjeni se preskaču)"""
+        self.json_manager.next_step()
+        self.json_manager.save_time(self._time_data())
+
+        concrete_state = self.concrete_model.get_state()
+        self.json_manager.save_concrete({
+            'temperature': concrete_state['temperature'],
+            'humidity': concrete_state['humidity'],
+            'battery_level': round(self.battery_manager.get_battery_level(0), 2)
+        })
+
+        air_state = self.air_model.get_state()
+        self.json_manager.save_air({
+            'temperature': air_state['temperature'],
+            'humidity': air_state['humidity'],
+            'battery_level': round(self.battery_manager.get_battery_level(1), 2)
+        })
+
+        self.json_manager.save_batteries({
+            'pump_battery': round(self.battery_manager.get_battery_level(2), 2),
+            'heater_battery': round(self.battery_manager.get_battery_level(3), 2)
+        })
+
+        self.json_manager.publish_state(self.get_state())
+        if self.journal is not None:
+            # Sve što je objavljeno je i zabeleženo
+            self.journal.flush()
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Dobijanje celokupnog stanja simulacije
+
+        Returns:
+            Dict[str, Any]: Vreme, beton, vazduh, baterije i aktuatori
+        """
+        return {
+            'time': self.sim_time.get_current_time(),
+            'step_minutes': int(self.step_minutes),
+            'concrete': self.concrete_model.get_state(),
+            'air': self.air_model.get_state(),
+            'batteries': self.battery_manager.get_all_levels(),
+            'actuators': self.actuator_model.get_state(),
+            'external': {
+                'temperature': round(self.external_temp, 2),
+                'humidity': round(self.external_humidity, 2)
+            }
+        }
+
+
+def battery_index(value: str) -> int:
+    index = int(value)
+    if not 0 <= index < len(BATTERY_NAMES):
+        raise argparse.ArgumentTypeError(f"indeks baterije mora biti 0-{len(BATTERY_NAMES) - 1}")
+    return index
+
+
+def write_trace(path: str, rows: List[tuple]):
+    """Upis traga (fast_forward/replay) u CSV fajl"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(TRACE_FIELDS)
+        writer.writerows(rows)
+
+
+def main(argv: Iterable[str] = None):
+    parser = argparse.ArgumentParser(description='Simulacija betonske deke bez GUI-ja')
+    parser.add_argument('--data', default=DEFAULT_SIM_DATA_PATH, help='Putanja do SimData foldera')
+    parser.add_argument('--step', type=int, help='Korak simulacije (minuti, podrazumevano 10)')
+    parser.add_argument('--duration', type=float, help='Simulirano trajanje (minuti); bez ovoga radi do Ctrl+C')
+    parser.add_argument('--pacing', type=float, default=1.0, help='Realne sekunde između koraka (0 = što brže)')
+    parser.add_argument('--temp', type=float, help='Bazna spoljna temperatura u podne (°C, podrazumevano 25)')
+    parser.add_argument('--humidity', type=float, help='Bazna spoljna vlažnost u podne (%%, podrazumevano 60)')
+    parser.add_argument('--bad-battery', type=battery_index, action='append', default=[],
+                        help='Indeks loše baterije (0 beton, 1 vazduh, 2 pumpa, 3 grijač); može više puta')
+    parser.add_argument('--restart', action='store_true', help='Počni od početnog stanja (briše SimData)')
+    parser.add_argument('--quiet', action='store_true', help='Bez ispisa po koraku')
+    parser.add_argument('--state-channel', action='store_true',
+                        help='Objavljivanje stanja i u memorijski mapiran SimData/state.bin')
+    parser.add_argument('--fast-forward', action='store_true',
+                        help='Simulira --duration što brže, bez upisa SimData po koraku')
+    parser.add_argument('--save-every', type=int, default=0,
+                        help='Uz --fast-forward: upis SimData svakih K koraka (0 = samo na kraju)')
+    parser.add_argument('--trace', help='Uz --fast-forward ili --replay: CSV fajl sa stanjem posle svakog koraka')
+    parser.add_argument('--resume', help='Nastavak iz binarnog checkpoint-a (umesto stanja iz SimData)')
+    parser.add_argument('--checkpoint', help='Binarni checkpoint koji se upisuje na kraju (i periodično)')
+    parser.add_argument('--checkpoint-every', type=int, default=0,
+                        help='Uz --checkpoint: upis checkpoint-a svakih N koraka (0 = samo na kraju)')
+    parser.add_argument('--substep-tolerance', type=float,
+                        help=f'Dozvoljena lokalna greška podkoraka u °C/%% (podrazumevano '
+                             f'{DEFAULT_SUBSTEP_TOLERANCE}, 0 = bez podkoraka)')
+    parser.add_argument('--journal', help='Beleženje ulaza svakog koraka u binarni dnevnik (nastavlja postojeći)')
+    parser.add_argument('--replay', help='Ponavlja dnevnik ulaza što brže, bez upisa SimData')
+    args = parser.parse_args(argv)
+
+    if args.step is not None and args.step <= 0:
+        parser.error('--step mora biti pozitivan')
+    if args.fast_forward and args.duration is None:
+        parser.error('--fast-forward zahteva --duration')
+    if args.resume and args.restart:
+        parser.error('--resume i --restart se isključuju')
+    if args.checkpoint_every and not args.checkpoint:
+        parser.error('--checkpoint-every zahteva --checkpoint')
+    if args.replay and (args.journal or args.resume or args.restart or args.fast_forward
+                        or args.substep_tolerance is not None):
+        parser.error('--replay se ne kombinuje sa --journal, --resume, --restart, --fast-forward '
+                     'i --substep-tolerance (tolerancija se čita iz dnevnika)')
+
+    engine = SimulationEngine(args.data, verbose=not args.quiet, state_channel=args.state_channel)
+    if args.replay:
+        started = time.perf_counter()
+        rows = engine.replay(args.replay, trace=bool(args.trace))
+        elapsed = time.perf_counter() - started
+        if args.trace:
+            write_trace(args.trace, rows)
+        if args.checkpoint:
+            engine.save_checkpoint()
+        state = engine.get_state()
+        print(f"🔁 Dnevnik {args.replay} ponovljen za {elapsed:.2f} s, vreme simulacije {state['time']}")
+        print(f"   Beton: {state['concrete']['temperature']}°C, {state['concrete']['humidity']}% | "
+              f"Vazduh: {state['air']['temperature']}°C, {state['air']['humidity']}%")
+        return
+
+    if args.resume:
+        engine.load_checkpoint(args.resume)
+    else:
+        if args.restart:
+            engine.restart()
+        engine.load_initial_state()
+    # Zadati ulazi imaju prednost nad onima iz checkpoint-a
+    if args.step is not None:
+        engine.step_minutes = args.step
+    if args.temp is not None:
+        engine.base_temp = args.temp
+    if args.humidity is not None:
+        engine.base_humidity = args.humidity
+    if args.substep_tolerance is not None:
+        engine.substep_tolerance = args.substep_tolerance
+    for index in args.bad_battery:
+        engine.set_battery_bad(index)
+    engine.checkpoint_path = args.checkpoint
+    engine.checkpoint_every = args.checkpoint_every
+    if args.journal:
+        engine.start_journal(args.journal)
+
+    if args.fast_forward:
+        started = time.perf_counter()
+        rows = engine.fast_forward(args.duration, save_every=args.save_every, trace=bool(args.trace))
+        elapsed = time.perf_counter() - started
+        if args.trace:
+            write_trace(args.trace, rows)
+        if args.checkpoint:
+            engine.save_checkpoint()
+        engine.stop_journal()
+        print(f"⏩ {args.duration:.0f} min simulacije za {elapsed:.2f} s, vreme simulacije {engine.sim_time.get_current_time()}")
+        return
+
+    started = time.perf_counter()
+    steps = 0
+
+    def count_step(state):
+        nonlocal steps
+        steps += 1
+
+    try:
+        engine.run(args.duration, pacing=args.pacing, on_step=count_step)
+    except KeyboardInterrupt:
+        print("\nSimulacija prekinuta")
+
+    if args.checkpoint:
+        engine.save_checkpoint()
+    engine.stop_journal()
+    elapsed = time.perf_counter() - started
+    state = engine.get_state()
+    print(f"✅ {steps} koraka za {elapsed:.1f} s, vreme simulacije {state['time']}")
+    print(f"   Beton: {state['concrete']['temperature']}°C, {state['concrete']['humidity']}% | "
+          f"Vazduh: {state['air']['temperature']}°C, {state['air']['humidity']}%")
+
+
+if __name__ == '__main__':
+    main()
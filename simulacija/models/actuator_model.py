@@ -22,6 +22,7 @@ class ActuatorModel:
         self.pump_on = False
         self.pump_time_remaining = 0.0  # minuti
         self.pump_intensity = 1.0  # 0.0 - 1.0
+        self.pump_run_fraction = 0.0  # Deo poslednjeg koraka u kojem je pumpa radila
         
         # Stanje grijača
         self.heater_on = False
@@ -96,6 +97,12 @@ class ActuatorModel:
             effective_runtime = 0.0
             self.pump_on = False
         
+        # Pumpa koja se ugasila usred koraka deluje srazmerno vremenu rada
+        if step_minutes > 0:
+            self.pump_run_fraction = effective_runtime / step_minutes
+        else:
+            self.pump_run_fraction = 1.0 if self.pump_on else 0.0
+        
         # Ažuriranje intenziteta na osnovu dostupnosti vode i energije
         self.pump_intensity = self._calculate_pump_intensity()
         
@@ -104,6 +111,25 @@ class ActuatorModel:
             water_consumption = self._calculate_water_consumption(effective_runtime)
             self.water_level = max(0, self.water_level - water_consumption)
     
+    def minutes_to_pump_change(self, commands: Optional[Dict[str, Any]]) -> Optional[float]:
+        """
+        Vreme do isteka rada pumpe za date komande
+        
+        Args:
+            commands (Optional[Dict[str, Any]]): Komande za aktuatore
+            
+        Returns:
+            Optional[float]: Minuti do gašenja pumpe (None ako pumpa neće raditi)
+        """
+        pump_commands = (commands or {}).get('pump', {})
+        if self.pump_on and self.pump_time_remaining > 0:
+            return self.pump_time_remaining
+        if pump_commands.get('status', 0) == 1:
+            runtime_minutes = float(pump_commands.get('runtime_minutes', 0))
+            if runtime_minutes > 0:
+                return runtime_minutes
+        return None
+    
     def _update_heater(self, heater_commands: Dict[str, Any], step_minutes: int):
         """
         Ažuriranje stanja grijača
@@ -239,7 +265,7 @@ class ActuatorModel:
         Returns:
             Dict[str, Any]: Efekti pumpe
         """
-        if not self.pump_on or self.pump_intensity <= 0:
+        if self.pump_run_fraction <= 0 or self.pump_intensity <= 0:
             return {
                 'active': False,
                 'intensity': 0.0,
@@ -255,8 +281,10 @@ class ActuatorModel:
         # Temperatura vode utiče na efekat
         temp_factor = max(0.1, (self.water_temperature - 10) / 40)  # 0.1 - 1.0
         
-        cooling_effect = base_cooling * self.pump_intensity * self.pump_cooling_efficiency
-        humidifying_effect = base_humidifying * self.pump_intensity * self.pump_humidifying_efficiency
+        # Intenzitet usrednjen po koraku (deo koraka u kojem je pumpa radila)
+        intensity = self.pump_intensity * self.pump_run_fraction
+        cooling_effect = base_cooling * intensity * self.pump_cooling_efficiency
+        humidifying_effect = base_humidifying * intensity * self.pump_humidifying_efficiency
         
         # Hladnija voda = bolji efekat hlađenja
         if self.water_temperature < 20:
@@ -264,11 +292,11 @@ class ActuatorModel:
         
         return {
             'active': True,
-            'intensity': self.pump_intensity,
+            'intensity': intensity,
             'cooling_effect': cooling_effect,
             'humidifying_effect': humidifying_effect,
             'water_temperature': self.water_temperature,
-            'flow_rate': self.pump_max_flow_rate * self.pump_intensity
+            'flow_rate': self.pump_max_flow_rate * intensity
         }
     
     def get_heater_effect(self) -> Dict[str, Any]:
@@ -6,6 +6,8 @@ Simulira temperaturu i vlažnost vazduha sa interakcijom sa betonom
 import math
 from typing import Dict, Any
 
+from .integrators import relaxation_factor
+
 
 class AirModel:
     """
@@ -44,6 +46,9 @@ class AirModel:
         # Minimalne i maksimalne vrednosti
         self.min_humidity = 10.0  # %
         self.max_humidity = 95.0  # %
+        
+        # Integracija relaksacionih članova (models/integrators.py)
+        self.integrator = 'exponential'  # 'exponential' ili 'euler'
     
     def update(self, step_minutes: int, external_temp: float, external_humidity: float,
                concrete_state: Dict[str, float], pump_effect: Dict[str, Any]):
@@ -106,8 +111,11 @@ class AirModel:
         # Mikro klimatski efekti
         microclimate_change = self._calculate_microclimate_temperature_effect(step_hours)
         
-        # Ukupna promena temperature
+        # Ukupna promena temperature; relaksacija ka spoljnoj i temperaturi betona se rešava tačno
         total_temp_change = external_change + concrete_temp_change + pump_change + microclimate_change
+        rate = (self.thermal_responsiveness * 0.1
+                + self.concrete_temp_transfer * self.concrete_influence_factor * temp_transfer_intensity) * 60
+        total_temp_change *= relaxation_factor(self.integrator, rate, step_hours)
         self.temperature += total_temp_change
     
     def _update_humidity(self, step_hours: float, external_humidity: float,
@@ -135,13 +143,12 @@ class AirModel:
         
         if humidity_diff > 0:
             # Beton oslobađa vlažnost u vazduh
-            concrete_humidity_change = (humidity_diff * self.concrete_humidity_transfer * 
-                                       self.concrete_influence_factor * humidity_transfer_intensity * 
-                                       temp_boost * step_hours * 60)
+            concrete_rate = (self.concrete_humidity_transfer * self.concrete_influence_factor *
+                             humidity_transfer_intensity * temp_boost * 60)
         else:
             # Vazduh može da suši beton (sporije)
-            concrete_humidity_change = (humidity_diff * self.concrete_humidity_transfer * 
-                                       0.3 * humidity_transfer_intensity * step_hours * 60)
+            concrete_rate = self.concrete_humidity_transfer * 0.3 * humidity_transfer_intensity * 60
+        concrete_humidity_change = humidity_diff * concrete_rate * step_hours
         
         # Efekat pumpe (povećanje vlažnosti)
         pump_change = 0.0
@@ -155,8 +162,13 @@ class AirModel:
         # Prirodno sušenje vazduha (evaporacija)
         evaporation_change = self._calculate_evaporation_effect(step_hours)
         
-        # Ukupna promena vlažnosti
+        # Ukupna promena vlažnosti; ventilacija, razmena sa betonom i evaporacija
+        # (proporcionalna vlažnosti) čine relaksaciju koja se rešava tačno
         total_humidity_change = external_change + concrete_humidity_change + pump_change + evaporation_change
+        rate = self.humidity_exchange_rate * 60 + concrete_rate
+        if evaporation_change:
+            rate += 0.5 * (self.temperature - 20) / 20 / 100.0
+        total_humidity_change *= relaxation_factor(self.integrator, rate, step_hours)
         self.humidity += total_humidity_change
     
     def _calculate_microclimate_temperature_effect(self, step_hours: float) -> float:
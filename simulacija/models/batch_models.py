@@ -0,0 +1,214 @@
+"""
+Vektorizovani modeli betona i vazduha za N nezavisnih deka
+Jedan poziv update() pomera sve deke za jedan korak NumPy operacijama.
+Formule su iste kao u ConcreteModel i AirModel (rezultati se poklapaju do
+greške zaokruživanja), a parametri se preuzimaju iz skalarnih modela pa se
+menjaju na jednom mestu. Parametri mogu biti i nizovi dužine N (po deki).
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+
+from .concrete_model import ConcreteModel
+from .air_model import AirModel
+from .integrators import INTEGRATORS
+
+
+def _effect_arrays(effect: Dict[str, Any], count: int, default_intensity: float = 1.0):
+    """
+    Vraća (aktivan, intenzitet) kao nizove dužine count
+
+    Vrednosti u rečniku efekta mogu biti skalari (isti efekat za sve deke,
+    npr. direktno iz ActuatorModel.get_pump_effect()) ili nizovi.
+    """
+    active = np.broadcast_to(np.asarray(effect.get('active', False), dtype=bool), (count,))
+    intensity = np.broadcast_to(np.asarray(effect.get('intensity', default_intensity), dtype=float), (count,))
+    return active, intensity
+
+
+def _relaxation_factor(integrator: str, rate, step_hours) -> np.ndarray:
+    """Vektorizovani integrators.relaxation_factor (rate može biti niz)"""
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Nepoznat integrator: {integrator} (dozvoljeno: {', '.join(INTEGRATORS)})")
+    z = np.asarray(rate * step_hours, dtype=float)
+    if integrator == 'euler':
+        return np.ones_like(z)
+    small = z < 1e-12
+    safe_z = np.where(small, 1.0, z)
+    return np.where(small, 1.0, -np.expm1(-safe_z) / safe_z)
+
+
+class _BatchModel:
+    """Zajednički deo: stanje kao nizovi i parametri preuzeti iz skalarnog modela"""
+
+    scalar_model = None
+
+    def __init__(self, count: int):
+        """
+        Args:
+            count (int): Broj nezavisnih deka
+        """
+        self.count = count
+        self.reset()
+
+    def reset(self):
+        """Reset svih deka na početno stanje skalarnog modela"""
+        scalar = self.scalar_model()
+        for name, value in vars(scalar).items():
+            if name not in ('temperature', 'humidity'):
+                setattr(self, name, value)
+        self.temperature = np.full(self.count, float(scalar.temperature))
+        self.humidity = np.full(self.count, float(scalar.humidity))
+
+    def set_state(self, temperature, humidity):
+        """Postavljanje stanja (skalar ili niz dužine count)"""
+        self.temperature = np.array(np.broadcast_to(temperature, (self.count,)), dtype=float)
+        self.humidity = np.array(np.broadcast_to(humidity, (self.count,)), dtype=float)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """
+        Dobijanje trenutnog stanja, zaokruženo kao u skalarnom modelu
+
+        Returns:
+            Dict[str, np.ndarray]: Temperature i vlažnosti svih deka
+        """
+        return {
+            'temperature': np.round(self.temperature, 2),
+            'humidity': np.round(self.humidity, 2)
+        }
+
+
+class ConcreteBatchModel(_BatchModel):
+    """Vektorizovani ConcreteModel"""
+
+    scalar_model = ConcreteModel
+
+    def update(self, step_minutes, external_temp, external_humidity,
+               pump_effect: Dict[str, Any], heater_effect: Dict[str, Any], days_since_start=0.0):
+        """
+        Ažuriranje stanja svih deka
+
+        Args:
+            step_minutes (int): Broj minuta koji je prošao
+            external_temp (float | np.ndarray): Spoljna temperatura (°C)
+            external_humidity (float | np.ndarray): Spoljna vlažnost (%)
+            pump_effect (Dict[str, Any]): 'active' i 'intensity' (skalari ili nizovi)
+            heater_effect (Dict[str, Any]): 'active', 'intensity' i 'temperature' (skalari ili nizovi)
+            days_since_start (float | np.ndarray): Broj dana od početka simulacije
+        """
+        step_hours = step_minutes / 60.0
+        pump_active, pump_intensity = _effect_arrays(pump_effect, self.count)
+        heater_active, heater_intensity = _effect_arrays(heater_effect, self.count)
+        heater_target = np.asarray(heater_effect.get('temperature', 25.0), dtype=float)
+
+        # Temperatura: spoljni uticaj usporen termalnom masom, pumpa, grijač, hidratacija
+        temperature = self.temperature
+        external_change = ((external_temp - temperature) * self.external_temp_influence
+                           * step_hours * 60 * self.thermal_mass)
+        pump_change = np.where(pump_active, -self.pump_cooling_effect * pump_intensity * step_hours, 0.0)
+        heater_change = np.where(heater_active & (heater_target > temperature),
+                                 self.heater_warming_effect * heater_intensity * step_hours, 0.0)
+        natural_change = 0.5 * step_hours * np.exp(-0.1 * step_hours)
+        rate = self.external_temp_influence * 60 * self.thermal_mass
+        temperature = temperature + ((external_change + pump_change + heater_change + natural_change)
+                                     * _relaxation_factor(self.integrator, rate, step_hours))
+
+        # Vlažnost: prirodno sušenje (sa novom temperaturom), spoljni uticaj, pumpa, grijač
+        humidity = self.humidity
+        drying_rate = self._drying_rate(days_since_start, humidity)
+        natural_drying = drying_rate * step_hours * 60
+        temp_factor = np.maximum(0.5, (temperature - 10) / 30)
+        external_change = (external_humidity - humidity) * self.external_humidity_influence * step_hours * 60
+        if self.integrator == 'euler':
+            external_change = np.clip(external_change, -2, 2)
+        pump_change = np.where(pump_active, self.pump_humidity_effect * pump_intensity * step_hours, 0.0)
+        heater_change = np.where(heater_active, -self.heater_drying_effect * heater_intensity * step_hours, 0.0)
+        # Sušenje je linearno po vlažnosti između final_humidity i initial_humidity
+        in_drying_range = (humidity > self.final_humidity) & (humidity < self.initial_humidity)
+        drying_relaxation = np.where(
+            in_drying_range,
+            drying_rate / np.where(in_drying_range, humidity - self.final_humidity, 1.0) * 60 * temp_factor,
+            0.0)
+        rate = self.external_humidity_influence * 60 + drying_relaxation
+        humidity = humidity + ((-natural_drying * temp_factor + external_change + pump_change + heater_change)
+                               * _relaxation_factor(self.integrator, rate, step_hours))
+
+        # Ograničavanje vrednosti
+        self.temperature = np.clip(temperature, -10, 60)
+        self.humidity = np.clip(humidity, self.final_humidity, 100)
+
+    def _drying_rate(self, days_since_start, humidity) -> np.ndarray:
+        """Brzina prirodnog sušenja (% po satu), 0 posle drying_duration_days"""
+        k = 2.0 / self.drying_duration_days
+        humidity_factor = np.clip((humidity - self.final_humidity)
+                                  / (self.initial_humidity - self.final_humidity), 0.0, 1.0)
+        rate = 2.5 * np.exp(-k * np.asarray(days_since_start, dtype=float)) * humidity_factor
+        return np.where(np.asarray(days_since_start) >= self.drying_duration_days, 0.0, rate)
+
+
+class AirBatchModel(_BatchModel):
+    """Vektorizovani AirModel"""
+
+    scalar_model = AirModel
+
+    def update(self, step_minutes, external_temp, external_humidity,
+               concrete_state: Dict[str, Any], pump_effect: Dict[str, Any]):
+        """
+        Ažuriranje stanja vazduha iznad svih deka
+
+        Args:
+            step_minutes (int): Broj minuta koji je prošao
+            external_temp (float | np.ndarray): Spoljna temperatura (°C)
+            external_humidity (float | np.ndarray): Spoljna vlažnost (%)
+            concrete_state (Dict[str, Any]): Stanje betona (npr. ConcreteBatchModel.get_state())
+            pump_effect (Dict[str, Any]): 'active' i 'intensity' (skalari ili nizovi)
+        """
+        step_hours = step_minutes / 60.0
+        pump_active, pump_intensity = _effect_arrays(pump_effect, self.count)
+        concrete_temp = np.asarray(concrete_state.get('temperature', 25.0), dtype=float)
+        concrete_humidity = np.asarray(concrete_state.get('humidity', 60.0), dtype=float)
+
+        # Temperatura: spoljni uticaj, transfer sa betona, pumpa, toplotno ostrvo
+        temperature = self.temperature
+        external_change = (external_temp - temperature) * self.thermal_responsiveness * 0.1 * step_hours * 60
+        concrete_diff = concrete_temp - temperature
+        transfer_intensity = np.minimum(1.0, np.abs(concrete_diff) / 10.0)
+        concrete_change = (concrete_diff * self.concrete_temp_transfer * self.concrete_influence_factor
+                           * transfer_intensity * step_hours * 60)
+        pump_change = np.where(pump_active,
+                               -self.pump_air_cooling * pump_intensity * step_hours * self.air_circulation_factor,
+                               0.0)
+        # log(1 + 0) = 0, pa temperature do 25°C ne doprinose
+        microclimate_change = 0.5 * step_hours * np.log1p(np.maximum(temperature - 25, 0) / 10)
+        rate = (self.thermal_responsiveness * 0.1
+                + self.concrete_temp_transfer * self.concrete_influence_factor * transfer_intensity) * 60
+        temperature = temperature + ((external_change + concrete_change + pump_change + microclimate_change)
+                                     * _relaxation_factor(self.integrator, rate, step_hours))
+
+        # Vlažnost (sa novom temperaturom): ventilacija, razmena sa betonom, pumpa, evaporacija
+        humidity = self.humidity
+        external_change = (external_humidity - humidity) * self.humidity_exchange_rate * step_hours * 60
+        humidity_diff = concrete_humidity - humidity
+        transfer_intensity = np.minimum(1.0, np.abs(humidity_diff) / 20.0)
+        temp_boost = 1.0 + np.maximum(0, temperature - 20) / 30.0
+        concrete_rate = np.where(humidity_diff > 0,
+                                 self.concrete_humidity_transfer * self.concrete_influence_factor
+                                 * transfer_intensity * temp_boost * 60,
+                                 self.concrete_humidity_transfer * 0.3 * transfer_intensity * 60)
+        concrete_change = humidity_diff * concrete_rate * step_hours
+        pump_change = np.where(pump_active,
+                               self.pump_air_humidifying * pump_intensity * step_hours * self.air_circulation_factor,
+                               0.0)
+        evaporating = (temperature > 20) & (humidity > 30)
+        evaporation_change = np.where(evaporating,
+                                      -0.5 * step_hours * (temperature - 20) / 20 * (humidity / 100.0),
+                                      0.0)
+        rate = (self.humidity_exchange_rate * 60 + concrete_rate
+                + np.where(evaporating, 0.5 * (temperature - 20) / 20 / 100.0, 0.0))
+        humidity = humidity + ((external_change + concrete_change + pump_change + evaporation_change)
+                               * _relaxation_factor(self.integrator, rate, step_hours))
+
+        # Ograničavanje vrednosti
+        self.temperature = np.clip(temperature, -20, 50)
+        self.humidity = np.clip(humidity, self.min_humidity, self.max_humidity)
@@ -6,6 +6,8 @@ Simulira temperaturu i vlažnost betona sa uticajem spoljnih faktora
 import math
 from typing import Dict, Any
 
+from .integrators import relaxation_factor
+
 
 class ConcreteModel:
     """
@@ -42,6 +44,9 @@ class ConcreteModel:
         # Parametri za uticaj grijača
         self.heater_warming_effect = 10.0  # °C zagrevanja
         self.heater_drying_effect = 5.0    # % smanjenja vlažnosti
+        
+        # Integracija relaksacionih članova (models/integrators.py)
+        self.integrator = 'exponential'  # 'exponential' ili 'euler'
     
     def update(self, step_minutes: int, external_temp: float, external_humidity: float,
                pump_effect: Dict[str, Any], heater_effect: Dict[str, Any], days_since_start: float = 0.0):
@@ -105,8 +110,10 @@ class ConcreteModel:
         # Prirodno hlađenje/zagrevanje (fizička svojstva betona)
         natural_change = self._calculate_natural_temperature_change(step_hours)
         
-        # Ukupna promena temperature
+        # Ukupna promena temperature; relaksacija ka spoljnoj temperaturi se rešava tačno
         total_change = external_change + pump_change + heater_change + natural_change
+        rate = self.external_temp_influence * 60 * self.thermal_mass
+        total_change *= relaxation_factor(self.integrator, rate, step_hours)
         self.temperature += total_change
     
     def _calculate_natural_temperature_change(self, step_hours: float) -> float:
@@ -148,7 +155,9 @@ class ConcreteModel:
         # Uticaj spoljnje vlažnosti (ograničen)
         humidity_diff = external_humidity - self.humidity
         external_change = humidity_diff * self.external_humidity_influence * step_hours * 60
-        external_change = max(-2, min(2, external_change))  # Ograniči na ±2% po satu
+        if self.integrator == 'euler':
+            # Ograniči na ±2% po koraku (sprečava preskakanje ravnoteže kod Euler-a)
+            external_change = max(-2, min(2, external_change))
         
         # Efekat pumpe (povećanje vlažnosti)
         pump_change = 0.0
@@ -165,6 +174,13 @@ class ConcreteModel:
         # Ukupna promena vlažnosti
         total_change = (-temp_enhanced_drying + external_change + pump_change + heater_change)
         
+        # Sušenje je linearno po vlažnosti između final_humidity i initial_humidity,
+        # pa zajedno sa spoljnim uticajem čini relaksaciju koja se rešava tačno
+        rate = self.external_humidity_influence * 60
+        if self.final_humidity < self.humidity < self.initial_humidity:
+            rate += natural_drying_rate / (self.humidity - self.final_humidity) * 60 * temp_factor
+        total_change *= relaxation_factor(self.integrator, rate, step_hours)
+        
         self.humidity += total_change
     
     def _calculate_drying_rate(self, days_since_start: float) -> float:
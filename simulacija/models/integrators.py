@@ -0,0 +1,37 @@
+"""
+Integracija relaksacionih članova modela
+Članovi oblika dx/dt = -rate * (x - x_ravnoteže) + izvor (spoljni uticaj,
+razmena beton-vazduh, sušenje) se eksplicitnim Euler-om rešavaju tačno samo
+za male korake; za rate * h > 1 vrednost preskače ravnotežu i osciluje.
+Eksponencijalni Euler množi Euler-ovu promenu koraka faktorom
+(1 - e^(-rate*h)) / (rate*h), što je tačno rešenje za konstantne koeficijente
+i svodi se na Euler kada rate * h -> 0.
+"""
+
+import math
+
+
+# 'exponential' - tačna relaksacija (podrazumevano), 'euler' - prvobitni eksplicitni Euler
+INTEGRATORS = ('exponential', 'euler')
+
+
+def relaxation_factor(integrator: str, rate: float, step_hours: float) -> float:
+    """
+    Faktor kojim se množi Euler-ova promena jednog koraka
+
+    Args:
+        integrator (str): Naziv integratora iz INTEGRATORS
+        rate (float): Ukupna brzina relaksacije (1/h), -∂(dx/dt)/∂x
+        step_hours (float): Korak u satima
+
+    Returns:
+        float: 1.0 za Euler, inače (1 - e^(-rate*h)) / (rate*h)
+    """
+    if integrator == 'euler':
+        return 1.0
+    if integrator != 'exponential':
+        raise ValueError(f"Nepoznat integrator: {integrator} (dozvoljeno: {', '.join(INTEGRATORS)})")
+    z = rate * step_hours
+    if z < 1e-12:
+        return 1.0
+    return -math.expm1(-z) / z
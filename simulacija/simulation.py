@@ -1,53 +1,39 @@
 """
 Glavna simulaciona aplikacija za betonsku deku
-Modularno dizajnirana za lako proširivanje i prilagođavanje
+Tk GUI je tanak klijent nad SimulationEngine (engine.py); ista simulacija
+se bez GUI-ja pokreće sa python engine.py
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
-from datetime import datetime, timedelta
-import math
+from datetime import datetime
 import threading
-import time
 
-from models.concrete_model import ConcreteModel
-from models.air_model import AirModel
-from models.battery_model import BatteryManager
-from models.actuator_model import ActuatorModel
-from utils.json_manager import JSONManager
-from utils.simulation_time import SimulationTime
+from engine import SimulationEngine, BATTERY_NAMES
 
 
 class SimulationApp:
     """
     Glavna klasa simulacione aplikacije
-    Upravlja celokupnom simulacijom i GUI-jem
+    Prikazuje stanje SimulationEngine-a i prosleđuje mu ulaze iz GUI-ja
     """
     
-    def __init__(self):
-        """Inicijalizacija simulacione aplikacije"""
+    def __init__(self, journal: bool = False):
+        """
+        Inicijalizacija simulacione aplikacije
+
+        Args:
+            journal (bool): Beleženje ulaza u SimData/journals (novi dnevnik po sesiji i restartu)
+        """
+        self.journal = journal
         self.root = tk.Tk()
         self.setup_window()
         
-        # Kreiranje SimData foldera ako ne postoji
-        self.sim_data_path = "../SimData"
-        os.makedirs(self.sim_data_path, exist_ok=True)
-        
-        # Inicijalizacija komponenti
-        self.json_manager = JSONManager(self.sim_data_path)
-        self.sim_time = SimulationTime()
-        self.battery_manager = BatteryManager()
-        self.concrete_model = ConcreteModel()
-        self.air_model = AirModel()
-        self.actuator_model = ActuatorModel()
+        # Simulaciono jezgro (modeli, vreme i SimData fajlovi)
+        self.engine = SimulationEngine("../SimData")
         
-        # Simulacione varijable
         self.is_running = False
-        self.step_minutes = 10  # Default korak simulacije u minutima
-        self.external_temp = 25.0  # Početna spoljna temperatura
-        self.external_humidity = 60.0  # Početna spoljna vlažnost
         
         # GUI komponente
         self.setup_gui()
@@ -151,10 +137,7 @@ class SimulationApp:
         bat_frame = ttk.LabelFrame(parent, text="Kontrola Baterija", padding="5")
         bat_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
         
-        # Lista baterija
-        batteries = ["Senzor Beton", "Senzor Vazduh", "Pumpa", "Grijač"]
-        
-        for i, battery in enumerate(batteries):
+        for i, battery in enumerate(BATTERY_NAMES):
             # Naziv baterije
             ttk.Label(bat_frame, text=f"{battery}:").grid(row=i, column=0, sticky=tk.W, pady=2)
             
@@ -233,10 +216,9 @@ class SimulationApp:
         parent.add(battery_frame, text="Baterije")
         
         # Kreiranje labels za sve baterije
-        batteries = ["Senzor Beton", "Senzor Vazduh", "Pumpa", "Grijač"]
         self.battery_labels = []
         
-        for i, battery in enumerate(batteries):
+        for i, battery in enumerate(BATTERY_NAMES):
             ttk.Label(battery_frame, text=f"{battery}:").grid(row=i, column=0, sticky=tk.W, pady=2)
             label = ttk.Label(battery_frame, text="100%")
             label.grid(row=i, column=1, sticky=tk.W, padx=(10, 0), pady=2)
@@ -267,96 +249,12 @@ class SimulationApp:
     
     def load_initial_state(self):
         """Učitavanje početnog stanja simulacije iz JSON fajlova"""
-        # Učitavanje vremena iz SimData/time.json
-        try:
-            time_data = self.json_manager.load_time()
-            if time_data and 'date' in time_data and 'time' in time_data:
-                # Novo format sa odvojenim poljima
-                self.sim_time.set_current_time_from_json(time_data['date'], time_data['time'])
-                print(f"Učitano vreme iz JSON: {time_data['date']} {time_data['time']}")
-            elif time_data and 'current_time' in time_data:
-                # Kompatibilnost sa starim formatom
-                self.sim_time.set_current_time(time_data['current_time'])
-                print(f"Učitano vreme (stari format): {time_data['current_time']}")
-            else:
-                # Kreiranje početnog vremena ako JSON ne postoji
-                print("JSON fajl ne postoji, kreiram početno vreme")
-                start_time = datetime(2025, 5, 5, 12, 0, 0)
-                self.sim_time.set_current_time(start_time.isoformat())
-                # Snimanje početnog vremena u JSON
-                self._save_initial_time()
-        except Exception as e:
-            print(f"Greška pri učitavanju vremena: {e}")
-            # Fallback na početno vreme
-            start_time = datetime(2025, 5, 5, 12, 0, 0)
-            self.sim_time.set_current_time(start_time.isoformat())
-            self._save_initial_time()
-        
-        # Učitavanje ostalih stanja ili kreiranje početnih
-        self._load_or_create_initial_models()
-        
-        # Ažuriranje GUI-ja
+        self.engine.load_initial_state()
+        # Ulazi iz GUI-ja se beleže da bi se rad mogao ponoviti (python engine.py --replay)
+        if self.journal:
+            self.engine.start_journal(self.engine.session_journal_path())
         self.update_gui()
     
-    def _save_initial_time(self):
-        """Snimanje početnog vremena u JSON fajl"""
-        try:
-            time_json = self.sim_time.get_current_time_json()
-            time_data = {
-                'date': time_json['date'],
-                'time': time_json['time'],
-                'step_minutes': int(self.step_var.get())
-            }
-            self.json_manager.save_time(time_data)
-            print(f"Snimljeno početno vreme: {time_data['date']} {time_data['time']}")
-        except Exception as e:
-            print(f"Greška pri snimanju početnog vremena: {e}")
-    
-    def _load_or_create_initial_models(self):
-        """Učitavanje postojećih modela ili kreiranje početnih stanja"""
-        # Pokušaj učitavanja postojećih stanja
-        concrete_data = self.json_manager.load_concrete()
-        air_data = self.json_manager.load_air()
-        battery_data = self.json_manager.load_batteries()
-        
-        # Reset modela
-        self.concrete_model.reset()
-        self.air_model.reset()
-        self.battery_manager.reset()
-        self.actuator_model.reset()
-        
-        # Primena učitanih podataka ako postoje
-        if concrete_data:
-            self.concrete_model.temperature = concrete_data.get('temperature', 25.0)
-            self.concrete_model.humidity = concrete_data.get('humidity', 100.0)
-            print(f"Učitano stanje betona: {concrete_data['temperature']}°C, {concrete_data['humidity']}%")
-        
-        if air_data:
-            self.air_model.temperature = air_data.get('temperature', 25.0)
-            self.air_model.humidity = air_data.get('humidity', 60.0)
-            print(f"Učitano stanje vazduha: {air_data['temperature']}°C, {air_data['humidity']}%")
-        
-        if battery_data:
-            # Učitavanje nivoa baterija za aktuatore
-            pump_battery = battery_data.get('pump_battery', 100.0)
-            heater_battery = battery_data.get('heater_battery', 100.0)
-            # Postavljanje u battery manager (indeksi 2 i 3 su za aktuatore)
-            self.battery_manager.battery_levels[2] = pump_battery
-            self.battery_manager.battery_levels[3] = heater_battery
-            print(f"Učitani nivoi baterija aktuatora: pumpa {pump_battery}%, grijač {heater_battery}%")
-        
-        # Kreiranje početnih JSON fajlova ako ne postoje
-        if not concrete_data or not air_data or not battery_data:
-            self.json_manager.create_initial_files()
-            print("Kreirani početni JSON fajlovi")
-    
-    def get_days_since_start(self):
-        """Dobijanje broja dana od početka simulacije (5.5.2025 12:00)"""
-        start_time = datetime(2025, 5, 5, 12, 0, 0)
-        current_time = datetime.fromisoformat(self.sim_time.get_current_time())
-        time_diff = current_time - start_time
-        return max(0, time_diff.total_seconds() / (24 * 3600))  # Dani kao float
-    
     def start_simulation(self):
         """Pokretanje kontinuirane simulacije"""
         if not self.is_running:
@@ -396,33 +294,18 @@ class SimulationApp:
             return
         
         try:
-            # Brisanje postojećih JSON fajlova
-            self.json_manager.clear_all_data()
-            
-            # Reset vremena na početno stanje
-            start_time = datetime(2025, 5, 5, 12, 0, 0)
-            self.sim_time.reset(start_time.isoformat())
+            # Restart započinje novi dnevnik umesto nastavka starog
+            self.engine.stop_journal()
+            self.engine.restart()
+            if self.journal:
+                self.engine.start_journal(self.engine.session_journal_path())
             
-            # Reset svih modela
-            self.concrete_model.reset()
-            self.air_model.reset()
-            self.battery_manager.reset()
-            self.actuator_model.reset()
-            
-            # Reset spoljnih uslova
-            self.external_temp = 25.0
-            self.external_humidity = 60.0
-            self.ext_temp_var.set("25.0")
-            self.ext_hum_var.set("60.0")
-            
-            # Reset checkbox-a za loše baterije
-            for i in range(4):
+            # Vraćanje kontrola na vrednosti iz jezgra
+            self.ext_temp_var.set(str(self.engine.base_temp))
+            self.ext_hum_var.set(str(self.engine.base_humidity))
+            for i in range(len(BATTERY_NAMES)):
                 getattr(self, f"bad_battery_{i}").set(False)
             
-            # Kreiranje početnih JSON fajlova
-            self.json_manager.create_initial_files()
-            
-            # Ažuriranje GUI-ja
             self.update_gui()
             
             messagebox.showinfo("Restart", "Simulacija je uspešno restartovana na početno stanje!")
@@ -431,51 +314,43 @@ class SimulationApp:
             messagebox.showerror("Greška", f"Greška pri restart-u simulacije: {str(e)}")
     
     def run_simulation(self):
-        """Glavna petlja kontinuirane simulacije"""
-        while self.is_running:
-            self.single_step()
-            time.sleep(1)  # Pauza između koraka
+        """Glavna petlja kontinuirane simulacije (korak traje 1 s; nove komande aktuatora ga dele)"""
+        try:
+            self.engine.run(pacing=1.0, should_continue=self.continue_simulation,
+                            on_step=lambda state: self.root.after(0, self.update_gui))
+        except ValueError:
+            self.root.after(0, self.stop_simulation)
+            messagebox.showerror("Greška", "Neispravna vrednost za korak simulacije!")
+        except Exception as e:
+            self.root.after(0, self.stop_simulation)
+            messagebox.showerror("Greška", f"Greška u simulaciji: {str(e)}")
+    
+    def continue_simulation(self):
+        """Provera pre svakog koraka kontinuirane simulacije; prenosi trenutne vrednosti iz GUI-ja"""
+        if self.is_running:
+            self.sync_inputs()
+        return self.is_running
+    
+    def sync_inputs(self):
+        """Prenos vrednosti iz GUI kontrola u simulaciono jezgro"""
+        self.engine.step_minutes = int(self.step_var.get())
+        
+        # Bazne vrednosti za podne; neispravan unos vraća podrazumevane
+        try:
+            self.engine.base_temp = float(self.ext_temp_var.get())
+            self.engine.base_humidity = float(self.ext_hum_var.get())
+        except ValueError:
+            self.engine.base_temp = 25.0
+            self.engine.base_humidity = 60.0
+        
+        for i in range(len(BATTERY_NAMES)):
+            self.engine.set_battery_bad(i, getattr(self, f"bad_battery_{i}").get())
     
     def single_step(self):
         """Izvršavanje jednog koraka simulacije"""
         try:
-            # Dobijanje koraka u minutama
-            step_minutes = int(self.step_var.get())
-            
-            print(f"Izvršavam korak simulacije: {step_minutes} minuta")
-            
-            # Ažuriranje vremena
-            old_time = self.sim_time.get_current_time()
-            self.sim_time.advance_time(step_minutes)
-            new_time = self.sim_time.get_current_time()
-            print(f"Vreme ažurirano: {old_time} -> {new_time}")
-            
-            # Čitanje aktuatorskih komandi
-            actuator_commands = self.json_manager.load_actuators()
-            
-            # Ažuriranje baterija
-            self.update_batteries(step_minutes)
-            
-            # Ažuriranje aktuatora
-            self.actuator_model.update(actuator_commands, step_minutes)
-            
-            # Ažuriranje spoljnih uslova na osnovu vremena dana
-            self.update_external_conditions()
-            
-            # Ažuriranje modela betona sa danima od početka
-            pump_effect = self.actuator_model.get_pump_effect()
-            heater_effect = self.actuator_model.get_heater_effect()
-            days_since_start = self.get_days_since_start()
-            self.concrete_model.update(step_minutes, self.external_temp, 
-                                     self.external_humidity, pump_effect, heater_effect, days_since_start)
-            
-            # Ažuriranje modela vazduha
-            concrete_state = self.concrete_model.get_state()
-            self.air_model.update(step_minutes, self.external_temp, 
-                                self.external_humidity, concrete_state, pump_effect)
-            
-            # Snimanje stanja u JSON fajlove
-            self.save_simulation_state()
+            self.sync_inputs()
+            self.engine.step()
             
             # Ažuriranje GUI-ja
             self.root.after(0, self.update_gui)
@@ -485,125 +360,49 @@ class SimulationApp:
         except Exception as e:
             messagebox.showerror("Greška", f"Greška u simulaciji: {str(e)}")
     
-    def update_batteries(self, step_minutes):
-        """Ažuriranje stanja baterija"""
-        # Provera koja baterija je označena kao loša
-        bad_batteries = []
-        for i in range(4):
-            if getattr(self, f"bad_battery_{i}").get():
-                bad_batteries.append(i)
-        
-        self.battery_manager.update(step_minutes, bad_batteries)
-    
-    def update_external_conditions(self):
-        """Ažuriranje spoljnih uslova na osnovu vremena dana sa preciznim 24h ciklusom"""
-        current_time = datetime.fromisoformat(self.sim_time.get_current_time())
-        hour = current_time.hour
-        minute = current_time.minute
-        
-        # Precizno vreme u satima (sa minutima)
-        time_hours = hour + minute / 60.0
-        
-        # Referentne vrednosti iz GUI-ja (bazne vrednosti za podne - 12:00)
-        try:
-            base_temp_noon = float(self.ext_temp_var.get())
-            base_humidity_noon = float(self.ext_hum_var.get())
-        except:
-            base_temp_noon = 25.0
-            base_humidity_noon = 60.0
-        
-        # 24-satni ciklus temperature (cosinusoidalna kriva)
-        # Maksimum u podne (12h), minimum u ponoć (0h/24h)
-        # Formula: base + amplitude * cos(2π * (hour - 12) / 24)
-        temp_amplitude = 8.0  # ±8°C od bazne temperature
-        temp_angle = 2 * math.pi * (time_hours - 12) / 24
-        temp_variation = temp_amplitude * math.cos(temp_angle)
-        self.external_temp = base_temp_noon + temp_variation
-        
-        # 24-satni ciklus vlažnosti (obrnuto od temperature)
-        # Minimum u podne (12h), maksimum u ponoć (0h/24h)
-        # Formula: base - amplitude * cos(2π * (hour - 12) / 24)
-        humidity_amplitude = 25.0  # ±25% od bazne vlažnosti
-        humidity_variation = -humidity_amplitude * math.cos(temp_angle)
-        self.external_humidity = max(15, min(95, base_humidity_noon + humidity_variation))
-    
     def apply_external_conditions(self):
         """Primena novih spoljnih uslova"""
         try:
-            self.external_temp = float(self.ext_temp_var.get())
-            self.external_humidity = float(self.ext_hum_var.get())
+            self.engine.base_temp = float(self.ext_temp_var.get())
+            self.engine.base_humidity = float(self.ext_hum_var.get())
+            self.engine.update_external_conditions()
             messagebox.showinfo("Info", "Spoljni uslovi su ažurirani!")
         except ValueError:
             messagebox.showerror("Greška", "Neispravne vrednosti za spoljne uslove!")
     
     def kill_battery(self, battery_index):
         """Ubijanje određene baterije (postavljanje na 0%)"""
-        self.battery_manager.kill_battery(battery_index)
+        self.engine.kill_battery(battery_index)
         self.update_gui()
         messagebox.showinfo("Info", f"Baterija {battery_index} je ubijena!")
     
-    def save_simulation_state(self):
-        """Snimanje trenutnog stanja simulacije u JSON fajlove"""
-        # Vreme sa odvojenim poljima
-        time_json = self.sim_time.get_current_time_json()
-        time_data = {
-            'date': time_json['date'],
-            'time': time_json['time'],
-            'step_minutes': int(self.step_var.get())
-        }
-        self.json_manager.save_time(time_data)
-        
-        # Beton
-        concrete_state = self.concrete_model.get_state()
-        concrete_data = {
-            'temperature': concrete_state['temperature'],
-            'humidity': concrete_state['humidity'],
-            'battery_level': self.battery_manager.get_battery_level(0)
-        }
-        self.json_manager.save_concrete(concrete_data)
-        
-        # Vazduh
-        air_state = self.air_model.get_state()
-        air_data = {
-            'temperature': air_state['temperature'],
-            'humidity': air_state['humidity'],
-            'battery_level': self.battery_manager.get_battery_level(1)
-        }
-        self.json_manager.save_air(air_data)
-        
-        # Baterije aktuatora
-        battery_data = {
-            'pump_battery': self.battery_manager.get_battery_level(2),
-            'heater_battery': self.battery_manager.get_battery_level(3)
-        }
-        self.json_manager.save_batteries(battery_data)
-    
     def update_gui(self):
         """Ažuriranje GUI elemenata"""
+        state = self.engine.get_state()
+        batteries = state['batteries']
+        
         # Vreme
-        current_time = self.sim_time.get_current_time()
-        formatted_time = datetime.fromisoformat(current_time).strftime("%Y-%m-%d %H:%M:%S")
+        formatted_time = datetime.fromisoformat(state['time']).strftime("%Y-%m-%d %H:%M:%S")
         self.time_label.config(text=formatted_time)
         
         # Beton
-        concrete_state = self.concrete_model.get_state()
+        concrete_state = state['concrete']
         self.concrete_temp_label.config(text=f"{concrete_state['temperature']:.1f}°C")
         self.concrete_hum_label.config(text=f"{concrete_state['humidity']:.1f}%")
-        self.concrete_bat_label.config(text=f"{self.battery_manager.get_battery_level(0):.0f}%")
+        self.concrete_bat_label.config(text=f"{batteries[0]:.0f}%")
         
         # Vazduh
-        air_state = self.air_model.get_state()
+        air_state = state['air']
         self.air_temp_label.config(text=f"{air_state['temperature']:.1f}°C")
         self.air_hum_label.config(text=f"{air_state['humidity']:.1f}%")
-        self.air_bat_label.config(text=f"{self.battery_manager.get_battery_level(1):.0f}%")
+        self.air_bat_label.config(text=f"{batteries[1]:.0f}%")
         
         # Baterije
-        for i, label in enumerate(self.battery_labels):
-            battery_level = self.battery_manager.get_battery_level(i)
+        for label, battery_level in zip(self.battery_labels, batteries):
             label.config(text=f"{battery_level:.0f}%")
         
         # Aktuatori
-        actuator_state = self.actuator_model.get_state()
+        actuator_state = state['actuators']
         
         # Pumpa
         pump_status = "ON" if actuator_state['pump_on'] else "OFF"
@@ -621,5 +420,9 @@ class SimulationApp:
 
 
 if __name__ == "__main__":
-    app = SimulationApp()
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Simulacija betonske deke (GUI)')
+    parser.add_argument('--journal', action='store_true',
+                        help='Beleženje ulaza u SimData/journals/inputs-<vreme>.journal (za engine.py --replay)')
+    args = parser.parse_args()
+    app = SimulationApp(journal=args.journal)
+    app.run()
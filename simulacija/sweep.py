@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo sweep fizičkih parametara modela betona i vazduha
+Za svaki run se parametri uzorkuju iz raspodela (PARAMETER_DISTRIBUTIONS),
+simulira se celo 7-dnevno sušenje i u fajl rezultata (jedan JSON po liniji)
+se upisuju sumarne metrike. Run-ovi se grupišu u blokove koje
+ProcessPoolExecutor deli na sva jezgra; blok se simulira vektorizovano
+(ConcreteBatchModel/AirBatchModel, parametri kao nizovi po run-u).
+
+Parametri run-a zavise samo od (seed, run_id), pa se prekinut sweep
+nastavlja istom komandom - već upisani run-ovi se preskaču.
+
+Primeri:
+    python sweep.py --runs 10000
+    python sweep.py --runs 10000 --output sweep_leto.ndjson --temp 32 --humidity 40
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import timedelta
+
+import numpy as np
+
+from engine import START_TIME, external_conditions
+from models.batch_models import ConcreteBatchModel, AirBatchModel
+
+
+# Raspodele nesigurnih parametara: 'model.atribut' -> (raspodela, a, b)
+# uniform: a = donja, b = gornja granica; normal: a = srednja vrednost, b = standardna devijacija
+PARAMETER_DISTRIBUTIONS = {
+    'concrete.thermal_mass': ('uniform', 0.85, 1.0),
+    'concrete.external_temp_influence': ('uniform', 0.005, 0.02),
+    'concrete.external_humidity_influence': ('uniform', 0.0025, 0.01),
+    'concrete.pump_cooling_effect': ('uniform', 2.0, 6.0),
+    'concrete.pump_humidity_effect': ('uniform', 10.0, 30.0),
+    'concrete.heater_warming_effect': ('uniform', 5.0, 15.0),
+    'concrete.heater_drying_effect': ('uniform', 2.5, 7.5),
+    'air.thermal_responsiveness': ('uniform', 0.4, 0.8),
+    'air.humidity_exchange_rate': ('uniform', 0.01, 0.02),
+    'air.concrete_influence_factor': ('uniform', 0.15, 0.35),
+    'air.concrete_temp_transfer': ('uniform', 0.04, 0.12),
+    'air.concrete_humidity_transfer': ('uniform', 0.02, 0.06),
+}
+
+# Granice iz specifikacije (Specifikacija.md, Kontroler/MQTT/SystemController.h)
+MIN_CONCRETE_TEMP = 5.0
+MAX_CONCRETE_TEMP = 35.0
+MIN_AIR_TEMP_FOR_PUMP = 2.0
+
+DEFAULT_OUTPUT = 'sweep_results.ndjson'
+
+
+def temperature_difference_limit(hours: float) -> float:
+    """Dozvoljena razlika temperature betona i spoljne temperature (±°C)"""
+    if hours < 12:
+        return 3.0
+    if hours < 24:
+        return 5.0
+    return 7.0
+
+
+def minimum_humidity(hours: float) -> float:
+    """Minimalna vlažnost betona za starost betona u satima"""
+    if hours < 12:
+        return 80.0
+    if hours < 24:
+        return 60.0
+    if hours < 48:
+        return 50.0
+    if hours < 72:
+        return 40.0
+    return 15.0
+
+
+def sample_parameters(seed: int, run_id: int) -> dict:
+    """Uzorkuje parametre jednog run-a (deterministički za isti seed i run_id)"""
+    rng = random.Random(f"{seed}:{run_id}")
+    params = {}
+    for name, (distribution, a, b) in PARAMETER_DISTRIBUTIONS.items():
+        if distribution == 'uniform':
+            params[name] = rng.uniform(a, b)
+        elif distribution == 'normal':
+            params[name] = rng.gauss(a, b)
+        else:
+            raise ValueError(f"Nepoznata raspodela: {distribution}")
+    return params
+
+
+def simulate_chunk(run_ids, seed, days, step_minutes, base_temp, base_humidity, control):
+    """
+    Simulira blok run-ova odjednom i vraća njihove zapise
+
+    Args:
+        run_ids (list): Identifikatori run-ova u bloku
+        seed (int): Seed sweep-a
+        days (float): Trajanje sušenja u danima
+        step_minutes (int): Korak simulacije
+        base_temp (float): Bazna spoljna temperatura u podne
+        base_humidity (float): Bazna spoljna vlažnost u podne
+        control (bool): Uključuje pumpu/grijač po pravilima kontrolera
+
+    Returns:
+        list: Zapisi {'run_id', 'params', 'metrics'}
+    """
+    count = len(run_ids)
+    params = [sample_parameters(seed, run_id) for run_id in run_ids]
+    models = {'concrete': ConcreteBatchModel(count), 'air': AirBatchModel(count)}
+    for name in PARAMETER_DISTRIBUTIONS:
+        model, attribute = name.split('.', 1)
+        setattr(models[model], attribute, np.array([p[name] for p in params]))
+    concrete, air = models['concrete'], models['air']
+
+    out_of_spec_minutes = np.zeros(count)
+    peak_temperature = concrete.temperature.copy()
+    pump_minutes = np.zeros(count)
+    heater_minutes = np.zeros(count)
+    pump_effect = {'active': False, 'intensity': 1.0}
+    heater_effect = {'active': False, 'intensity': 1.0, 'temperature': MIN_CONCRETE_TEMP + 5.0}
+
+    steps = int(round(days * 24 * 60 / step_minutes))
+    for step in range(1, steps + 1):
+        elapsed_minutes = step * step_minutes
+        hours = elapsed_minutes / 60.0
+        external_temp, external_humidity = external_conditions(
+            START_TIME + timedelta(minutes=elapsed_minutes), base_temp, base_humidity)
+
+        if control:
+            # Pojednostavljena pravila kontrolera: pumpa za vlažnost i hlađenje, grijač za hladan beton
+            pump_active = (((concrete.humidity < minimum_humidity(hours) + 5.0)
+                            | (concrete.temperature > MAX_CONCRETE_TEMP))
+                           & (air.temperature >= MIN_AIR_TEMP_FOR_PUMP))
+            heater_active = concrete.temperature < MIN_CONCRETE_TEMP
+            pump_effect['active'] = pump_active
+            heater_effect['active'] = heater_active
+            pump_minutes += pump_active * step_minutes
+            heater_minutes += heater_active * step_minutes
+
+        concrete.update(step_minutes, external_temp, external_humidity,
+                        pump_effect, heater_effect, elapsed_minutes / (24 * 60))
+        air.update(step_minutes, external_temp, external_humidity, concrete.get_state(), pump_effect)
+
+        out_of_spec = ((concrete.temperature < MIN_CONCRETE_TEMP)
+                       | (concrete.temperature > MAX_CONCRETE_TEMP)
+                       | (np.abs(concrete.temperature - external_temp) > temperature_difference_limit(hours))
+                       | (concrete.humidity < minimum_humidity(hours)))
+        out_of_spec_minutes += out_of_spec * step_minutes
+        np.maximum(peak_temperature, concrete.temperature, out=peak_temperature)
+
+    records = []
+    for i, run_id in enumerate(run_ids):
+        records.append({
+            'run_id': run_id,
+            'params': params[i],
+            'metrics': {
+                'out_of_spec_minutes': float(out_of_spec_minutes[i]),
+                'peak_temperature': round(float(peak_temperature[i]), 3),
+                'final_humidity': round(float(concrete.humidity[i]), 3),
+                'final_air_humidity': round(float(air.humidity[i]), 3),
+                'pump_minutes': float(pump_minutes[i]),
+                'heater_minutes': float(heater_minutes[i]),
+            }
+        })
+    return records
+
+
+def load_completed(path: str, config: dict) -> set:
+    """
+    Vraća run_id-jeve već upisane u fajl rezultata
+
+    Prva linija fajla je konfiguracija sweep-a; nastavak sa drugačijom
+    konfiguracijom se odbija. Nedovršena poslednja linija (prekid usred
+    upisa) se odseca.
+    """
+    if not os.path.exists(path):
+        return set()
+
+    completed = set()
+    valid_size = 0
+    with open(path, 'rb') as f:
+        for number, line in enumerate(f):
+            if not line.endswith(b'\n'):
+                break
+            record = json.loads(line)
+            if number == 0:
+                if record.get('config') != config:
+                    raise ValueError(f"{path} pripada sweep-u sa drugačijom konfiguracijom")
+            else:
+                completed.add(record['run_id'])
+            valid_size += len(line)
+
+    if valid_size != os.path.getsize(path):
+        with open(path, 'r+b') as f:
+            f.truncate(valid_size)
+    return completed
+
+
+def run_sweep(runs, output=DEFAULT_OUTPUT, seed=0, days=7.0, step_minutes=10,
+              base_temp=25.0, base_humidity=60.0, control=True, workers=None, chunk_size=64):
+    """
+    Pokreće (ili nastavlja) sweep i strimuje rezultate u output
+
+    Returns:
+        int: Broj run-ova izvršenih u ovom pokretanju
+    """
+    config = {
+        'seed': seed, 'days': days, 'step_minutes': step_minutes,
+        'base_temp': base_temp, 'base_humidity': base_humidity, 'control': control,
+        'distributions': {name: list(spec) for name, spec in PARAMETER_DISTRIBUTIONS.items()},
+    }
+    completed = load_completed(output, config)
+    pending = [run_id for run_id in range(runs) if run_id not in completed]
+    if completed:
+        print(f"↩️  Nastavak: {len(completed)} run-ova već postoji, preostalo {len(pending)}")
+    if not pending:
+        return 0
+
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    done = 0
+
+    with open(output, 'a', encoding='utf-8') as out, ProcessPoolExecutor(max_workers=workers) as executor:
+        if not completed and out.tell() == 0:
+            out.write(json.dumps({'config': config}) + '\n')
+            out.flush()
+
+        # Ograničen broj blokova u letu - rezultati se upisuju čim stignu
+        chunks = iter(chunks)
+        in_flight = set()
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                in_flight.add(executor.submit(simulate_chunk, chunk, seed, days, step_minutes,
+                                              base_temp, base_humidity, control))
+            if not in_flight:
+                break
+
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                records = future.result()
+                out.write(''.join(json.dumps(record) + '\n' for record in records))
+                out.flush()
+                done += len(records)
+
+            elapsed = time.perf_counter() - started
+            print(f"🎲 {done}/{len(pending)} run-ova ({done / elapsed:.0f} run/s)")
+
+    print(f"✅ Sweep završen: {done} run-ova za {time.perf_counter() - started:.1f} s -> {output}")
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo sweep parametara modela sušenja betona')
+    parser.add_argument('--runs', type=int, default=1000, help='Ukupan broj run-ova')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Fajl rezultata (NDJSON)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed uzorkovanja parametara')
+    parser.add_argument('--days', type=float, default=7.0, help='Trajanje sušenja (dani)')
+    parser.add_argument('--step', type=int, default=10, help='Korak simulacije (minuti)')
+    parser.add_argument('--temp', type=float, default=25.0, help='Bazna spoljna temperatura u podne (°C)')
+    parser.add_argument('--humidity', type=float, default=60.0, help='Bazna spoljna vlažnost u podne (%%)')
+    parser.add_argument('--no-control', action='store_true', help='Bez pumpe i grijača (nekontrolisano sušenje)')
+    parser.add_argument('--workers', type=int, help='Broj procesa (podrazumevano broj jezgara)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Run-ova po zadatku procesa')
+    args = parser.parse_args()
+
+    try:
+        run_sweep(args.runs, args.output, seed=args.seed, days=args.days, step_minutes=args.step,
+                  base_temp=args.temp, base_humidity=args.humidity, control=not args.no_control,
+                  workers=args.workers, chunk_size=args.chunk_size)
+    except KeyboardInterrupt:
+        print("\nSweep prekinut - ponovno pokretanje iste komande nastavlja od poslednjeg upisanog run-a")
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Praćenje komandi aktuatora (AKTUATORI.JSON) bez čitanja fajla u svakom koraku
+Na Linux-u se koristi inotify nad SimData direktorijumom (fajl se javlja kada
+ga pisac zatvori ili zameni), a inače poređenje mtime/veličine fajla. Fajl se
+parsira samo kada se promeni; poluupisan sadržaj ne menja poslednje važeće
+komande, već se ponovo čita pri sledećoj proveri.
+"""
+
+import copy
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import time
+from typing import Any, Dict, Optional
+
+
+# inotify konstante (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_EVENT = struct.Struct('iIII')
+
+# Interval provere mtime-a kada inotify nije dostupan (sekunde)
+POLL_INTERVAL = 0.05
+
+DEFAULT_COMMANDS = {
+    'pump': {
+        'status': 0,  # 0 = OFF, 1 = ON
+        'runtime_minutes': 0
+    },
+    'heater': {
+        'status': 0,  # 0 = OFF, 1 = ON
+        'temperature': 25.0
+    }
+}
+
+
+def _open_inotify(directory: str) -> Optional[int]:
+    """Vraća inotify fd koji prati directory, ili None ako inotify nije dostupan"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class ActuatorCommandWatcher:
+    """
+    Poslednje važeće komande aktuatora, osvežene samo kada se fajl promeni
+
+    poll() je neblokirajuća provera; wait(timeout) blokira dok komande ne
+    stignu ili ne istekne timeout.
+    """
+
+    def __init__(self, path: str, use_inotify: bool = True):
+        """
+        Args:
+            path (str): Putanja do AKTUATORI.JSON
+            use_inotify (bool): Pokušaj korišćenja inotify-a (inače mtime)
+        """
+        self.path = path
+        self.name = os.path.basename(path)
+        self.commands = copy.deepcopy(DEFAULT_COMMANDS)
+        self.reloads = 0
+        self._signature = None
+        self._fd = _open_inotify(os.path.dirname(os.path.abspath(path))) if use_inotify else None
+        self._reload()
+
+    @property
+    def mode(self) -> str:
+        return 'inotify' if self._fd is not None else 'mtime'
+
+    def poll(self) -> bool:
+        """
+        Proverava da li su stigle nove komande (ne blokira)
+
+        Returns:
+            bool: True ako su se komande promenile
+        """
+        if self._fd is not None:
+            if not self._drain_events() and self._signature is not None:
+                return False
+        elif self._stat() == self._signature:
+            return False
+        return self._reload()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Čeka nove komande najviše timeout sekundi
+
+        Returns:
+            bool: True ako su se komande promenile
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            if self.poll():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._fd is not None:
+                select.select([self._fd], [], [], remaining)
+            else:
+                time.sleep(min(POLL_INTERVAL, remaining))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _drain_events(self) -> bool:
+        """Čita sve pristigle inotify događaje; True ako se neki odnosi na praćeni fajl"""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset + IN_EVENT.size <= len(data):
+                _, _, _, length = IN_EVENT.unpack_from(data, offset)
+                name = data[offset + IN_EVENT.size:offset + IN_EVENT.size + length].rstrip(b'\0')
+                if os.fsdecode(name) == self.name:
+                    relevant = True
+                offset += IN_EVENT.size + length
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _reload(self) -> bool:
+        """Parsira fajl; vraća True ako su se komande promenile"""
+        signature = self._stat()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                commands = json.load(f)
+        except FileNotFoundError:
+            commands = copy.deepcopy(DEFAULT_COMMANDS)
+        except (ValueError, OSError):
+            # Poluupisan fajl - potpis se ne pamti, pa se čita ponovo pri sledećoj proveri
+            self._signature = None
+            return False
+
+        self._signature = signature
+        self.reloads += 1
+        if commands == self.commands:
+            return False
+        self.commands = commands
+        return True
@@ -0,0 +1,44 @@
+"""
+Binarni checkpoint-i celokupnog stanja simulacije
+Fajl je MAGIC zaglavlje + pickle rečnika stanja (SimulationEngine.get_full_state()).
+Upis ide preko privremenog fajla i os.replace, pa prekid usred upisa ne
+oštećuje prethodni checkpoint. Učitavati samo sopstvene checkpoint-e -
+pickle nije bezbedan za podatke iz nepoznatog izvora.
+"""
+
+import os
+import pickle
+from typing import Any, Dict
+
+
+MAGIC = b'SIMCKPT1'
+
+
+def write_checkpoint(path: str, state: Dict[str, Any]):
+    """
+    Atomično upisuje checkpoint
+
+    Args:
+        path (str): Putanja checkpoint fajla
+        state (Dict[str, Any]): Stanje iz SimulationEngine.get_full_state()
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def read_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Učitava checkpoint
+
+    Returns:
+        Dict[str, Any]: Stanje za SimulationEngine.set_full_state()
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} nije checkpoint simulacije")
+        return pickle.load(f)
@@ -0,0 +1,170 @@
+"""
+Binarni dnevnik ulaza simulacije (append-only) za determinističko ponavljanje
+Posle zaglavlja fajl je niz zapisa:
+
+    SNAPSHOT  uint8 kind=1, uint32 dužina, pickle stanja (SimulationEngine.get_full_state())
+    STEP      uint8 kind=2 i 44 bajta ulaza jednog koraka (STEP_RECORD)
+
+Prvi zapis je uvek SNAPSHOT (početno stanje), a novi se dodaje i posle
+restarta ili učitavanja checkpoint-a. Korak sa step_minutes = 0 je samo
+primena novih komandi aktuatora usred koraka. Nedovršen poslednji zapis
+(prekid usred upisa) se pri čitanju ignoriše, a pri nastavku upisa odseca.
+"""
+
+import os
+import pickle
+import struct
+from typing import Any, Dict, Iterator, Tuple
+
+
+MAGIC = b'SIMJ'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+
+KIND = struct.Struct('<B')
+KIND_SNAPSHOT = 1
+KIND_STEP = 2
+
+SNAPSHOT_LENGTH = struct.Struct('<I')
+
+# step_minutes, base_temp, base_humidity, maska loših baterija, maska ubijenih baterija,
+# status pumpe, status grijača, runtime_minutes pumpe, ciljna temperatura grijača
+STEP_RECORD = struct.Struct('<dddBBbbdd')
+
+# Status koji nije ni 0 ni 1 (aktuator ga tretira kao "bez promene")
+OTHER_STATUS = -1
+
+
+def _status_code(status) -> int:
+    if status == 1:
+        return 1
+    if status == 0:
+        return 0
+    return OTHER_STATUS
+
+
+def encode_commands(commands: Dict[str, Any]) -> Tuple[int, int, float, float]:
+    """Komande aktuatora svedene na vrednosti koje ActuatorModel koristi"""
+    commands = commands or {}
+    pump = commands.get('pump', {})
+    heater = commands.get('heater', {})
+    return (_status_code(pump.get('status', 0)), _status_code(heater.get('status', 0)),
+            float(pump.get('runtime_minutes', 0)), float(heater.get('temperature', 25.0)))
+
+
+def decode_commands(pump_status: int, heater_status: int, pump_runtime: float,
+                    heater_temperature: float) -> Dict[str, Any]:
+    """Komande aktuatora u obliku AKTUATORI.JSON iz zapisa koraka"""
+    return {
+        'pump': {'status': pump_status, 'runtime_minutes': pump_runtime},
+        'heater': {'status': heater_status, 'temperature': heater_temperature}
+    }
+
+
+def _mask(indices) -> int:
+    mask = 0
+    for index in indices:
+        mask |= 1 << index
+    return mask
+
+
+def _indices(mask: int) -> list:
+    return [index for index in range(8) if mask & (1 << index)]
+
+
+def _valid_size(f) -> int:
+    """Dužina fajla do kraja poslednjeg celog zapisa"""
+    size = HEADER.size
+    while True:
+        kind = f.read(KIND.size)
+        if len(kind) < KIND.size:
+            return size
+        if kind[0] == KIND_SNAPSHOT:
+            length = f.read(SNAPSHOT_LENGTH.size)
+            if len(length) < SNAPSHOT_LENGTH.size:
+                return size
+            payload_size = SNAPSHOT_LENGTH.unpack(length)[0]
+            entry_size = KIND.size + SNAPSHOT_LENGTH.size + payload_size
+        elif kind[0] == KIND_STEP:
+            payload_size = STEP_RECORD.size
+            entry_size = KIND.size + payload_size
+        else:
+            return size
+        if len(f.read(payload_size)) < payload_size:
+            return size
+        size += entry_size
+
+
+def _check_header(f, path: str):
+    magic, version = HEADER.unpack(f.read(HEADER.size).ljust(HEADER.size, b'\0'))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} nije dnevnik ulaza verzije {VERSION}")
+
+
+class InputJournalWriter:
+    """Dodaje zapise na kraj dnevnika (postojeći dnevnik se nastavlja)"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Putanja dnevnika
+        """
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'r+b') as f:
+                _check_header(f, path)
+                valid_size = _valid_size(f)
+                f.truncate(valid_size)
+            self._file = open(path, 'ab')
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def write_snapshot(self, state: Dict[str, Any]):
+        """Upisuje stanje od kojeg se nastavljaju sledeći koraci"""
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(KIND.pack(KIND_SNAPSHOT) + SNAPSHOT_LENGTH.pack(len(payload)) + payload)
+
+    def write_step(self, step_minutes: float, base_temp: float, base_humidity: float,
+                   bad_batteries, killed_batteries, commands: Dict[str, Any]):
+        """Upisuje ulaze jednog koraka"""
+        self._file.write(KIND.pack(KIND_STEP) + STEP_RECORD.pack(
+            step_minutes, base_temp, base_humidity, _mask(bad_batteries), _mask(killed_batteries),
+            *encode_commands(commands)))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_journal(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Čita zapise dnevnika redom
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: (KIND_SNAPSHOT, stanje) ili (KIND_STEP, ulazi koraka sa
+        ključevima step_minutes, base_temp, base_humidity, bad_batteries, killed_batteries, commands)
+    """
+    with open(path, 'rb') as f:
+        _check_header(f, path)
+        end = _valid_size(f)
+        f.seek(HEADER.size)
+        while f.tell() < end:
+            kind = KIND.unpack(f.read(KIND.size))[0]
+            if kind == KIND_SNAPSHOT:
+                length = SNAPSHOT_LENGTH.unpack(f.read(SNAPSHOT_LENGTH.size))[0]
+                yield kind, pickle.loads(f.read(length))
+            else:
+                (step_minutes, base_temp, base_humidity, bad_mask, kill_mask,
+                 pump_status, heater_status, pump_runtime, heater_temperature) = STEP_RECORD.unpack(
+                    f.read(STEP_RECORD.size))
+                yield kind, {
+                    'step_minutes': step_minutes,
+                    'base_temp': base_temp,
+                    'base_humidity': base_humidity,
+                    'bad_batteries': _indices(bad_mask),
+                    'killed_batteries': _indices(kill_mask),
+                    'commands': decode_commands(pump_status, heater_status, pump_runtime, heater_temperature),
+                }
@@ -1,12 +1,23 @@
 """
 JSON Manager za upravljanje JSON fajlovima simulacije
 Centralizovano čitanje i pisanje svih simulacionih podataka
+
+Fajlovi se upisuju kompaktno, preko privremenog fajla i os.replace, pa
+čitaoci (C++ senzori, backend) uvek vide ceo stari ili ceo novi sadržaj.
+Fajl čiji se sadržaj nije promenio se ne upisuje ponovo, osim ako ga je u
+međuvremenu izmenio neko drugi (npr. C++ aktuatori AKTUATORI.JSON). Svaki upisan fajl
+nosi 'seq' - redni broj koraka simulacije u kom je upisan (time.json se
+menja svakim korakom, pa nosi tekući korak).
 """
 
+import copy
 import json
 import os
 from typing import Dict, Any, Optional
 
+from .actuator_watcher import DEFAULT_COMMANDS
+from .state_channel import StateChannelWriter
+
 
 class JSONManager:
     """
@@ -14,12 +25,13 @@ class JSONManager:
     Obezbeđuje centralizovano čitanje i pisanje podataka
     """
     
-    def __init__(self, sim_data_path: str):
+    def __init__(self, sim_data_path: str, state_channel: bool = False):
         """
         Inicijalizacija JSON managera
         
         Args:
             sim_data_path (str): Putanja do SimData foldera
+            state_channel (bool): Objavljivanje stanja i u mapirani fajl state.bin
         """
         self.sim_data_path = sim_data_path
         self.ensure_data_directory()
@@ -32,6 +44,15 @@ class JSONManager:
             'batteries': os.path.join(sim_data_path, 'BATERIJE.JSON'),
             'actuators': os.path.join(sim_data_path, 'AKTUATORI.JSON')
         }
+        
+        # Redni broj koraka simulacije i poslednji upisan sadržaj po fajlu (bez 'seq')
+        # sa potpisom fajla na disku posle upisa
+        self.seq = 0
+        self._written = {}
+        
+        # Opcioni memorijski mapiran kanal stanja (utils/state_channel.py)
+        self.state_channel_path = os.path.join(sim_data_path, 'state.bin')
+        self.state_channel = StateChannelWriter(self.state_channel_path) if state_channel else None
     
     def ensure_data_directory(self):
         """Kreiranje SimData direktorijuma ako ne postoji"""
@@ -60,7 +81,7 @@ class JSONManager:
     
     def save_json(self, file_key: str, data: Dict[str, Any]) -> bool:
         """
-        Snimanje podataka u JSON fajl
+        Atomično snimanje podataka u JSON fajl (preskače se ako se sadržaj nije promenio)
         
         Args:
             file_key (str): Ključ fajla iz self.files
@@ -69,18 +90,59 @@ class JSONManager:
         Returns:
             bool: True ako je snimanje uspešno, False inače
         """
+        file_path = self.files.get(file_key)
+        if not file_path:
+            return False
+        
+        content = {key: value for key, value in data.items() if key != 'seq'}
+        written = self._written.get(file_key)
+        if written is not None and written[0] == content and written[1] == self._file_signature(file_path):
+            return True
+        
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
         try:
-            file_path = self.files.get(file_key)
-            if not file_path:
-                return False
-                
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({**content, 'seq': self.seq}, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(temp_path, file_path)
+            self._written[file_key] = (content, self._file_signature(file_path))
             return True
         except IOError as e:
             print(f"Greška pri snimanju {file_key}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
             return False
     
+    @staticmethod
+    def _file_signature(file_path: str):
+        """Inode, vreme izmene i veličina fajla (None ako ne postoji) - menja se svakim upisom"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    def publish_state(self, state: Dict[str, Any]):
+        """
+        Objavljivanje celog stanja koraka u kanal stanja (ako je uključen)
+        
+        Args:
+            state (Dict[str, Any]): Stanje u obliku SimulationEngine.get_state()
+        """
+        if self.state_channel is not None:
+            self.state_channel.publish(self.seq, state)
+    
+    def next_step(self) -> int:
+        """
+        Početak upisa novog koraka simulacije
+        
+        Returns:
+            int: Redni broj koraka koji će nositi fajlovi upisani do sledećeg poziva
+        """
+        self.seq += 1
+        return self.seq
+    
     # Specifične metode za različite tipove podataka
     
     def load_time(self) -> Optional[Dict[str, Any]]:
@@ -90,7 +152,11 @@ class JSONManager:
         Returns:
             Optional[Dict[str, Any]]: Podaci o vremenu ili None
         """
-        return self.load_json('time')
+        time_data = self.load_json('time')
+        # Nastavak numeracije koraka posle ponovnog pokretanja
+        if time_data:
+            self.seq = max(self.seq, int(time_data.get('seq', 0)))
+        return time_data
     
     def save_time(self, time_data: Dict[str, Any]) -> bool:
         """
@@ -178,16 +244,7 @@ class JSONManager:
         
         # Vraćanje default vrednosti ako fajl ne postoji
         if actuator_data is None:
-            return {
-                'pump': {
-                    'status': 0,  # 0 = OFF, 1 = ON
-                    'runtime_minutes': 0
-                },
-                'heater': {
-                    'status': 0,  # 0 = OFF, 1 = ON
-                    'temperature': 25.0
-                }
-            }
+            return copy.deepcopy(DEFAULT_COMMANDS)
         
         return actuator_data
     
@@ -284,6 +341,8 @@ class JSONManager:
         Brisanje svih JSON fajlova
         Koristi se za reset simulacije
         """
+        self._written.clear()
+        self.seq = 0
         for file_path in self.files.values():
             if os.path.exists(file_path):
                 try:
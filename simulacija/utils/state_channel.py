@@ -0,0 +1,195 @@
+"""
+Memorijski mapiran kanal stanja simulacije (SimData/state.bin)
+Simulacija posle svakog upisanog koraka u fajl fiksnog rasporeda upisuje celo
+stanje; čitaoci ga mapiraju u memoriju i čitaju bez otvaranja fajlova i
+parsiranja JSON-a. Doslednost obezbeđuje seqlock brojač.
+
+Raspored (little-endian, 168 bajtova, poravnato na 8):
+
+    offset  tip      polje
+    0       char[4]  magic                  b"SIMS"
+    4       uint16   version                1
+    6       uint16   payload_size           152
+    8       uint64   seqlock                neparan = upis u toku
+    16      uint64   step                   'seq' koraka iz JSON fajlova
+    24      int64    sim_time               simulirano vreme, epoch sekunde (UTC)
+    32      int32    step_minutes
+    36      uint32   flags                  bit 0 = pumpa radi, bit 1 = grijač radi
+    40      double   concrete_temperature   °C
+    48      double   concrete_humidity      %
+    56      double   air_temperature        °C
+    64      double   air_humidity           %
+    72      double   external_temperature   °C
+    80      double   external_humidity      %
+    88      double   battery_concrete       %
+    96      double   battery_air            %
+    104     double   battery_pump           %
+    112     double   battery_heater         %
+    120     double   pump_time_remaining    minuti
+    128     double   pump_intensity         0-1
+    136     double   heater_temperature     °C
+    144     double   heater_intensity       0-1
+    152     double   water_temperature      °C
+    160     double   water_level            %
+
+Protokol (seqlock): pisac poveća seqlock na neparan broj, upiše polja pa ga
+poveća na paran. Čitalac pročita seqlock (ako je neparan pokušava ponovo),
+kopira polja i ponovo pročita seqlock; snimak važi samo ako su obe vrednosti
+iste. C/C++ čitalac treba da čita seqlock atomično, sa acquire ogradom posle
+prvog i pre drugog čitanja (std::atomic_thread_fence(std::memory_order_acquire)).
+"""
+
+import calendar
+import mmap
+import os
+import struct
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+
+MAGIC = b'SIMS'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHH')
+SEQLOCK = struct.Struct('<Q')
+PAYLOAD = struct.Struct('<QqiI16d')
+
+SEQLOCK_OFFSET = HEADER.size
+PAYLOAD_OFFSET = SEQLOCK_OFFSET + SEQLOCK.size
+TOTAL_SIZE = PAYLOAD_OFFSET + PAYLOAD.size
+
+EPOCH = datetime(1970, 1, 1)
+
+FLAG_PUMP_ON = 1
+FLAG_HEATER_ON = 2
+
+# Nazivi double polja u redosledu rasporeda
+VALUE_FIELDS = (
+    'concrete_temperature', 'concrete_humidity', 'air_temperature', 'air_humidity',
+    'external_temperature', 'external_humidity',
+    'battery_concrete', 'battery_air', 'battery_pump', 'battery_heater',
+    'pump_time_remaining', 'pump_intensity', 'heater_temperature', 'heater_intensity',
+    'water_temperature', 'water_level'
+)
+
+
+class StateChannelWriter:
+    """Upisuje stanje simulacije u mapirani fajl"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Putanja fajla kanala
+        """
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != TOTAL_SIZE:
+                os.ftruncate(fd, TOTAL_SIZE)
+            self._mm = mmap.mmap(fd, TOTAL_SIZE, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+
+        # Nastavak brojača iz postojećeg fajla, da čitaoci ne vide da se vratio unazad
+        seqlock = 0
+        if self._mm[:4] == MAGIC:
+            seqlock = SEQLOCK.unpack_from(self._mm, SEQLOCK_OFFSET)[0]
+        self._seqlock = seqlock + (seqlock & 1)
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, PAYLOAD.size)
+        SEQLOCK.pack_into(self._mm, SEQLOCK_OFFSET, self._seqlock)
+
+    def publish(self, step: int, state: Dict[str, Any]):
+        """
+        Upisuje stanje jednog koraka
+
+        Args:
+            step (int): Redni broj koraka (JSONManager.seq)
+            state (Dict[str, Any]): Stanje u obliku SimulationEngine.get_state()
+        """
+        actuators = state['actuators']
+        batteries = state['batteries']
+        flags = (FLAG_PUMP_ON if actuators['pump_on'] else 0) | (FLAG_HEATER_ON if actuators['heater_on'] else 0)
+        sim_time = calendar.timegm(datetime.fromisoformat(state['time']).timetuple())
+        values = (
+            state['concrete']['temperature'], state['concrete']['humidity'],
+            state['air']['temperature'], state['air']['humidity'],
+            state['external']['temperature'], state['external']['humidity'],
+            batteries[0], batteries[1], batteries[2], batteries[3],
+            actuators['pump_time_remaining'], actuators['pump_intensity'],
+            actuators['heater_temperature'], actuators['heater_intensity'],
+            actuators['water_temperature'], actuators['water_level']
+        )
+
+        self._seqlock += 1
+        SEQLOCK.pack_into(self._mm, SEQLOCK_OFFSET, self._seqlock)
+        PAYLOAD.pack_into(self._mm, PAYLOAD_OFFSET, step, sim_time,
+                          int(state.get('step_minutes', 0)), flags, *values)
+        self._seqlock += 1
+        SEQLOCK.pack_into(self._mm, SEQLOCK_OFFSET, self._seqlock)
+
+    def close(self):
+        self._mm.close()
+
+
+class StateChannelReader:
+    """Čita dosledne snimke stanja iz mapiranog fajla"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Putanja fajla kanala (pisac ga mora prvi napraviti)
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), TOTAL_SIZE, access=mmap.ACCESS_READ)
+        magic, version, payload_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or payload_size != PAYLOAD.size:
+            self._mm.close()
+            raise ValueError(f"{path} nije kanal stanja verzije {VERSION}")
+
+    @property
+    def version(self) -> int:
+        """Trenutna vrednost seqlock brojača (menja se sa svakim upisom)"""
+        return SEQLOCK.unpack_from(self._mm, SEQLOCK_OFFSET)[0]
+
+    def read(self, max_attempts: int = 10000) -> Dict[str, Any]:
+        """
+        Vraća dosledan snimak stanja
+
+        Returns:
+            Dict[str, Any]: 'version', 'step', 'sim_time' (datetime), 'step_minutes',
+            'pump_on', 'heater_on' i polja iz VALUE_FIELDS
+        """
+        for _ in range(max_attempts):
+            before = SEQLOCK.unpack_from(self._mm, SEQLOCK_OFFSET)[0]
+            if not before & 1:
+                values = PAYLOAD.unpack_from(self._mm, PAYLOAD_OFFSET)
+                if SEQLOCK.unpack_from(self._mm, SEQLOCK_OFFSET)[0] == before:
+                    return self._to_dict(before, values)
+            # Pisac je usred upisa - ustupi procesor da bi mogao da završi
+            time.sleep(0)
+        raise TimeoutError("Kanal stanja se neprekidno menja - snimak nije pročitan")
+
+    def read_if_changed(self, last_version: int) -> Optional[Dict[str, Any]]:
+        """Vraća snimak samo ako je od last_version bilo novog upisa, inače None"""
+        if self.version == last_version:
+            return None
+        return self.read()
+
+    def close(self):
+        self._mm.close()
+
+    @staticmethod
+    def _to_dict(version, values) -> Dict[str, Any]:
+        step, sim_time, step_minutes, flags = values[:4]
+        snapshot = {
+            'version': version,
+            'step': step,
+            'sim_time': EPOCH + timedelta(seconds=sim_time),
+            'step_minutes': step_minutes,
+            'pump_on': bool(flags & FLAG_PUMP_ON),
+            'heater_on': bool(flags & FLAG_HEATER_ON),
+        }
+        snapshot.update(zip(VALUE_FIELDS, values[4:]))
+        return snapshot